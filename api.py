@@ -3,13 +3,32 @@ Flask API for SportsMole Scraper
 Provides REST endpoints to access scraped match data
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from scraper import SportsMoleScraper
-from datetime import datetime
+from match_index import MatchIndex, make_match_id
+from match_record import MatchRecord, json_default
+from change_feed import ChangeFeed, ChangesExpired
+from event_stream import EventBroadcaster, HEARTBEAT, format_event
+from kickoff import localize
+from prepared_response import PreparedResponse
+from pagination import InvalidCursor, encode_cursor, decode_cursor, parse_fields, project
+from snapshot_store import SnapshotStore
+from shared_cache import create_shared_cache
+from metrics import REGISTRY, REFRESH_SECONDS, REFRESHES, HTTP_REQUEST_SECONDS
+from dateutil import parser as date_parser
+from datetime import datetime, timedelta, timezone
+import json
 import logging
+import re
+import threading
+import time
 from config import (
     API_HOST, API_PORT, DEBUG_MODE,
-    CACHE_DURATION_MINUTES, LOG_LEVEL, LOG_FORMAT
+    API_DEFAULT_PAGE_SIZE, API_MAX_PAGE_SIZE,
+    CACHE_DURATION_MINUTES, CACHE_STALE_LIMIT_MINUTES,
+    SNAPSHOT_STORE_ENABLED, SSE_HEARTBEAT_SECONDS, SSE_RETRY_MS,
+    LOG_LEVEL, LOG_FORMAT
 )
 
 # Configure logging
@@ -19,37 +38,455 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+class MatchJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that also serializes MatchRecords"""
+    
+    @staticmethod
+    def default(o):
+        if isinstance(o, MatchRecord):
+            return o.to_dict()
+        return DefaultJSONProvider.default(o)
+
+
 app = Flask(__name__)
-scraper = SportsMoleScraper()
+app.json = MatchJSONProvider(app)
+# Built by init_app() rather than at import: parse pool processes are
+# spawned and re-run the script that started them (api.py under
+# `python api.py`), and must not build a scraper, stores and caches of their own
+scraper = None
+snapshot_store = None
+# Shares snapshots and the refresh lock between worker processes (SHARED_CACHE_BACKEND)
+shared_cache = None
+# Versions snapshots and tracks what changed between them (/api/changes)
+change_feed = ChangeFeed()
+# Wakes /api/events streams when a new snapshot is stored
+events = EventBroadcaster()
 
-# Cache for storing scraped data (in production, use Redis or similar)
+# Cache for storing scraped data (this worker's copy of the shared snapshot)
 cache = {
     'matches': [],
-    'last_updated': None
+    'index': MatchIndex([]),
+    'matches_response': None,
+    'version': 0,
+    'last_updated': None,
+    'last_refresh_ok': None
 }
 
+# Single-flight lock: only one scrape runs at a time in this process
+# (shared_cache extends this across worker processes)
+refresh_lock = threading.Lock()
+
+# Guards create_components and init_app against concurrent first requests
+components_lock = threading.RLock()
+initialized = False
+
+# Serializes adopting shared snapshots, so concurrent requests and event
+# streams adopt each published snapshot once
+shared_sync_lock = threading.Lock()
+
+
+def create_components():
+    """Build the scraper, snapshot store and shared cache, once per process"""
+    global scraper, snapshot_store, shared_cache
+    with components_lock:
+        if scraper is None:
+            scraper = SportsMoleScraper()
+            snapshot_store = SnapshotStore() if SNAPSHOT_STORE_ENABLED else None
+            shared_cache = create_shared_cache()
+
+
+def get_cache_age_minutes():
+    """Age of the cached snapshot in minutes, or None if nothing is cached"""
+    if not cache['last_updated']:
+        return None
+    return (datetime.now() - cache['last_updated']).total_seconds() / 60
+
 
 def is_cache_valid():
     """Check if cached data is still valid"""
-    if not cache['last_updated']:
+    elapsed = get_cache_age_minutes()
+    if elapsed is None:
         return False
     
-    elapsed = (datetime.now() - cache['last_updated']).total_seconds() / 60
     return elapsed < CACHE_DURATION_MINUTES
 
 
-def update_cache():
-    """Update the cache with fresh data"""
-    logger.info("Updating cache with fresh match data...")
+def is_cache_stale():
+    """Check if cached data is older than the configured stale limit"""
+    elapsed = get_cache_age_minutes()
+    return elapsed is None or elapsed >= CACHE_STALE_LIMIT_MINUTES
+
+
+def is_refresh_in_progress():
+    """Check if a scrape is currently running in this or another worker"""
+    return refresh_lock.locked() or shared_cache.refresh_locked()
+
+
+def acquire_refresh(blocking=False):
+    """
+    Take the refresh lock of this process and of the shared cache
+    
+    Returns:
+        True if both were acquired (release with release_refresh)
+    """
+    if not refresh_lock.acquire(blocking=blocking):
+        return False
+    if not shared_cache.acquire_refresh(blocking=blocking):
+        refresh_lock.release()
+        return False
+    return True
+
+
+def release_refresh():
+    """Release the locks taken by acquire_refresh"""
+    shared_cache.release_refresh()
+    refresh_lock.release()
+
+
+def store_snapshot(matches, last_updated=None, prepared=None):
+    """
+    Replace the cached matches and rebuild the indexes derived from them
+    
+    The matches are kept as compact MatchRecords; the dictionaries passed
+    in are not referenced afterwards. The snapshot gets a new change feed
+    version, which is pushed to /api/events clients.
+    
+    Args:
+        matches: List of match dictionaries
+        last_updated: When the matches were scraped (default: now)
+        prepared: Already serialized /api/matches response for these matches
+    """
+    for match in matches:
+        if 'id' not in match:
+            match['id'] = make_match_id(match)
+    last_updated = last_updated or datetime.now()
+    records = [MatchRecord.from_dict(match) for match in matches]
+    version = change_feed.publish(records, last_updated)
+    # The unfiltered /api/matches body only changes here, so serialize it once
+    prepared = prepared or PreparedResponse({
+        'success': True,
+        'count': len(matches),
+        'matches': matches,
+        'version': version,
+        'last_updated': last_updated.isoformat()
+    })
+    cache['index'] = MatchIndex(records)
+    cache['matches_response'] = prepared
+    cache['version'] = version
+    cache['matches'] = records
+    cache['last_updated'] = last_updated
+    events.publish(version)
+
+
+def sync_shared_snapshot():
+    """
+    Adopt a snapshot another worker published to the shared cache
+    
+    Returns:
+        True if a newer snapshot was adopted
+    """
+    with shared_sync_lock:
+        try:
+            prepared = shared_cache.read_if_changed()
+        except Exception as e:
+            logger.error(f"Error reading shared snapshot: {e}")
+            return False
+        if prepared is None:
+            return False
+        
+        payload = json.loads(prepared.body)
+        store_snapshot(payload['matches'], datetime.fromisoformat(payload['last_updated']), prepared)
+        cache['last_refresh_ok'] = True
+    logger.info(f"Adopted shared snapshot with {len(payload['matches'])} matches")
+    return True
+
+
+def commit_refresh(matches):
+    """
+    Store the result of a scrape (acquire_refresh must be held)
+    
+    Returns:
+        True if the snapshot was replaced, False if the result was rejected
+    """
+    if not matches and cache['matches']:
+        # The scraper returns an empty list when fetching fails,
+        # so keep serving the last good snapshot
+        logger.warning("Refresh returned no matches, keeping previous snapshot")
+        cache['last_refresh_ok'] = False
+        REFRESHES.inc(result='rejected')
+        return False
+    store_snapshot(matches)
+    cache['last_refresh_ok'] = True
+    REFRESHES.inc(result='ok')
+    logger.info(f"Cache updated successfully with {len(matches)} matches")
+    
+    try:
+        shared_cache.publish(cache['matches_response'])
+    except Exception as e:
+        logger.error(f"Error publishing shared snapshot: {e}")
+    
+    if snapshot_store is not None:
+        try:
+            snapshot_store.save_snapshot(matches, cache['last_updated'])
+        except Exception as e:
+            logger.error(f"Error saving snapshot: {e}")
+    return True
+
+
+def update_cache(force=True):
+    """
+    Update the cache with fresh data
+    
+    Only one refresh runs at a time, across all worker processes. A caller
+    arriving while a refresh is in progress waits for it and shares its
+    result instead of scraping again. A forced refresh still scrapes after
+    waiting if that refresh did not produce a new snapshot.
+    
+    Args:
+        force: Scrape even if the cache (possibly just published by another
+            worker) is still valid
+    """
+    version = cache['version']
+    waited = False
+    if not acquire_refresh():
+        logger.info("Cache refresh already in progress, waiting for it to finish")
+        acquire_refresh(blocking=True)
+        waited = True
+    
     try:
-        matches = scraper.get_all_matches_with_predictions()
-        cache['matches'] = matches
-        cache['last_updated'] = datetime.now()
-        logger.info(f"Cache updated successfully with {len(matches)} matches")
-        return True
+        sync_shared_snapshot()
+        if waited and (cache['version'] != version or not force):
+            return bool(cache['last_refresh_ok'])
+        if not force and is_cache_valid():
+            logger.info("Cache was refreshed meanwhile, skipping scrape")
+            return True
+        logger.info("Updating cache with fresh match data...")
+        with REFRESH_SECONDS.time():
+            matches = scraper.get_all_matches_with_predictions()
+        return commit_refresh(matches)
     except Exception as e:
         logger.error(f"Error updating cache: {e}")
+        cache['last_refresh_ok'] = False
+        REFRESHES.inc(result='error')
         return False
+    finally:
+        release_refresh()
+
+
+def trigger_background_refresh():
+    """
+    Start a cache refresh on a background thread
+    
+    Returns:
+        True if a refresh was started, False if one is already running
+    """
+    if is_refresh_in_progress():
+        return False
+    
+    thread = threading.Thread(target=update_cache, kwargs={'force': False}, name='cache-refresh', daemon=True)
+    thread.start()
+    return True
+
+
+def ensure_cache():
+    """
+    Make sure there is data to serve (stale-while-revalidate)
+    
+    An empty cache is filled synchronously because there is nothing to
+    serve yet. An expired cache keeps being served while a single
+    background refresh fetches fresh data. Snapshots published by other
+    workers are picked up first.
+    """
+    sync_shared_snapshot()
+    if cache['last_updated'] is None:
+        logger.info("Cache empty, fetching data...")
+        update_cache(force=False)
+    elif not is_cache_valid():
+        if trigger_background_refresh():
+            logger.info("Cache expired, refreshing in background")
+
+
+def load_stored_snapshot():
+    """
+    Fill the cache from the latest stored snapshot
+    
+    Returns:
+        True if a snapshot was loaded
+    """
+    if snapshot_store is None:
+        return False
+    try:
+        stored = snapshot_store.load_latest()
+    except Exception as e:
+        logger.error(f"Error loading stored snapshot: {e}")
+        return False
+    if stored is None:
+        return False
+    
+    matches, scraped_at = stored
+    store_snapshot(matches, scraped_at)
+    logger.info(f"Loaded stored snapshot with {len(matches)} matches from {scraped_at.isoformat()}")
+    return True
+
+
+def init_app(start_refresh=True):
+    """
+    Prepare this process to serve requests, once
+    
+    Runs on the first request of every worker process (so WSGI workers
+    started by e.g. gunicorn start warm too) and from `python api.py`.
+    Later calls do nothing.
+    
+    Args:
+        start_refresh: Load the latest stored snapshot, refresh in the
+            background if it has expired and start the periodic refresher
+            (off for tests and benchmarks)
+    """
+    global initialized
+    # Concurrent first requests wait here until the stored snapshot is loaded
+    with components_lock:
+        if initialized:
+            return
+        create_components()
+        if start_refresh:
+            # Serve the last stored snapshot right away and refresh in the background
+            load_stored_snapshot()
+            if not is_cache_valid():
+                trigger_background_refresh()
+            start_background_refresher()
+        initialized = True
+
+
+def start_background_refresher(interval_minutes=CACHE_DURATION_MINUTES):
+    """
+    Start a daemon thread that refreshes the cache every interval
+    
+    Returns:
+        threading.Event that stops the refresher when set
+    """
+    stop_event = threading.Event()
+    
+    def run():
+        while not stop_event.wait(interval_minutes * 60):
+            update_cache(force=False)
+    
+    threading.Thread(target=run, name='cache-refresher', daemon=True).start()
+    logger.info(f"Background refresher started (every {interval_minutes} minutes)")
+    return stop_event
+
+
+# "now", optionally shifted by hours or days: now, now+24h, now-7d
+RELATIVE_TIME_PATTERN = re.compile(r'^now(?:([+-]\d+)([hd]))?$')
+
+# Accepted values of the /api/matches sort parameter
+SORT_OPTIONS = ('kickoff', '-kickoff')
+
+
+def parse_time_param(value):
+    """
+    Parse a from/to query parameter
+    
+    Accepts ISO 8601 dates and times (naive values are in SITE_TIMEZONE)
+    and "now" with an optional offset such as "now+24h" or "now-7d".
+    
+    Raises:
+        ValueError: If the value is neither
+    """
+    relative = RELATIVE_TIME_PATTERN.match(value.strip().lower())
+    if relative:
+        amount, unit = relative.groups()
+        offset = timedelta(**{'hours' if unit == 'h' else 'days': int(amount)}) if amount else timedelta()
+        return datetime.now(timezone.utc) + offset
+    return localize(date_parser.isoparse(value))
+
+
+def parse_time_range(args):
+    """
+    The from/to kickoff range of a request
+    
+    Returns:
+        Tuple of (from, to), each None if not given
+    
+    Raises:
+        ValueError: If either value is invalid
+    """
+    kickoff_from = parse_time_param(args['from']) if args.get('from') else None
+    kickoff_to = parse_time_param(args['to']) if args.get('to') else None
+    return kickoff_from, kickoff_to
+
+
+def collect_metrics():
+    """Metrics read from the cache and scraper components at scrape time"""
+    age = get_cache_age_minutes()
+    yield ('sportsmole_cache_age_seconds', 'gauge', 'Age of the cached snapshot',
+           [({}, age * 60 if age is not None else None)])
+    yield ('sportsmole_matches_cached', 'gauge', 'Matches in the cached snapshot',
+           [({}, len(cache['matches']))])
+    yield ('sportsmole_refresh_in_progress', 'gauge', 'Whether a scrape is running',
+           [({}, int(is_refresh_in_progress()))])
+    
+    if scraper.prediction_cache is not None:
+        stats = scraper.prediction_cache.stats()
+        yield ('sportsmole_prediction_cache_lookups_total', 'counter', 'Prediction cache lookups by result',
+               [({'result': 'hit'}, stats['hits']), ({'result': 'miss'}, stats['misses'])])
+        yield ('sportsmole_prediction_cache_hit_ratio', 'gauge', 'Share of prediction cache lookups that hit',
+               [({}, stats['hit_ratio'])])
+        yield ('sportsmole_prediction_cache_entries', 'gauge', 'Entries in the prediction cache',
+               [({}, stats['size'])])
+    
+    strategies = scraper.strategy_stats()
+    yield ('sportsmole_parser_strategy_hits_total', 'counter', 'Successful parses by parsing step and strategy',
+           [({'step': step, 'strategy': label}, hits)
+            for step, stats in strategies.items() for label, hits in stats['hits'].items()])
+    yield ('sportsmole_parser_strategy_failures_total', 'counter', 'Parses where every strategy failed',
+           [({'step': step}, stats['failures']) for step, stats in strategies.items()])
+    
+    if scraper.rate_limiter is not None:
+        stats = scraper.rate_limiter.stats()
+        yield ('sportsmole_concurrency_limit', 'gauge', 'Current adaptive concurrency limit',
+               [({}, stats['concurrency_limit'])])
+        yield ('sportsmole_requests_in_flight', 'gauge', 'Requests to SportsMole in flight',
+               [({}, stats['in_flight'])])
+        yield ('sportsmole_throttled_responses_total', 'counter', 'Responses with status 429 or 503',
+               [({}, stats['throttled'])])
+        yield ('sportsmole_rate_limit_backoffs_total', 'counter', 'Times the concurrency limit was reduced',
+               [({}, stats['backoffs'])])
+    
+    breaker = scraper.circuit_breaker.stats()
+    yield ('sportsmole_circuit_breaker_open', 'gauge', 'Whether the circuit breaker rejects requests',
+           [({}, int(breaker['state'] != 'closed'))])
+    yield ('sportsmole_circuit_breaker_rejected_total', 'counter', 'Requests rejected by the circuit breaker',
+           [({}, breaker['rejected'])])
+
+
+REGISTRY.register_collector(collect_metrics)
+
+
+@app.before_request
+def start_request_timer():
+    """Remember when the request started for the latency histogram"""
+    g.request_started = time.perf_counter()
+
+
+@app.before_request
+def ensure_initialized():
+    """Initialize the process on its first request (see init_app)"""
+    init_app()
+
+
+@app.after_request
+def observe_request_latency(response):
+    """Record request latency by endpoint (streamed bodies: time to first byte)"""
+    started = g.pop('request_started', None)
+    if started is not None:
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started,
+            endpoint=request.url_rule.rule if request.url_rule else 'unmatched',
+            method=request.method,
+            status=str(response.status_code)
+        )
+    return response
 
 
 @app.route('/')
@@ -63,9 +500,16 @@ def home():
             '/': 'API information',
             '/api/matches': 'Get all upcoming matches with predictions',
             '/api/matches/count': 'Get count of upcoming matches',
-            '/api/matches/<int:match_id>': 'Get specific match by index',
+            '/api/matches/stream': 'Stream matches as NDJSON while they are scraped',
+            '/api/matches/<match_id>': 'Get specific match by its stable ID',
+            '/api/matches/batch?ids=<id>,<id>': 'Get several matches by ID in one call',
+            '/api/matches/<match_id>/history': 'Get stored versions of a match',
+            '/api/changes?since=<version>': 'Get matches added, changed or removed since a version',
+            '/api/events': 'Server-Sent Events stream of cache updates',
+            '/api/history': 'Query stored matches by competition and kickoff',
             '/api/refresh': 'Force refresh the cache',
-            '/api/health': 'Health check endpoint'
+            '/api/health': 'Health check endpoint',
+            '/api/metrics': 'Prometheus metrics'
         }
     })
 
@@ -73,14 +517,27 @@ def home():
 @app.route('/api/health')
 def health():
     """Health check endpoint"""
+    age = get_cache_age_minutes()
     return jsonify({
-        'status': 'healthy',
+        'status': 'degraded' if is_cache_stale() else 'healthy',
         'timestamp': datetime.now().isoformat(),
         'cache_valid': is_cache_valid(),
-        'matches_cached': len(cache['matches'])
+        'cache_age_seconds': round(age * 60, 1) if age is not None else None,
+        'refresh_in_progress': is_refresh_in_progress(),
+        'last_refresh_ok': cache['last_refresh_ok'],
+        'matches_cached': len(cache['matches']),
+        'prediction_cache': scraper.prediction_cache.stats() if scraper.prediction_cache else None,
+        'rate_limiter': scraper.rate_limiter.stats() if scraper.rate_limiter else None,
+        'circuit_breaker': scraper.circuit_breaker.stats()
     })
 
 
+@app.route('/api/metrics')
+def metrics():
+    """Scraper and API metrics in the Prometheus text format"""
+    return Response(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 @app.route('/api/matches', methods=['GET'])
 def get_matches():
     """
@@ -90,43 +547,136 @@ def get_matches():
         - limit: Maximum number of matches to return (default: all)
         - competition: Filter by competition name
         - team: Filter by team name (home or away)
+        - page_size: Matches per page; enables cursor pagination
+        - cursor: Cursor from a previous page's next_cursor
+        - fields: Comma-separated fields to return, or "summary" for
+          id, teams, date and competition only
+        - from / to: Kickoff range (ISO date/time, or "now" with an optional
+          offset such as "now+24h")
+        - sort: "kickoff" or "-kickoff" to order by kickoff time
     """
-    # Check cache and update if needed
-    if not is_cache_valid():
-        logger.info("Cache expired, fetching fresh data...")
-        update_cache()
+    # Serve cached data, refreshing in the background if expired
+    ensure_cache()
     
-    matches = cache['matches']
-    
-    # Apply filters
+    # Apply filters (case- and accent-insensitive, answered from the snapshot's indexes)
     limit = request.args.get('limit', type=int)
     competition = request.args.get('competition', type=str)
     team = request.args.get('team', type=str)
+    page_size = request.args.get('page_size', type=int)
+    cursor = request.args.get('cursor', type=str)
+    fields = parse_fields(request.args.get('fields', type=str))
+    sort = request.args.get('sort', type=str)
+    try:
+        kickoff_from, kickoff_to = parse_time_range(request.args)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f'Invalid date: {e}'}), 400
+    if sort and sort not in SORT_OPTIONS:
+        return jsonify({
+            'success': False,
+            'error': f"Invalid sort: {sort} (expected one of {', '.join(SORT_OPTIONS)})"
+        }), 400
     
-    if competition:
-        matches = [m for m in matches if competition.lower() in m.get('competition', '').lower()]
+    # Unfiltered requests get the pre-serialized body (with ETag / 304 support)
+    prepared = cache['matches_response']
+    if prepared is not None and not (limit or competition or team or page_size or cursor or fields
+                                     or kickoff_from or kickoff_to or sort):
+        return prepared.make_response(request)
     
-    if team:
-        matches = [m for m in matches if 
-                  team.lower() in m.get('home_team', '').lower() or 
-                  team.lower() in m.get('away_team', '').lower()]
+    matches = cache['index'].filter(team=team, competition=competition,
+                                    kickoff_from=kickoff_from, kickoff_to=kickoff_to, sort=sort)
     
     if limit:
         matches = matches[:limit]
     
-    return jsonify({
+    response = {
         'success': True,
-        'count': len(matches),
-        'matches': matches,
+        'version': cache['version'],
         'last_updated': cache['last_updated'].isoformat() if cache['last_updated'] else None
-    })
+    }
+    
+    if page_size or cursor:
+        snapshot = prepared.etag if prepared is not None else ''
+        offset = 0
+        if cursor:
+            try:
+                cursor_snapshot, offset = decode_cursor(cursor)
+            except InvalidCursor as e:
+                return jsonify({'success': False, 'error': str(e)}), 400
+            if cursor_snapshot != snapshot:
+                return jsonify({
+                    'success': False,
+                    'error': 'Cursor expired: match data was refreshed, restart pagination'
+                }), 410
+        
+        page_size = min(max(page_size or API_DEFAULT_PAGE_SIZE, 1), API_MAX_PAGE_SIZE)
+        end = offset + page_size
+        response['total'] = len(matches)
+        response['next_cursor'] = encode_cursor(snapshot, end) if end < len(matches) else None
+        matches = matches[offset:end]
+    
+    matches = project(matches, fields)
+    response['count'] = len(matches)
+    response['matches'] = matches
+    return jsonify(response)
+
+
+def to_ndjson(match):
+    """Serialize one match as a newline-delimited JSON line"""
+    return json.dumps(match, separators=(',', ':'), default=json_default) + '\n'
+
+
+def stream_live_scrape():
+    """
+    Scrape and yield NDJSON lines as matches complete (acquire_refresh must be held)
+    
+    The complete result becomes the new cache snapshot. If the client
+    disconnects before the scrape finishes, the partial result is discarded.
+    """
+    matches = []
+    completed = False
+    try:
+        for match in scraper.iter_matches_with_predictions():
+            matches.append(match)
+            yield to_ndjson(match)
+        completed = True
+    except Exception as e:
+        logger.error(f"Error streaming live scrape: {e}")
+        cache['last_refresh_ok'] = False
+        REFRESHES.inc(result='error')
+    finally:
+        if completed:
+            commit_refresh(matches)
+        release_refresh()
+
+
+@app.route('/api/matches/stream', methods=['GET'])
+def stream_matches():
+    """
+    Stream matches as newline-delimited JSON (one match per line)
+    
+    With a cold cache the matches are scraped live and each one is sent as
+    soon as its prediction is parsed; otherwise the cached snapshot is
+    streamed (refreshing in the background if expired).
+    """
+    def generate():
+        # The lock is only taken once the body is being sent, so a response
+        # that is never iterated cannot leave it held
+        if cache['last_updated'] is None and not sync_shared_snapshot() and acquire_refresh():
+            logger.info("Cache empty, streaming live scrape")
+            yield from stream_live_scrape()
+            return
+        
+        ensure_cache()
+        for match in cache['matches']:
+            yield to_ndjson(match)
+    
+    return Response(generate(), mimetype='application/x-ndjson')
 
 
 @app.route('/api/matches/count', methods=['GET'])
 def get_matches_count():
     """Get the count of upcoming matches"""
-    if not is_cache_valid():
-        update_cache()
+    ensure_cache()
     
     return jsonify({
         'success': True,
@@ -135,25 +685,243 @@ def get_matches_count():
     })
 
 
-@app.route('/api/matches/<int:match_id>', methods=['GET'])
+@app.route('/api/matches/<match_id>', methods=['GET'])
 def get_match(match_id):
-    """Get a specific match by its index"""
-    if not is_cache_valid():
-        update_cache()
+    """Get a specific match by its stable ID"""
+    ensure_cache()
     
-    if 0 <= match_id < len(cache['matches']):
+    match = cache['index'].get(match_id)
+    if match is not None:
         return jsonify({
             'success': True,
-            'match': cache['matches'][match_id]
+            'match': match
         })
     else:
         return jsonify({
             'success': False,
             'error': 'Match not found',
-            'valid_range': f'0 to {len(cache["matches"]) - 1}'
+            'match_id': match_id
         }), 404
 
 
+@app.route('/api/matches/batch', methods=['GET', 'POST'])
+def get_matches_batch():
+    """
+    Get several matches by ID in one call
+    
+    IDs are passed as a comma-separated `ids` query parameter, or as
+    {"ids": [...]} in a POST body. Unknown IDs are listed in `missing`.
+    """
+    ensure_cache()
+    
+    if request.method == 'POST':
+        ids = (request.get_json(silent=True) or {}).get('ids', [])
+    else:
+        ids = [match_id for match_id in request.args.get('ids', '').split(',') if match_id]
+    
+    if not isinstance(ids, list) or not ids:
+        return jsonify({
+            'success': False,
+            'error': 'Provide match IDs via ?ids=a,b or a JSON body {"ids": [...]}'
+        }), 400
+    
+    found = cache['index'].get_many([str(match_id) for match_id in ids])
+    return jsonify({
+        'success': True,
+        'count': sum(1 for match in found.values() if match is not None),
+        'matches': {match_id: match for match_id, match in found.items() if match is not None},
+        'missing': [match_id for match_id, match in found.items() if match is None],
+        'last_updated': cache['last_updated'].isoformat() if cache['last_updated'] else None
+    })
+
+
+@app.route('/api/changes', methods=['GET'])
+def get_changes():
+    """
+    Changes to the match list since a version, for incremental sync
+    
+    Query parameters:
+        - since: Version from a previous /api/matches or /api/changes
+          response (0 returns every match as added)
+    
+    Added matches are returned in full; changed matches only carry the
+    fields that changed. A version older than the feed retains answers
+    410 Gone, and the client should reload /api/matches.
+    """
+    ensure_cache()
+    
+    since = request.args.get('since', type=int)
+    if since is None or since < 0:
+        return jsonify({
+            'success': False,
+            'error': 'Provide the last version seen as ?since=<version> (0 for everything)'
+        }), 400
+    
+    try:
+        changes = change_feed.changes_since(since)
+    except ChangesExpired as e:
+        return jsonify({
+            'success': False,
+            'error': f'{e}; reload /api/matches',
+            'version': change_feed.version
+        }), 410
+    
+    return jsonify({
+        'success': True,
+        **changes,
+        'last_updated': cache['last_updated'].isoformat() if cache['last_updated'] else None
+    })
+
+
+def render_update_events(since):
+    """
+    SSE events bringing a client from version `since` to the current snapshot
+    
+    Args:
+        since: Version the client has seen, or None for a new client (which
+            only needs the current version)
+    
+    Returns:
+        Tuple of (event text, version the client is on afterwards)
+    """
+    try:
+        changes = change_feed.changes_since(since or 0)
+    except ChangesExpired:
+        # Too far behind for a diff: the client has to reload /api/matches
+        return format_event({'version': change_feed.version}, 'reset', change_feed.version), change_feed.version
+    
+    version = changes['version']
+    text = format_event({
+        'version': version,
+        'count': len(cache['matches']),
+        'last_updated': cache['last_updated'].isoformat() if cache['last_updated'] else None
+    }, 'refresh', version)
+    if since is not None and (changes['added'] or changes['changed'] or changes['removed']):
+        text += format_event(changes, 'changes', version)
+    return text, version
+
+
+@app.route('/api/events', methods=['GET'])
+def stream_events():
+    """
+    Stream cache updates as Server-Sent Events
+    
+    Every new snapshot sends a `refresh` event (version, count,
+    last_updated) followed by a `changes` event with the same payload as
+    /api/changes when matches or predictions changed. Event IDs are change
+    feed versions, so a reconnecting client sending Last-Event-ID (or
+    ?since=<version>) first receives what it missed; if that is no longer
+    available it gets a `reset` event and should reload /api/matches.
+    Idle streams get a heartbeat comment every SSE_HEARTBEAT_SECONDS.
+    """
+    ensure_cache()
+    
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('since')
+    try:
+        since = int(last_event_id) if last_event_id else None
+    except ValueError:
+        since = -1
+    if since is not None and since < 0:
+        return jsonify({
+            'success': False,
+            'error': 'Last-Event-ID and ?since= must be a version from this API'
+        }), 400
+    
+    if not events.subscribe():
+        response = jsonify({
+            'success': False,
+            'error': 'Too many event stream clients, retry later'
+        })
+        response.headers['Retry-After'] = str(max(1, SSE_RETRY_MS // 1000))
+        return response, 503
+    
+    def generate():
+        # A new client only learns the current version; a resuming
+        # client is sent what it missed, if anything
+        seen = since
+        text = f"retry: {SSE_RETRY_MS}\n\n"
+        if seen is None or seen < change_feed.version:
+            update, seen = events.render(seen, lambda: render_update_events(seen))
+            text += update
+        yield text
+        
+        while True:
+            if events.wait(seen, SSE_HEARTBEAT_SECONDS) <= seen and not sync_shared_snapshot():
+                yield HEARTBEAT
+                continue
+            update, seen = events.render(seen, lambda: render_update_events(seen))
+            yield update
+    
+    response = Response(generate(), mimetype='text/event-stream')
+    # Also frees the slot of a client that disconnects before the body is sent
+    response.call_on_close(events.unsubscribe)
+    response.headers['Cache-Control'] = 'no-cache'
+    # Keep reverse proxies such as nginx from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def history_unavailable():
+    """Response for history endpoints when the snapshot store is disabled"""
+    return jsonify({
+        'success': False,
+        'error': 'Snapshot history is disabled (SNAPSHOT_STORE_ENABLED=false)'
+    }), 404
+
+
+@app.route('/api/matches/<match_id>/history', methods=['GET'])
+def get_match_history(match_id):
+    """
+    Get stored versions of a match, newest first
+    
+    Query parameters:
+        - limit: Maximum number of versions (default: 100)
+    """
+    if snapshot_store is None:
+        return history_unavailable()
+    
+    limit = request.args.get('limit', default=100, type=int)
+    history = snapshot_store.match_history(match_id, limit=limit)
+    return jsonify({
+        'success': True,
+        'match_id': match_id,
+        'count': len(history),
+        'history': history
+    })
+
+
+@app.route('/api/history', methods=['GET'])
+def get_history():
+    """
+    Query the latest stored version of past and present matches
+    
+    Query parameters:
+        - competition: Competition name (exact, case- and accent-insensitive)
+        - from: Earliest kickoff (ISO date/time or "now" with an optional offset)
+        - to: Latest kickoff (ISO date/time or "now" with an optional offset)
+        - limit: Maximum number of matches (default: 500)
+    """
+    if snapshot_store is None:
+        return history_unavailable()
+    
+    try:
+        kickoff_from, kickoff_to = parse_time_range(request.args)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f'Invalid date: {e}'}), 400
+    
+    matches = snapshot_store.query_matches(
+        competition=request.args.get('competition', type=str),
+        kickoff_from=kickoff_from,
+        kickoff_to=kickoff_to,
+        limit=request.args.get('limit', default=500, type=int)
+    )
+    return jsonify({
+        'success': True,
+        'count': len(matches),
+        'matches': matches
+    })
+
+
 @app.route('/api/refresh', methods=['POST'])
 def refresh_cache():
     """Force refresh the cache"""
@@ -204,7 +972,7 @@ if __name__ == '__main__':
         logger.warning("Set DEBUG_MODE=False in config.py for production use.")
         logger.warning("=" * 60)
     
-    update_cache()
+    init_app()
     
     # Run the Flask app
     logger.info(f"API will run on {API_HOST}:{API_PORT}")
@@ -0,0 +1,269 @@
+"""
+Asynchronous SportsMole Web Scraper
+asyncio counterpart to SportsMoleScraper built on a single pooled aiohttp client
+"""
+
+import asyncio
+import aiohttp
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional
+import logging
+from config import (
+    REQUEST_TIMEOUT, USER_AGENT,
+    LOG_LEVEL, LOG_FORMAT,
+    ASYNC_MAX_CONCURRENCY, PARSE_WORKERS, PREDICTION_CACHE_ENABLED
+)
+from prediction_cache import PredictionCache
+from metrics import FETCH_SECONDS, PARSE_SECONDS, DOWNLOADED_BYTES, FETCH_RETRIES, FETCH_FAILURES
+from retry_policy import RetryPolicy, CircuitBreaker, CircuitOpenError, is_retryable_status, parse_retry_after
+from scraper import SportsMolePageParser, create_parse_pool, parse_prediction_in_worker
+
+# Configure logging
+logging.basicConfig(level=LOG_LEVEL, format=LOG_FORMAT)
+logger = logging.getLogger(__name__)
+
+
+class AsyncSportsMoleScraper(SportsMolePageParser):
+    """
+    Async scraper for SportsMole.co.uk website
+    
+    Exposes the same public methods as SportsMoleScraper as coroutines and
+    reuses its parsing logic, so results are identical. All requests share
+    one aiohttp session; use the scraper as an async context manager or
+    call close() when done.
+    
+    Example:
+        async with AsyncSportsMoleScraper() as scraper:
+            matches = await scraper.get_all_matches_with_predictions()
+    """
+    
+    def __init__(self, max_concurrency: int = ASYNC_MAX_CONCURRENCY,
+                 prediction_cache: Optional[PredictionCache] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 parse_pool: Optional[ProcessPoolExecutor] = None):
+        super().__init__()
+        self.max_concurrency = max(1, max_concurrency)
+        if prediction_cache is None and PREDICTION_CACHE_ENABLED:
+            prediction_cache = PredictionCache()
+        self.prediction_cache = prediction_cache
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        # Parsing in the pool keeps the event loop free to drive other requests
+        self._owns_parse_pool = parse_pool is None and PARSE_WORKERS > 0
+        self.parse_pool = parse_pool or create_parse_pool()
+        self.timeout = REQUEST_TIMEOUT
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        logger.info("AsyncSportsMoleScraper initialized")
+    
+    async def __aenter__(self):
+        await self._get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Create the shared client session on first use (must run inside the event loop)"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers={'User-Agent': USER_AGENT},
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self.session
+    
+    async def close(self):
+        """Close the shared client session and the parse pool if the scraper created it"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        if self._owns_parse_pool and self.parse_pool is not None:
+            self.parse_pool.shutdown(cancel_futures=True)
+            self.parse_pool = None
+    
+    async def _get(self, url: str, page: str = 'preview') -> bytes:
+        """Fetch a URL once and return the response body, raising on HTTP errors"""
+        session = await self._get_session()
+        async with self._semaphore:
+            with FETCH_SECONDS.time(page=page):
+                async with session.get(url) as response:
+                    response.raise_for_status()
+                    content = await response.read()
+        DOWNLOADED_BYTES.inc(len(content), page=page)
+        return content
+    
+    async def _fetch(self, url: str, page: str = 'preview') -> bytes:
+        """
+        Fetch a URL and return the response body, retrying transient failures
+        
+        Args:
+            url: URL to fetch
+            page: Page type for metrics ("fixtures" or "preview")
+        
+        Raises:
+            aiohttp.ClientError, asyncio.TimeoutError: If the request failed
+                permanently (e.g. 404) or every attempt failed
+            CircuitOpenError: If the circuit breaker is open
+        """
+        attempt = 0
+        while True:
+            try:
+                self.circuit_breaker.before_request()
+            except CircuitOpenError:
+                FETCH_FAILURES.inc(page=page, reason='circuit_open')
+                raise
+            try:
+                content = await self._get(url, page)
+                self.circuit_breaker.record_success()
+                return content
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if isinstance(e, aiohttp.ClientResponseError):
+                    retryable = is_retryable_status(e.status)
+                    retry_after = parse_retry_after(e.headers.get('Retry-After')) if e.headers else None
+                else:
+                    retryable = isinstance(e, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+                    retry_after = None
+                reason = str(e.status) if isinstance(e, aiohttp.ClientResponseError) else type(e).__name__
+                if not retryable:
+                    # The site answered, it just doesn't have this page
+                    self.circuit_breaker.record_success()
+                    FETCH_FAILURES.inc(page=page, reason=reason)
+                    raise
+                
+                self.circuit_breaker.record_failure()
+                delay = self.retry_policy.next_delay(attempt, retry_after)
+                if delay is None:
+                    FETCH_FAILURES.inc(page=page, reason=reason)
+                    raise
+                FETCH_RETRIES.inc(page=page)
+                attempt += 1
+                logger.warning(f"Retrying {url} in {delay:.1f}s "
+                               f"(attempt {attempt + 1}/{self.retry_policy.max_attempts}): {e}")
+                await asyncio.sleep(delay)
+    
+    async def get_upcoming_matches(self) -> List[Dict]:
+        """
+        Fetch all upcoming matches from SportsMole
+        
+        Crawls the fixtures page and any configured competition or date
+        listing pages (see crawl_fixtures).
+        
+        Returns:
+            List of dictionaries containing match information
+        """
+        return await self.crawl_fixtures()
+    
+    async def _fetch_listing_page(self, url: str) -> Optional[bytes]:
+        """Fetch a fixture listing page, or None if it could not be fetched"""
+        try:
+            logger.info(f"Fetching fixtures from {url}")
+            return await self._fetch(url, page='fixtures')
+        except (aiohttp.ClientError, asyncio.TimeoutError, CircuitOpenError) as e:
+            logger.error(f"Error fetching fixtures from {url}, skipping page: {e}")
+            return None
+    
+    async def crawl_fixtures(self, seed_urls: Optional[List[str]] = None,
+                             max_depth: Optional[int] = None,
+                             max_pages: Optional[int] = None) -> List[Dict]:
+        """
+        Crawl fixture listing pages and merge their matches
+        
+        Same behaviour as SportsMoleScraper.crawl_fixtures, with up to
+        crawl_workers pages in flight at a time.
+        
+        Args:
+            seed_urls: Listing pages to start from (default: FIXTURES_URL and CRAWL_SEED_URLS)
+            max_depth: Link hops followed from a seed (default: CRAWL_MAX_DEPTH)
+            max_pages: Maximum number of pages fetched (default: CRAWL_MAX_PAGES)
+        
+        Returns:
+            List of dictionaries containing match information
+        """
+        frontier = self._crawl_frontier(seed_urls, max_depth, max_pages)
+        workers = max(1, self.crawl_workers)
+        results = {}
+        
+        in_flight = {}
+        try:
+            while frontier or in_flight:
+                while frontier and len(in_flight) < workers:
+                    page = frontier.pop()
+                    in_flight[asyncio.ensure_future(self._fetch_listing_page(page.url))] = page
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    page = in_flight.pop(task)
+                    content = task.result()
+                    if content is not None:
+                        results[page.order] = self._parse_listing_page(content, page, frontier)
+        finally:
+            for task in in_flight:
+                task.cancel()
+        
+        return self._merge_listing_results(results, frontier)
+    
+    async def get_match_prediction(self, preview_url: str) -> Optional[Dict]:
+        """
+        Fetch prediction details for a specific match
+        
+        Args:
+            preview_url: URL to the match preview page
+        
+        Returns:
+            Dictionary containing prediction information
+        """
+        try:
+            logger.debug(f"Fetching prediction from {preview_url}")
+            content = await self._fetch(preview_url)
+        except (aiohttp.ClientError, asyncio.TimeoutError, CircuitOpenError) as e:
+            logger.error(f"Error fetching prediction for {preview_url}: {e}")
+            return None
+        
+        if self.parse_pool is not None:
+            prediction, seconds = await asyncio.get_running_loop().run_in_executor(
+                self.parse_pool, parse_prediction_in_worker, content)
+            PARSE_SECONDS.observe(seconds, page='preview')
+            return prediction
+        with PARSE_SECONDS.time(page='preview'):
+            return self._parse_prediction_page(content)
+    
+    async def get_all_matches_with_predictions(self) -> List[Dict]:
+        """
+        Get all upcoming matches with their predictions and statistics
+        
+        Predictions still valid in the prediction cache are reused; the
+        remaining preview pages are requested concurrently, bounded by
+        max_concurrency. Matches are returned in fixture order.
+        
+        Returns:
+            List of dictionaries containing complete match information
+        """
+        matches = await self.get_upcoming_matches()
+        to_fetch = self._apply_cached_predictions(matches)
+        
+        predictions = await asyncio.gather(
+            *(self.get_match_prediction(match['preview_url']) for match in to_fetch)
+        )
+        
+        self._merge_predictions(to_fetch, predictions)
+        
+        return matches
+
+
+if __name__ == "__main__":
+    async def main():
+        async with AsyncSportsMoleScraper() as scraper:
+            print("Fetching upcoming matches...")
+            matches = await scraper.get_all_matches_with_predictions()
+        
+        print(f"\nFound {len(matches)} matches:")
+        for i, match in enumerate(matches[:5], 1):  # Show first 5
+            print(f"\n{i}. {match.get('home_team', 'Unknown')} vs {match.get('away_team', 'Unknown')}")
+            print(f"   Date: {match.get('date', 'TBD')}")
+            if 'predicted_score' in match:
+                print(f"   Predicted Score: {match['predicted_score']}")
+    
+    asyncio.run(main())
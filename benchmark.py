@@ -0,0 +1,527 @@
+"""
+Benchmarks for SportsMole Scraper
+Compares HTML parser backends and targeted (SoupStrainer) parsing on a
+synthetic fixtures page, and runs a benchmark suite covering every page
+layout, end-to-end scraping against a local stub server and API latency.
+A recorded HTTP archive can be replayed to benchmark on real page captures.
+
+Usage:
+    python benchmark.py [--matches 2000] [--repeat 3]
+    python benchmark.py --suite [--sizes 100,1000,10000] [--output results.json]
+    python benchmark.py --suite --compare baseline.json
+    python benchmark.py --replay .cache/http_archive.jsonl.gz
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+import logging
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from scraper import SportsMoleScraper, FIXTURES_STRAINER, resolve_parser, create_parse_pool
+from prediction_cache import PredictionCache
+from rate_limiter import AdaptiveRateLimiter
+from http_archive import HTTPArchive
+from match_record import MatchRecord
+
+# Page chrome surrounding the fixtures, roughly what a real page carries
+PAGE_NOISE = """
+<nav class="site-nav">{links}</nav>
+<aside class="sidebar">
+    <div class="ad-slot"><script>var ad = {{"slot": "{i}"}};</script></div>
+    <ul class="headlines">{headlines}</ul>
+</aside>
+"""
+
+# One match in each layout the fixtures parser understands. The layouts
+# also exercise the different team, date and competition fallbacks.
+MATCH_TEMPLATES = {
+    'match-preview': """
+<div class="match-preview">
+    <span class="team-name">Home Team {i}</span>
+    <span class="team-name">Away Team {i}</span>
+    <span class="match-date">Dec {day}, 2025 15:00</span>
+    <span class="competition">League {league}</span>
+    <a href="/football/home-team-{i}/preview/home-vs-away-{i}">Preview</a>
+</div>""",
+    'fixture': """
+<div class="fixture">
+    <a href="/football/home-team-{i}/">Home Team {i}</a>
+    <a href="/football/away-team-{i}/">Away Team {i}</a>
+    <time datetime="2025-12-{day:02d}T15:00">Dec {day}, 2025 15:00</time>
+    <a class="competition" href="/football/league-{league}/">League {league}</a>
+    <a href="/football/home-team-{i}/preview/home-vs-away-{i}">Preview</a>
+</div>""",
+    'match': """
+<div class="match">
+    <div class="home-team">Home Team {i}</div>
+    <div class="away-team">Away Team {i}</div>
+    <div class="kickoff-time">Dec {day}, 2025 15:00</div>
+    <div class="league-name">League {league}</div>
+    <a href="/football/home-team-{i}/preview/home-vs-away-{i}">Preview</a>
+</div>""",
+    'table': """
+<tr>
+    <td>Home Team {i}</td>
+    <td>Dec {day}, 2025 15:00</td>
+    <td>Away Team {i}</td>
+    <td><a href="/football/home-team-{i}/preview/home-vs-away-{i}">Preview</a></td>
+</tr>""",
+}
+
+LAYOUTS = tuple(MATCH_TEMPLATES)
+
+# Rows per <table class="fixtures"> in the table layout
+TABLE_ROWS = 50
+
+# Preview page variants: stat rows, a statistics table, and the SM prediction box
+PREVIEW_TEMPLATES = {
+    'stat-rows': """
+<div class="prediction">
+    <span class="score">{home}-{away}</span>
+    <p>Home Team {i} should edge a close contest against Away Team {i}.</p>
+</div>
+<div class="statistics">{rows}</div>""",
+    'stat-table': """
+<div id="prediction">
+    <div class="predicted-score">{home}-{away}</div>
+    <div class="prediction-text">Home Team {i} should edge a close contest.</div>
+</div>
+<div id="statistics"><table>{rows}</table></div>""",
+    'sm-prediction': """
+<div class="sm-prediction">Home Team {i} {home}-{away} Away Team {i}</div>""",
+}
+
+ARTICLE_PARAGRAPH = "<p>Both sides arrive in contrasting form after a busy run of fixtures, " \
+                    "and the managers have plenty to consider before kickoff.</p>"
+
+# Query strings timed against /api/matches
+API_QUERIES = {
+    'unfiltered': '',
+    'team': '?team=home team 1',
+    'competition': '?competition=league 3',
+    'team+competition': '?team=away&competition=league 7',
+    'page': '?page_size=50',
+    'summary': '?fields=summary',
+}
+
+
+def generate_fixtures_page(num_matches: int, layout: str = 'match-preview') -> str:
+    """Build a fixtures page with num_matches matches in the given layout and page noise"""
+    links = ''.join(f'<a href="/football/team-{n}/">Team {n}</a>' for n in range(40))
+    headlines = ''.join(f'<li><a href="/news/{n}">Headline number {n}</a></li>' for n in range(20))
+    template = MATCH_TEMPLATES[layout]
+    parts = ['<html><head><title>Fixtures</title></head><body>']
+    for i in range(num_matches):
+        if i % 25 == 0:
+            parts.append(PAGE_NOISE.format(links=links, headlines=headlines, i=i))
+        if layout == 'table' and i % TABLE_ROWS == 0:
+            parts.append('<table class="fixtures">')
+        parts.append(template.format(i=i, day=1 + i % 28, league=i % 12))
+        if layout == 'table' and (i % TABLE_ROWS == TABLE_ROWS - 1 or i == num_matches - 1):
+            parts.append('</table>')
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+def generate_preview_page(i: int, variant: str = 'stat-rows') -> str:
+    """Build a match preview page with article text around the prediction"""
+    stats = [('Goals Scored', 20 + i % 30), ('Goals Conceded', 10 + i % 20),
+             ('Clean Sheets', i % 9), ('Form', 'WWDLW')]
+    if variant == 'stat-table':
+        rows = ''.join(f'<tr><td>{label}</td><td>{value}</td></tr>' for label, value in stats)
+    else:
+        rows = ''.join(f'<div class="stat-row"><span class="stat-label">{label}</span>'
+                       f'<span class="stat-value">{value}</span></div>' for label, value in stats)
+    article = ARTICLE_PARAGRAPH * 30
+    body = PREVIEW_TEMPLATES[variant].format(i=i, home=i % 4, away=i % 3, rows=rows)
+    return f'<html><body><article>{article}{body}{article}</article></body></html>'
+
+
+def measure(scraper: SportsMoleScraper, content: bytes, repeat: int) -> dict:
+    """Time tree building and the full _parse_fixtures_page, and record peak memory"""
+    tree_timings = []
+    total_timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        scraper._make_soup(content, FIXTURES_STRAINER)
+        tree_timings.append(time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        matches = scraper._parse_fixtures_page(content)
+        total_timings.append(time.perf_counter() - start)
+    
+    tracemalloc.start()
+    scraper._parse_fixtures_page(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return {
+        'matches': len(matches),
+        'tree_seconds': min(tree_timings),
+        'total_seconds': min(total_timings),
+        'peak_memory_mb': peak / (1024 * 1024)
+    }
+
+
+def run_parser_benchmark(num_matches: int, repeat: int) -> dict:
+    """Benchmark every parser configuration on one generated page"""
+    content = generate_fixtures_page(num_matches).encode('utf-8')
+    configurations = [
+        ('html.parser', False),
+        ('lxml', False),
+        ('html.parser', True),
+        ('lxml', True),
+    ]
+    
+    scraper = SportsMoleScraper()
+    results = {}
+    for parser, targeted in configurations:
+        if resolve_parser(parser) != parser:
+            continue
+        scraper.parser = parser
+        scraper.targeted_parsing = targeted
+        label = f"{parser}{' + SoupStrainer' if targeted else ''}"
+        results[label] = measure(scraper, content, repeat)
+    
+    return {'page_bytes': len(content), 'results': results}
+
+
+def benchmark_layouts(sizes: List[int], repeat: int) -> Dict:
+    """Fixtures parse throughput and peak memory for every layout and size"""
+    results = {}
+    for layout in LAYOUTS:
+        for size in sizes:
+            content = generate_fixtures_page(size, layout).encode('utf-8')
+            result = measure(SportsMoleScraper(), content, repeat)
+            if result['matches'] != size:
+                raise RuntimeError(f"{layout} layout parsed {result['matches']} of {size} matches")
+            result['page_bytes'] = len(content)
+            result['matches_per_second'] = size / result['total_seconds']
+            results[f"{layout}/{size}"] = result
+    return results
+
+
+def benchmark_previews(pages: int, repeat: int) -> Dict:
+    """Preview parse throughput for every preview variant"""
+    scraper = SportsMoleScraper()
+    results = {}
+    for variant in PREVIEW_TEMPLATES:
+        contents = [generate_preview_page(i, variant).encode('utf-8') for i in range(pages)]
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for content in contents:
+                if not scraper._parse_prediction_page(content):
+                    raise RuntimeError(f"{variant} preview page did not parse")
+            timings.append(time.perf_counter() - start)
+        results[variant] = {
+            'pages': pages,
+            'total_seconds': min(timings),
+            'pages_per_second': pages / min(timings)
+        }
+    return results
+
+
+class StubServer:
+    """Local HTTP server serving generated pages from memory"""
+    
+    def __init__(self, pages: Dict[str, bytes]):
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def do_GET(self):
+                body = pages.get(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+    
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def benchmark_end_to_end(sizes: List[int], workers: int, parse_workers: int = 0) -> Dict:
+    """get_all_matches_with_predictions against a stub server, cold prediction cache"""
+    results = {}
+    parse_pool = create_parse_pool(parse_workers)
+    if parse_pool is not None:
+        # Spawn the worker processes before timing
+        list(parse_pool.map(abs, range(parse_workers)))
+    for size in sizes:
+        pages = {'/football/fixtures/': generate_fixtures_page(size).encode('utf-8')}
+        for i in range(size):
+            pages[f'/football/home-team-{i}/preview/home-vs-away-{i}'] = generate_preview_page(i).encode('utf-8')
+        
+        with StubServer(pages) as server:
+            # No rate cap: the stub is local, this measures the scraper itself
+            scraper = SportsMoleScraper(max_workers=workers, prediction_cache=PredictionCache(),
+                                        rate_limiter=AdaptiveRateLimiter(requests_per_second=0,
+                                                                         initial_concurrency=workers,
+                                                                         max_concurrency=workers),
+                                        parse_pool=parse_pool)
+            scraper.BASE_URL = server.base_url
+            scraper.FIXTURES_URL = server.base_url + '/football/fixtures/'
+            
+            start = time.perf_counter()
+            matches = scraper.get_all_matches_with_predictions()
+            elapsed = time.perf_counter() - start
+        
+        predicted = sum(1 for match in matches if 'predicted_score' in match)
+        if predicted != size:
+            raise RuntimeError(f"End-to-end run returned {predicted} of {size} predictions")
+        results[str(size)] = {
+            'matches': size,
+            'workers': workers,
+            'parse_workers': parse_workers,
+            'total_seconds': elapsed,
+            'matches_per_second': size / elapsed
+        }
+    if parse_pool is not None:
+        parse_pool.shutdown()
+    return results
+
+
+def benchmark_replay(path: str, workers: int, repeat: int) -> Dict:
+    """get_all_matches_with_predictions replayed from an HTTP archive, cold prediction cache"""
+    archive = HTTPArchive(path, mode='replay', simulate_latency=False)
+    timings = []
+    for _ in range(repeat):
+        scraper = SportsMoleScraper(max_workers=workers, prediction_cache=PredictionCache(),
+                                    rate_limiter=AdaptiveRateLimiter(requests_per_second=0,
+                                                                     initial_concurrency=workers,
+                                                                     max_concurrency=workers),
+                                    http_archive=archive)
+        start = time.perf_counter()
+        matches = scraper.get_all_matches_with_predictions()
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    return {
+        'archive': path,
+        'responses': len(archive),
+        'matches': len(matches),
+        'predictions': sum(1 for match in matches if 'predicted_score' in match),
+        'workers': workers,
+        'total_seconds': best,
+        'matches_per_second': len(matches) / best if best else 0
+    }
+
+
+def benchmark_api(size: int, requests_per_query: int) -> Dict:
+    """/api/matches latency for each query against a snapshot of size matches"""
+    import api
+    api.init_app(start_refresh=False)
+    
+    content = generate_fixtures_page(size).encode('utf-8')
+    matches = SportsMoleScraper()._parse_fixtures_page(content)
+    api.store_snapshot(matches)
+    client = api.app.test_client()
+    
+    results = {}
+    for label, query in API_QUERIES.items():
+        timings = []
+        for _ in range(requests_per_query):
+            start = time.perf_counter()
+            response = client.get('/api/matches' + query)
+            timings.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                raise RuntimeError(f"/api/matches{query} returned {response.status_code}")
+        timings.sort()
+        results[label] = {
+            'median_ms': statistics.median(timings) * 1000,
+            'p95_ms': timings[int(len(timings) * 0.95) - 1] * 1000,
+            'response_bytes': len(response.get_data())
+        }
+    return {'matches': size, 'queries': results}
+
+
+def predicted_matches(size: int) -> List[Dict]:
+    """Parsed fixtures with the prediction fields of their parsed preview pages merged in"""
+    scraper = SportsMoleScraper()
+    matches = scraper._parse_fixtures_page(generate_fixtures_page(size).encode('utf-8'))
+    for i, match in enumerate(matches):
+        match.update(scraper._parse_prediction_page(generate_preview_page(i).encode('utf-8')))
+    return matches
+
+
+def footprint(root) -> int:
+    """Bytes held by root and everything it references, each shared object counted once"""
+    seen = set()
+    total = 0
+    pending = [root]
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            pending.extend(obj)
+        elif isinstance(obj, MatchRecord):
+            pending.extend(getattr(obj, name) for name in MatchRecord.__slots__ if hasattr(obj, name))
+    return total
+
+
+def benchmark_match_memory(size: int) -> Dict:
+    """Memory held per predicted match as plain dicts (as loaded from JSON) and as MatchRecords"""
+    payload = json.dumps(predicted_matches(size))
+    dict_bytes = footprint(json.loads(payload))
+    record_bytes = footprint([MatchRecord.from_dict(match) for match in json.loads(payload)])
+    return {
+        'matches': size,
+        'dict_bytes_per_match': dict_bytes / size,
+        'record_bytes_per_match': record_bytes / size,
+        'reduction_percent': (1 - record_bytes / dict_bytes) * 100
+    }
+
+
+def git_commit() -> str:
+    """Current commit hash, or None outside a git checkout"""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(sizes: List[int], e2e_sizes: List[int], repeat: int, workers: int,
+              parse_workers: int = 0) -> Dict:
+    """Run every benchmark and return a JSON-serializable report"""
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'parser': SportsMoleScraper.parser,
+        'targeted_parsing': SportsMoleScraper.targeted_parsing,
+        'layouts': benchmark_layouts(sizes, repeat),
+        'previews': benchmark_previews(200, repeat),
+        'end_to_end': benchmark_end_to_end(e2e_sizes, workers, parse_workers),
+        'api': benchmark_api(max(sizes), 50),
+        'match_memory': benchmark_match_memory(max(sizes)),
+    }
+
+
+def flatten(report: Dict, prefix: str = '') -> Dict[str, float]:
+    """Numeric leaves of a report keyed by their path, e.g. layouts.table/1000.total_seconds"""
+    values = {}
+    for key, value in report.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            values.update(flatten(value, path + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[path] = value
+    return values
+
+
+def compare(baseline: Dict, report: Dict):
+    """Print every timing, throughput and memory figure next to the baseline"""
+    old, new = flatten(baseline), flatten(report)
+    tracked = ('seconds', '_ms', 'per_second', 'memory_mb', 'bytes_per_match')
+    print(f"Comparing against {baseline.get('commit') or 'baseline'}")
+    print(f"{'Metric':<58} {'Baseline':>10} {'Current':>10} {'Change':>8}")
+    for path in sorted(set(old) & set(new)):
+        if not path.endswith(tracked) or not old[path]:
+            continue
+        change = (new[path] - old[path]) / old[path] * 100
+        print(f"{path:<58} {old[path]:>10.3f} {new[path]:>10.3f} {change:>+7.1f}%")
+
+
+def print_suite(report: Dict):
+    """Human-readable summary of a suite report"""
+    print(f"Parser: {report['parser']} (targeted: {report['targeted_parsing']})")
+    print(f"\n{'Layout/matches':<24} {'Total (s)':>10} {'Matches/s':>10} {'Peak MB':>10}")
+    for label, result in report['layouts'].items():
+        print(f"{label:<24} {result['total_seconds']:>10.3f} "
+              f"{result['matches_per_second']:>10.0f} {result['peak_memory_mb']:>10.1f}")
+    print(f"\n{'Preview variant':<24} {'Pages/s':>10}")
+    for label, result in report['previews'].items():
+        print(f"{label:<24} {result['pages_per_second']:>10.0f}")
+    print(f"\n{'End-to-end matches':<24} {'Total (s)':>10} {'Matches/s':>10}")
+    for label, result in report['end_to_end'].items():
+        print(f"{label:<24} {result['total_seconds']:>10.3f} {result['matches_per_second']:>10.0f}")
+    print(f"\n/api/matches with {report['api']['matches']} matches")
+    print(f"{'Query':<24} {'Median ms':>10} {'p95 ms':>10}")
+    for label, result in report['api']['queries'].items():
+        print(f"{label:<24} {result['median_ms']:>10.2f} {result['p95_ms']:>10.2f}")
+    memory = report['match_memory']
+    print(f"\nMemory per predicted match ({memory['matches']} matches): "
+          f"{memory['dict_bytes_per_match']:.0f} B as dicts, "
+          f"{memory['record_bytes_per_match']:.0f} B as records ({memory['reduction_percent']:.0f}% less)")
+
+
+def parse_sizes(value: str) -> List[int]:
+    """Parse a comma-separated list of sizes"""
+    return [int(size) for size in value.split(',') if size]
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--matches', type=int, default=2000, help='Number of matches on the generated page')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='Timed runs per configuration (best is reported)')
+    arg_parser.add_argument('--suite', action='store_true', help='Run the full benchmark suite')
+    arg_parser.add_argument('--sizes', type=parse_sizes, default=[100, 1000, 10000],
+                            help='Suite: comma-separated fixtures page sizes')
+    arg_parser.add_argument('--e2e-sizes', type=parse_sizes, default=[100, 1000],
+                            help='Suite: comma-separated match counts for the end-to-end scrape')
+    arg_parser.add_argument('--workers', type=int, default=8, help='Suite: preview fetch workers end-to-end')
+    arg_parser.add_argument('--parse-workers', type=int, default=0,
+                            help='Suite: preview parsing processes end-to-end (0 = parse in the fetch threads)')
+    arg_parser.add_argument('--output', help='Suite: write the JSON report to this file')
+    arg_parser.add_argument('--compare', help='Suite: JSON report of an earlier run to compare against')
+    arg_parser.add_argument('--replay', metavar='ARCHIVE', help='Scrape end-to-end from a recorded HTTP archive')
+    args = arg_parser.parse_args()
+    
+    # Parse logging would dominate the measurements
+    logging.disable(logging.INFO)
+    
+    if args.replay:
+        result = benchmark_replay(args.replay, args.workers, args.repeat)
+        print(f"Archive: {result['archive']} ({result['responses']} responses)")
+        print(f"{result['matches']} matches, {result['predictions']} predictions in "
+              f"{result['total_seconds']:.3f}s ({result['matches_per_second']:.0f} matches/s)")
+    elif args.suite:
+        report = run_suite(args.sizes, args.e2e_sizes, args.repeat, args.workers, args.parse_workers)
+        print_suite(report)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"\nReport written to {args.output}")
+        if args.compare:
+            with open(args.compare) as f:
+                print()
+                compare(json.load(f), report)
+    else:
+        report = run_parser_benchmark(args.matches, args.repeat)
+        print(f"Fixtures page: {args.matches} matches, {report['page_bytes'] / 1024:.0f} KiB")
+        print(f"{'Configuration':<28} {'Matches':>8} {'Tree (s)':>10} {'Total (s)':>10} {'Peak MB':>10}")
+        for label, result in report['results'].items():
+            print(f"{label:<28} {result['matches']:>8} {result['tree_seconds']:>10.3f} "
+                  f"{result['total_seconds']:>10.3f} {result['peak_memory_mb']:>10.1f}")
@@ -0,0 +1,163 @@
+"""
+Change feed for SportsMole Scraper API
+Versions every cache snapshot and answers "what changed since version N"
+so polling clients can sync incrementally instead of re-downloading the
+whole match list
+"""
+
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Mapping, Optional
+import threading
+from config import CHANGE_FEED_RETENTION
+
+
+class ChangesExpired(Exception):
+    """Raised when a requested version is older than the feed retains"""
+
+
+def snapshot_version(last_updated: datetime) -> int:
+    """
+    Version number of a snapshot: its scrape time in milliseconds
+    
+    Derived from the snapshot itself rather than a counter, so every worker
+    process that adopts the same snapshot reports the same version.
+    """
+    return int(last_updated.timestamp() * 1000)
+
+
+class ChangeFeed:
+    """
+    Per-match and per-field change tracking across snapshots
+    
+    Instead of keeping old snapshots around, the feed remembers the version
+    in which each match appeared, each of its fields last changed, and each
+    removed match disappeared (a tombstone). Changes since any version are
+    then read off the current snapshot directly, and are exact even for
+    versions this process never saw (e.g. published by another worker).
+    
+    Tombstones are kept for the last `retention` versions; older versions
+    raise ChangesExpired and the client has to resync from /api/matches.
+    Version 0 always returns the full snapshot as added.
+    """
+    
+    def __init__(self, retention: int = CHANGE_FEED_RETENTION):
+        self.retention = max(1, retention)
+        self.version = 0
+        self.last_updated: Optional[datetime] = None
+        # Oldest version that changes can be computed from
+        self.floor = 0
+        self._matches: Dict[str, Mapping] = {}
+        self._added_at: Dict[str, int] = {}
+        self._field_versions: Dict[str, Dict[str, int]] = {}
+        self._removed_at: Dict[str, int] = {}
+        self._versions = deque()
+        self._responses: Dict[int, Dict] = {}
+        self._lock = threading.Lock()
+    
+    def publish(self, matches: List[Mapping], last_updated: datetime) -> int:
+        """
+        Record a new snapshot
+        
+        Publishing the current snapshot again (same last_updated, e.g. when
+        it is adopted from the shared cache twice) is a no-op.
+        
+        Args:
+            matches: Matches of the snapshot (each with an 'id')
+            last_updated: When the snapshot was scraped
+        
+        Returns:
+            Version of the snapshot
+        """
+        with self._lock:
+            if last_updated == self.last_updated:
+                return self.version
+            version = max(snapshot_version(last_updated), self.version + 1)
+            current = {match['id']: match for match in matches}
+            
+            for match_id, match in current.items():
+                previous = self._matches.get(match_id)
+                if previous is None:
+                    self._added_at[match_id] = version
+                    self._field_versions[match_id] = {field: version for field in match}
+                    self._removed_at.pop(match_id, None)
+                    continue
+                field_versions = self._field_versions[match_id]
+                for field in match:
+                    if field not in previous or previous[field] != match[field]:
+                        field_versions[field] = version
+                for field in previous:
+                    if field not in match:
+                        field_versions[field] = version
+            
+            for match_id in self._matches.keys() - current.keys():
+                self._removed_at[match_id] = version
+                del self._added_at[match_id]
+                del self._field_versions[match_id]
+            
+            if not self._versions:
+                # Nothing is known about what happened before the first snapshot
+                self.floor = version
+            self._versions.append(version)
+            while len(self._versions) > self.retention + 1:
+                self._versions.popleft()
+                self.floor = self._versions[0]
+            self._removed_at = {match_id: removed for match_id, removed in self._removed_at.items()
+                                if removed > self.floor}
+            
+            self._matches = current
+            self.version = version
+            self.last_updated = last_updated
+            self._responses = {}
+            return version
+    
+    def changes_since(self, since: int) -> Dict:
+        """
+        Changes between version `since` and the current snapshot
+        
+        Returns:
+            Dictionary with the current 'version', 'added' (full matches),
+            'changed' (id, changed fields with their new values, and
+            removed_fields) and 'removed' (match IDs)
+        
+        Raises:
+            ChangesExpired: If since is older than the retained versions
+        """
+        with self._lock:
+            if 0 < since < self.floor:
+                raise ChangesExpired(f"Version {since} is no longer available (oldest: {self.floor})")
+            cached = self._responses.get(since)
+            if cached is not None:
+                return cached
+            
+            added, changed = [], []
+            for match_id, match in self._matches.items():
+                if self._added_at[match_id] > since:
+                    added.append(match)
+                    continue
+                fields = {}
+                removed_fields = []
+                for field, changed_at in self._field_versions[match_id].items():
+                    if changed_at > since:
+                        if field in match:
+                            fields[field] = match[field]
+                        else:
+                            removed_fields.append(field)
+                if fields or removed_fields:
+                    entry = {'id': match_id, 'fields': fields}
+                    if removed_fields:
+                        entry['removed_fields'] = removed_fields
+                    changed.append(entry)
+            
+            result = {
+                'since': since,
+                'version': self.version,
+                'added': added,
+                'changed': changed,
+                'removed': [match_id for match_id, removed in self._removed_at.items()
+                            if since and removed > since]
+            }
+            # Polling clients mostly ask for the same few versions
+            if len(self._responses) < 64:
+                self._responses[since] = result
+            return result
@@ -15,10 +15,66 @@ USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTM
 
 # Cache settings
 CACHE_DURATION_MINUTES = 30
+# Once the cache expires it keeps being served while a background refresh runs.
+# If the snapshot grows older than this, /api/health reports "degraded".
+CACHE_STALE_LIMIT_MINUTES = int(os.getenv("CACHE_STALE_LIMIT_MINUTES", "120"))
+
+# Snapshot store settings
+# Every refresh is saved to SQLite; on startup the API serves the latest
+# stored snapshot immediately and refreshes in the background.
+SNAPSHOT_STORE_ENABLED = os.getenv("SNAPSHOT_STORE_ENABLED", "true").lower() in ("true", "1", "yes")
+SNAPSHOT_DB_PATH = os.getenv("SNAPSHOT_DB_PATH", ".cache/snapshots.sqlite3")
+SNAPSHOT_RETENTION_COUNT = int(os.getenv("SNAPSHOT_RETENTION_COUNT", "1000"))
+
+# Change feed settings
+# /api/changes?since=<version> can answer for the last CHANGE_FEED_RETENTION
+# snapshots; clients further behind must reload /api/matches.
+CHANGE_FEED_RETENTION = int(os.getenv("CHANGE_FEED_RETENTION", "100"))
+
+# Server-Sent Events settings (/api/events)
+# Idle streams get a heartbeat comment every SSE_HEARTBEAT_SECONDS; each
+# stream holds a worker thread, so at most SSE_MAX_CLIENTS are served per
+# process. SSE_RETRY_MS is the reconnect delay suggested to clients.
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+SSE_MAX_CLIENTS = int(os.getenv("SSE_MAX_CLIENTS", "1000"))
+SSE_RETRY_MS = int(os.getenv("SSE_RETRY_MS", "5000"))
+
+# Shared cache settings (for running several API worker processes)
+# "local": every worker scrapes and caches on its own.
+# "file": workers share one snapshot through a file, and only
+# one of them refreshes at a time (workers must run on the same host).
+SHARED_CACHE_BACKEND = os.getenv("SHARED_CACHE_BACKEND", "local")
+SHARED_CACHE_PATH = os.getenv("SHARED_CACHE_PATH", ".cache/shared_snapshot")
+
+# HTTP response cache settings
+# When enabled, fetched pages are stored on disk with their ETag/Last-Modified
+# validators and revalidated with conditional GETs on the next refresh.
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "false").lower() in ("true", "1", "yes")
+HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", ".cache/http_cache.sqlite3")
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+# HTTP archive (record/replay)
+# "record": every response fetched by the scraper is appended to the archive.
+# "replay": responses are served from the archive and the network is never
+# touched; HTTP_ARCHIVE_REPLAY_LATENCY delays them by their recorded time.
+HTTP_ARCHIVE_MODE = os.getenv("HTTP_ARCHIVE_MODE", "off").lower()
+HTTP_ARCHIVE_PATH = os.getenv("HTTP_ARCHIVE_PATH", ".cache/http_archive.jsonl.gz")
+HTTP_ARCHIVE_REPLAY_LATENCY = os.getenv("HTTP_ARCHIVE_REPLAY_LATENCY", "false").lower() in ("true", "1", "yes")
+
+# Prediction cache settings (per preview URL)
+# Cached predictions are reused across refreshes until they expire, are
+# evicted (least recently used first), or the match is close to kickoff.
+PREDICTION_CACHE_ENABLED = os.getenv("PREDICTION_CACHE_ENABLED", "true").lower() in ("true", "1", "yes")
+PREDICTION_CACHE_TTL_MINUTES = int(os.getenv("PREDICTION_CACHE_TTL_MINUTES", "360"))
+PREDICTION_CACHE_MAX_ENTRIES = int(os.getenv("PREDICTION_CACHE_MAX_ENTRIES", "5000"))
+PREDICTION_CACHE_KICKOFF_WINDOW_MINUTES = int(os.getenv("PREDICTION_CACHE_KICKOFF_WINDOW_MINUTES", "180"))
 
 # API settings
 API_HOST = os.getenv("API_HOST", "0.0.0.0")
 API_PORT = int(os.getenv("API_PORT", "5000"))
+# Pagination for /api/matches (used when cursor or page_size is given)
+API_DEFAULT_PAGE_SIZE = int(os.getenv("API_DEFAULT_PAGE_SIZE", "50"))
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "500"))
 # WARNING: Set DEBUG_MODE to False in production environments
 # Debug mode can expose sensitive information and allow arbitrary code execution
 # Can be overridden with environment variable: export DEBUG_MODE=false
@@ -28,6 +84,65 @@ DEBUG_MODE = os.getenv("DEBUG_MODE", "true").lower() in ("true", "1", "yes")
 LOG_LEVEL = "INFO"
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
+# Timezone of the times shown on SportsMole, applied to scraped kickoff
+# times (and to API date parameters) that carry no timezone of their own
+SITE_TIMEZONE = os.getenv("SITE_TIMEZONE", "Europe/London")
+
+# Parser settings
+# BeautifulSoup backend: "lxml" (fast, falls back to "html.parser" if lxml
+# is not installed), "html.parser" or "html5lib"
+HTML_PARSER = os.getenv("HTML_PARSER", "lxml")
+# Only build the parts of each page the scraper reads (match containers,
+# prediction and statistics sections) instead of the whole document tree
+HTML_TARGETED_PARSING = os.getenv("HTML_TARGETED_PARSING", "true").lower() in ("true", "1", "yes")
+
 # Scraper settings
+# Attempts per page. Only transient failures (connection errors, timeouts,
+# 408/429/5xx) are retried, after an exponential backoff with jitter
+# starting at RETRY_DELAY and capped at RETRY_MAX_DELAY (a longer
+# Retry-After from the server means the page is not retried).
 MAX_RETRIES = 3
 RETRY_DELAY = 2  # seconds
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "30"))  # seconds
+# After this many consecutive transient failures, requests fail immediately
+# for CIRCUIT_BREAKER_RESET_SECONDS, then a single trial request is let through.
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "5"))
+CIRCUIT_BREAKER_RESET_SECONDS = float(os.getenv("CIRCUIT_BREAKER_RESET_SECONDS", "60"))
+
+# Concurrency settings
+# Number of preview pages fetched in parallel by get_all_matches_with_predictions.
+# Set to 1 to fetch previews sequentially.
+PREVIEW_WORKERS = int(os.getenv("PREVIEW_WORKERS", "8"))
+# Processes that parse preview pages. 0 parses in the fetching threads;
+# more than 0 moves parsing off the GIL into a process pool, overlapped with
+# the fetches still in flight, so large refreshes use several cores.
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "0"))
+# Maximum number of in-flight requests for AsyncSportsMoleScraper.
+# Also caps the size of its aiohttp connection pool.
+ASYNC_MAX_CONCURRENCY = int(os.getenv("ASYNC_MAX_CONCURRENCY", "100"))
+
+# Fixture crawl settings
+# The fixtures page is always crawled; CRAWL_SEED_URLS adds more listing
+# pages (comma-separated, e.g. competition or date fixture pages, absolute
+# or relative to BASE_URL). With CRAWL_MAX_DEPTH > 0, links to other
+# fixture listing pages are followed up to that many hops from a seed.
+# At most CRAWL_MAX_PAGES pages are fetched, CRAWL_WORKERS at a time, and
+# matches listed on several pages are kept once.
+CRAWL_SEED_URLS = [url.strip() for url in os.getenv("CRAWL_SEED_URLS", "").split(",") if url.strip()]
+CRAWL_MAX_DEPTH = int(os.getenv("CRAWL_MAX_DEPTH", "0"))
+CRAWL_MAX_PAGES = int(os.getenv("CRAWL_MAX_PAGES", "50"))
+CRAWL_WORKERS = int(os.getenv("CRAWL_WORKERS", "4"))
+
+# Outbound rate limiting
+# A token bucket caps the request rate (0 = no cap); within that cap the
+# number of concurrent requests adapts: +1 per healthy round of requests,
+# multiplied by RATE_LIMIT_BACKOFF_FACTOR on 429/503, errors, or latency
+# above RATE_LIMIT_LATENCY_FACTOR times the usual latency.
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("true", "1", "yes")
+RATE_LIMIT_REQUESTS_PER_SECOND = float(os.getenv("RATE_LIMIT_REQUESTS_PER_SECOND", "5"))
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "10"))
+RATE_LIMIT_INITIAL_CONCURRENCY = int(os.getenv("RATE_LIMIT_INITIAL_CONCURRENCY", "2"))
+RATE_LIMIT_MIN_CONCURRENCY = int(os.getenv("RATE_LIMIT_MIN_CONCURRENCY", "1"))
+RATE_LIMIT_MAX_CONCURRENCY = int(os.getenv("RATE_LIMIT_MAX_CONCURRENCY", str(PREVIEW_WORKERS)))
+RATE_LIMIT_BACKOFF_FACTOR = float(os.getenv("RATE_LIMIT_BACKOFF_FACTOR", "0.5"))
+RATE_LIMIT_LATENCY_FACTOR = float(os.getenv("RATE_LIMIT_LATENCY_FACTOR", "3"))
@@ -0,0 +1,149 @@
+"""
+Fixture crawl frontier for SportsMole Scraper
+Schedules fixture listing pages (the main fixtures page, competition and
+date pages) for crawling and merges the matches they list into one
+deduplicated set
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from config import CRAWL_MAX_DEPTH, CRAWL_MAX_PAGES
+
+# Query parameters that never change the page content
+IGNORED_QUERY_PARAMS = {'utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content', 'ref'}
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Canonical form of a URL used to recognise the same page
+    
+    Lowercases the scheme and host, drops default ports, fragments,
+    tracking parameters and trailing slashes, and sorts the query string,
+    so "HTTPS://www.sportsmole.co.uk:443/football/fixtures/#top" and
+    "https://www.sportsmole.co.uk/football/fixtures" are the same page.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip('/') or '/'
+    query = urlencode(sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                             if name.lower() not in IGNORED_QUERY_PARAMS))
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+class CrawlPage(NamedTuple):
+    """A page waiting in the frontier"""
+    url: str
+    depth: int
+    order: int  # Discovery order, used to merge results deterministically
+
+
+class CrawlFrontier:
+    """
+    Breadth-first queue of pages to crawl
+    
+    Every URL is admitted at most once (by canonical URL), only within the
+    allowed hosts, no deeper than max_depth links from a seed, and no more
+    than max_pages in total.
+    """
+    
+    def __init__(self, max_depth: int = CRAWL_MAX_DEPTH, max_pages: int = CRAWL_MAX_PAGES,
+                 allowed_hosts: Optional[Iterable[str]] = None):
+        """
+        Args:
+            max_depth: Link hops followed from a seed page (0 = seeds only)
+            max_pages: Maximum number of pages admitted
+            allowed_hosts: Hosts links may point to (default: the seeds' hosts)
+        """
+        self.max_depth = max(0, max_depth)
+        self.max_pages = max(1, max_pages)
+        self.allowed_hosts: Optional[Set[str]] = set(allowed_hosts) if allowed_hosts is not None else None
+        self.seen: Set[str] = set()
+        self.skipped = 0
+        self._queue = deque()
+    
+    def add(self, url: str, depth: int = 0) -> bool:
+        """
+        Queue a page unless it was seen before or falls outside the limits
+        
+        Returns:
+            True if the page was queued
+        """
+        if depth > self.max_depth:
+            return False
+        key = canonicalize_url(url)
+        if key in self.seen:
+            return False
+        host = urlsplit(key).netloc
+        if depth == 0:
+            if self.allowed_hosts is None:
+                self.allowed_hosts = set()
+            self.allowed_hosts.add(host)
+        elif self.allowed_hosts is not None and host not in self.allowed_hosts:
+            return False
+        if len(self.seen) >= self.max_pages:
+            self.skipped += 1
+            return False
+        self._queue.append(CrawlPage(url.split('#', 1)[0], depth, len(self.seen)))
+        self.seen.add(key)
+        return True
+    
+    def pop(self) -> Optional[CrawlPage]:
+        """Next page to crawl, or None if the queue is empty"""
+        return self._queue.popleft() if self._queue else None
+    
+    def follows_links(self, page: CrawlPage) -> bool:
+        """Check if links found on a page should be queued"""
+        return page.depth < self.max_depth
+    
+    def __len__(self):
+        return len(self._queue)
+
+
+class MatchSet:
+    """
+    Matches merged from several listing pages, keyed by match ID
+    
+    The first listing of a match decides its position; later listings of
+    the same match only fill in fields the first one was missing (e.g. the
+    competition on a date page that does not show it). Listings are the
+    same match when their IDs agree, which for matches without a
+    preview_url means the teams, date and competition all agree, so a
+    listing without a competition only merges with one that has it when
+    both link the same preview page.
+    """
+    
+    def __init__(self):
+        self._by_id: Dict[str, Dict] = {}
+        self.duplicates = 0
+    
+    def add(self, matches: Iterable[Dict]) -> int:
+        """
+        Merge matches into the set
+        
+        Returns:
+            Number of matches that were not in the set yet
+        """
+        added = 0
+        for match in matches:
+            existing = self._by_id.get(match['id'])
+            if existing is None:
+                self._by_id[match['id']] = match
+                added += 1
+            else:
+                self.duplicates += 1
+                for field, value in match.items():
+                    existing.setdefault(field, value)
+        return added
+    
+    @property
+    def matches(self) -> List[Dict]:
+        return list(self._by_id.values())
+    
+    def __len__(self):
+        return len(self._by_id)
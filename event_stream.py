@@ -0,0 +1,103 @@
+"""
+Server-Sent Events support for SportsMole Scraper API
+Wakes every connected /api/events client when a new cache snapshot is
+stored, so dashboards can hold one idle connection instead of polling
+"""
+
+from typing import Any, Callable, Dict, Hashable, Optional
+import json
+import threading
+from config import SSE_MAX_CLIENTS
+from match_record import json_default
+
+# Comment line sent to idle clients so proxies keep the connection open
+# and disconnected clients are noticed
+HEARTBEAT = ': heartbeat\n\n'
+
+
+def format_event(data, event: Optional[str] = None, event_id: Optional[int] = None) -> str:
+    """
+    Encode one event in the text/event-stream format
+    
+    Args:
+        data: JSON-serializable payload (may contain MatchRecords)
+        event: Event type (the client's addEventListener name)
+        event_id: Event ID, sent back by the client as Last-Event-ID on reconnect
+    """
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'), default=json_default)}")
+    return '\n'.join(lines) + '\n\n'
+
+
+class EventBroadcaster:
+    """
+    Notifies streaming clients of new snapshot versions
+    
+    Each client thread blocks in wait() until the version moves past the
+    one it has seen, then renders the events it is missing. Rendered
+    events are shared: the thousands of clients that were all on the
+    previous version get one serialized payload between them. The number
+    of concurrent clients is capped, since each holds a worker thread.
+    """
+    
+    def __init__(self, max_clients: int = SSE_MAX_CLIENTS):
+        self.max_clients = max_clients
+        self.version = 0
+        self.clients = 0
+        self._condition = threading.Condition()
+        self._rendered: Dict[Hashable, Any] = {}
+    
+    def publish(self, version: int):
+        """Announce a new snapshot version and wake every waiting client"""
+        with self._condition:
+            self.version = version
+            self._rendered = {}
+            self._condition.notify_all()
+    
+    def subscribe(self) -> bool:
+        """
+        Register a client
+        
+        Returns:
+            False if max_clients are already connected
+        """
+        with self._condition:
+            if self.clients >= self.max_clients:
+                return False
+            self.clients += 1
+            return True
+    
+    def unsubscribe(self):
+        """Unregister a client registered with subscribe"""
+        with self._condition:
+            self.clients -= 1
+    
+    def wait(self, after: int, timeout: float) -> int:
+        """
+        Block until the version is newer than `after` or the timeout passes
+        
+        Returns:
+            The current version
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self.version > after, timeout)
+            return self.version
+    
+    def render(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """
+        Events for `key`, built once per published version
+        
+        Args:
+            key: What the events depend on besides the version (e.g. the
+                version the client has seen)
+            build: Renders the events on a miss
+        """
+        with self._condition:
+            rendered = self._rendered.get(key)
+            if rendered is None:
+                rendered = self._rendered[key] = build()
+            return rendered
@@ -74,7 +74,8 @@ def example_api_requests():
         ("Filter by competition", "curl http://localhost:5000/api/matches?competition=premier"),
         ("Filter by team", "curl http://localhost:5000/api/matches?team=chelsea"),
         ("Get match count", "curl http://localhost:5000/api/matches/count"),
-        ("Get specific match", "curl http://localhost:5000/api/matches/0"),
+        ("Get specific match", "curl http://localhost:5000/api/matches/<match_id>"),
+        ("Get several matches", "curl 'http://localhost:5000/api/matches/batch?ids=<id>,<id>'"),
         ("Force refresh cache", "curl -X POST http://localhost:5000/api/refresh"),
         ("Health check", "curl http://localhost:5000/api/health"),
     ]
@@ -0,0 +1,188 @@
+"""
+HTTP archive for SportsMole Scraper
+Records fetched responses to a compressed on-disk archive and replays them
+without touching the network, for reproducing parsing issues, deterministic
+benchmarks on real pages and load tests that don't hit SportsMole
+"""
+
+import base64
+import gzip
+import json
+import os
+import threading
+import time
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from config import HTTP_ARCHIVE_PATH, HTTP_ARCHIVE_REPLAY_LATENCY
+
+logger = logging.getLogger(__name__)
+
+# Headers describing the wire encoding; the archived body is already decoded
+WIRE_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+
+class HTTPArchive:
+    """
+    Gzip-compressed JSON-lines file of HTTP exchanges
+    
+    Each line holds one response: URL, method, status, headers, body
+    (base64) and the time it took. Every record is appended as its own
+    gzip member, so an interrupted recording keeps everything written so
+    far. When replaying, the most recent record for a URL wins.
+    """
+    
+    RECORD = 'record'
+    REPLAY = 'replay'
+    
+    def __init__(self, path: str = HTTP_ARCHIVE_PATH, mode: str = RECORD,
+                 simulate_latency: bool = HTTP_ARCHIVE_REPLAY_LATENCY):
+        """
+        Args:
+            path: Archive file
+            mode: 'record' to archive live responses, 'replay' to serve them
+            simulate_latency: When replaying, delay each response by the time
+                it originally took
+        """
+        if mode not in (self.RECORD, self.REPLAY):
+            raise ValueError(f"Unknown HTTP archive mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.simulate_latency = simulate_latency
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict]] = None
+    
+    def record(self, response: requests.Response, elapsed: float):
+        """Append a response to the archive"""
+        entry = {
+            'url': response.request.url if response.request is not None else response.url,
+            'method': response.request.method if response.request is not None else 'GET',
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': {name: value for name, value in response.headers.items()
+                        if name.lower() not in WIRE_HEADERS},
+            'body': base64.b64encode(response.content).decode('ascii'),
+            'elapsed': round(elapsed, 4),
+            'recorded_at': datetime.now().isoformat()
+        }
+        line = (json.dumps(entry, separators=(',', ':')) + '\n').encode('utf-8')
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with gzip.open(self.path, 'ab') as f:
+                f.write(line)
+            if self._entries is not None:
+                self._entries[self._key(entry['method'], entry['url'])] = entry
+    
+    def _load(self) -> Dict[str, Dict]:
+        """Read the archive into memory (lock must be held)"""
+        if self._entries is None:
+            self._entries = {}
+            if os.path.exists(self.path):
+                with gzip.open(self.path, 'rb') as f:
+                    for line in f:
+                        entry = json.loads(line)
+                        self._entries[self._key(entry['method'], entry['url'])] = entry
+                logger.info(f"Loaded {len(self._entries)} archived responses from {self.path}")
+        return self._entries
+    
+    @staticmethod
+    def _key(method: str, url: str) -> str:
+        return f"{method} {url}"
+    
+    def get(self, url: str, method: str = 'GET') -> Optional[Dict]:
+        """Archived entry for a URL, or None"""
+        with self._lock:
+            return self._load().get(self._key(method, url))
+    
+    def __len__(self):
+        with self._lock:
+            return len(self._load())
+    
+    def adapter(self, adapter: BaseAdapter) -> BaseAdapter:
+        """
+        Transport adapter for a requests Session in this archive's mode
+        
+        Args:
+            adapter: Adapter that would send requests without the archive
+        
+        Returns:
+            A RecordingAdapter wrapping it, or a ReplayAdapter replacing it
+        """
+        if self.mode == self.REPLAY:
+            return ReplayAdapter(self, self.simulate_latency)
+        return RecordingAdapter(adapter, self)
+
+
+class RecordingAdapter(BaseAdapter):
+    """
+    requests transport adapter that archives every response
+    
+    Wraps the adapter that really sends the request (plain or caching),
+    so what is recorded is exactly what the scraper received.
+    """
+    
+    def __init__(self, adapter: BaseAdapter, archive: HTTPArchive):
+        super().__init__()
+        self.adapter = adapter
+        self.archive = archive
+    
+    def send(self, request, **kwargs):
+        start = time.perf_counter()
+        response = self.adapter.send(request, **kwargs)
+        # Reading the body here keeps the recorded time comparable to replay
+        response.content
+        self.archive.record(response, time.perf_counter() - start)
+        return response
+    
+    def close(self):
+        self.adapter.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    requests transport adapter that answers from an archive only
+    
+    URLs missing from the archive get a 404 with an X-Archive-Miss
+    header, so the scraper treats them as absent pages instead of
+    retrying. With simulate_latency, each response is delayed by the time
+    it originally took.
+    """
+    
+    def __init__(self, archive: HTTPArchive, simulate_latency: bool = False):
+        super().__init__()
+        self.archive = archive
+        self.simulate_latency = simulate_latency
+        self.misses = 0
+    
+    def send(self, request, **kwargs):
+        entry = self.archive.get(request.url, request.method)
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        response.from_cache = False
+        
+        if entry is None:
+            self.misses += 1
+            logger.warning(f"No archived response for {request.method} {request.url}")
+            response.status_code = 404
+            response.reason = 'Not Found'
+            response.headers = CaseInsensitiveDict({'X-Archive-Miss': '1'})
+            response._content = b''
+        else:
+            if self.simulate_latency:
+                time.sleep(entry['elapsed'])
+            response.status_code = entry['status']
+            response.reason = entry['reason']
+            response.headers = CaseInsensitiveDict(entry['headers'])
+            response._content = base64.b64decode(entry['body'])
+            response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response._content_consumed = True
+        return response
+    
+    def close(self):
+        pass
@@ -0,0 +1,162 @@
+"""
+Persistent HTTP response cache for SportsMole Scraper
+Revalidates cached pages with ETag / Last-Modified and reuses the stored
+body when the server answers 304 Not Modified
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+from typing import Dict, Optional
+from requests.adapters import HTTPAdapter
+from config import HTTP_CACHE_PATH, HTTP_CACHE_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+# Response headers kept alongside the body; encoding and length are dropped
+# because the stored body is already decoded
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+class HTTPResponseCache:
+    """
+    Size-bounded on-disk store of response bodies and their validators
+    
+    Backed by SQLite so it survives restarts and can be shared between
+    processes. When the total body size exceeds max_bytes the least
+    recently used responses are evicted.
+    """
+    
+    def __init__(self, path: str = HTTP_CACHE_PATH, max_bytes: int = HTTP_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+        self._conn.commit()
+    
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the cached entry for a URL as {'headers': dict, 'body': bytes}"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT headers, body FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+        return {'headers': json.loads(row[0]), 'body': bytes(row[1])}
+    
+    def set(self, url: str, headers: Dict, body: bytes):
+        """Store a response and evict old entries if the cache is over its size limit"""
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (url, headers, body, size, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (url, json.dumps(headers), sqlite3.Binary(body), len(body), time.time())
+            )
+            self._evict()
+            self._conn.commit()
+    
+    def update_headers(self, url: str, headers: Dict):
+        """Replace the stored validators after a 304 response"""
+        with self._lock:
+            self._conn.execute("UPDATE responses SET headers = ? WHERE url = ?", (json.dumps(headers), url))
+            self._conn.commit()
+    
+    def _evict(self):
+        """Drop least recently used responses until under max_bytes (lock must be held)"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT url, size FROM responses ORDER BY accessed_at").fetchall()
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            total -= size
+            logger.debug(f"Evicted {url} from HTTP cache")
+    
+    def total_bytes(self) -> int:
+        """Total size of stored bodies"""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+    
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    
+    def close(self):
+        """Close the underlying database"""
+        with self._lock:
+            self._conn.close()
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """
+    requests transport adapter that makes GETs conditional
+    
+    Sends If-None-Match / If-Modified-Since for URLs in the cache. A 304
+    answer is turned into a 200 carrying the cached body, so callers see
+    a normal response. Responses served this way have from_cache set.
+    """
+    
+    def __init__(self, cache: HTTPResponseCache, **kwargs):
+        self.cache = cache
+        self.revalidated = 0
+        self.stored = 0
+        super().__init__(**kwargs)
+    
+    def send(self, request, **kwargs):
+        if request.method != 'GET':
+            return super().send(request, **kwargs)
+        
+        entry = self.cache.get(request.url)
+        if entry:
+            validators = entry['headers']
+            if 'ETag' in validators:
+                request.headers['If-None-Match'] = validators['ETag']
+            if 'Last-Modified' in validators:
+                request.headers['If-Modified-Since'] = validators['Last-Modified']
+        
+        response = super().send(request, **kwargs)
+        response.from_cache = False
+        
+        if response.status_code == 304 and entry:
+            headers = dict(entry['headers'])
+            for name in ('ETag', 'Last-Modified'):
+                if name in response.headers:
+                    headers[name] = response.headers[name]
+            if headers != entry['headers']:
+                self.cache.update_headers(request.url, headers)
+            response.status_code = 200
+            response.reason = 'OK'
+            response._content = entry['body']
+            response._content_consumed = True
+            response.headers.update(headers)
+            response.from_cache = True
+            self.revalidated += 1
+            logger.debug(f"HTTP cache revalidated {request.url}")
+        elif response.status_code == 200 and ('ETag' in response.headers or 'Last-Modified' in response.headers):
+            headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+            self.cache.set(request.url, headers, response.content)
+            self.stored += 1
+        
+        return response
@@ -0,0 +1,107 @@
+"""
+Kickoff times for SportsMole Scraper
+Parses scraped fixture dates into timezone-aware kickoff times, in the
+site's timezone when the text has no offset
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Mapping, Optional, Tuple
+import re
+from dateutil import parser as date_parser
+from dateutil import tz
+from config import SITE_TIMEZONE
+
+SITE_TZ = tz.gettz(SITE_TIMEZONE) or timezone.utc
+
+# Day words used on fixture listings instead of a date, as days from today
+RELATIVE_DAYS = {'today': 0, 'tonight': 0, 'tomorrow': 1}
+RELATIVE_DAY_PATTERN = re.compile(r'^(today|tonight|tomorrow)\b[\s,]*(.*)$', re.IGNORECASE)
+
+# Dates without a year more than this far in the past are taken to be next year's
+YEARLESS_PAST_LIMIT = timedelta(days=30)
+
+# Parsing with two defaults that differ in every date part shows which parts
+# the text actually contains (both are leap years, so "29 Feb" parses)
+PARSE_DEFAULTS = (datetime(2004, 1, 1), datetime(2008, 2, 2))
+
+
+def localize(value: datetime) -> datetime:
+    """Attach the site timezone to a naive datetime; aware datetimes are returned as is"""
+    return value.replace(tzinfo=SITE_TZ) if value.tzinfo is None else value
+
+
+def parse_kickoff(date_text: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a scraped date string into a timezone-aware datetime
+    
+    Accepts dates with a day and month ("Sat 3 Jan, 15:00", "Dec 12, 2025
+    15:00", ISO 8601) and "Today"/"Tonight"/"Tomorrow" with an optional
+    time. Times without a timezone are taken to be in SITE_TIMEZONE. A date
+    without a year is this year's, or next year's if that would put it more
+    than YEARLESS_PAST_LIMIT in the past. Nothing is guessed: text with
+    other words, or without a day and month, is not a kickoff.
+    
+    Returns:
+        The kickoff time, or None if the text is not a date
+    """
+    if not date_text:
+        return None
+    return _parse_kickoff(date_text, date.today())
+
+
+def _parse_date_parts(text: str) -> Optional[Tuple[datetime, Tuple[bool, bool, bool]]]:
+    """
+    Parse text strictly
+    
+    Returns:
+        Tuple of (parsed datetime, whether the year, month and day were in
+        the text), or None if the text does not parse
+    """
+    try:
+        first, second = (date_parser.parse(text, default=default) for default in PARSE_DEFAULTS)
+    except (ValueError, OverflowError):
+        return None
+    return first, (first.year == second.year, first.month == second.month, first.day == second.day)
+
+
+@lru_cache(maxsize=4096)
+def _parse_kickoff(date_text: str, today: date) -> Optional[datetime]:
+    # Memoized per day, since every match on a fixtures page shares a handful of dates
+    relative = RELATIVE_DAY_PATTERN.match(date_text.strip())
+    if relative:
+        day = today + timedelta(days=RELATIVE_DAYS[relative.group(1).lower()])
+        if not relative.group(2):
+            return localize(datetime.combine(day, time()))
+        parsed = _parse_date_parts(relative.group(2))
+        if parsed is None or any(parsed[1]):
+            # Only a time may follow the day word
+            return None
+        return localize(datetime.combine(day, parsed[0].time(), parsed[0].tzinfo))
+    
+    parsed = _parse_date_parts(date_text)
+    if parsed is None:
+        return None
+    kickoff, (has_year, has_month, has_day) = parsed
+    if not (has_month and has_day):
+        return None
+    if not has_year:
+        try:
+            kickoff = kickoff.replace(year=today.year)
+            if kickoff.date() < today - YEARLESS_PAST_LIMIT:
+                kickoff = kickoff.replace(year=today.year + 1)
+        except ValueError:
+            # 29 February outside a leap year
+            return None
+    return localize(kickoff)
+
+
+def match_kickoff(match: Mapping) -> Optional[datetime]:
+    """Kickoff of a match: its parsed `kickoff` field, else parsed from its date text"""
+    kickoff = match.get('kickoff')
+    if kickoff:
+        try:
+            return datetime.fromisoformat(kickoff)
+        except ValueError:
+            pass
+    return parse_kickoff(match.get('date'))
@@ -0,0 +1,177 @@
+"""
+Match indexes for SportsMole Scraper API
+Normalized inverted indexes over a cache snapshot so team and competition
+filters do not rescan every match on each request
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+import hashlib
+import threading
+import unicodedata
+from kickoff import localize, match_kickoff
+
+# Substring lookups memoized per snapshot; queries beyond this are computed
+# on every request, so arbitrary ?team= values cannot grow memory
+MAX_MEMOIZED_LOOKUPS = 256
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Case- and accent-insensitive form of a string ("Atlético" -> "atletico")"""
+    if not text:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold().strip()
+
+
+def make_match_id(match: Dict) -> str:
+    """
+    Deterministic ID for a match
+    
+    Derived from the preview URL when there is one, otherwise from the
+    normalized teams, competition and date, so the same fixture keeps its
+    ID across refreshes regardless of its position in the list.
+    """
+    if match.get('preview_url'):
+        source = match['preview_url']
+    else:
+        source = '|'.join(normalize_text(match.get(field))
+                          for field in ('home_team', 'away_team', 'competition', 'date'))
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()[:12]
+
+
+class MatchIndex:
+    """
+    Inverted indexes for one snapshot of matches
+    
+    Maps match IDs to matches, and normalized team and competition names
+    to the positions of the matches they appear in. A filter only scans
+    the distinct names, which are far fewer than matches, and combines
+    filters by set intersection. Results of the first MAX_MEMOIZED_LOOKUPS
+    distinct substring lookups are memoized for the life of the snapshot.
+    
+    Kickoff times are kept sorted (as UTC timestamps, alongside the match
+    positions), so kickoff ranges are found by binary search and sorting
+    by kickoff needs no per-request parsing or sorting.
+    """
+    
+    def __init__(self, matches: List[Dict]):
+        self.matches = matches
+        self.by_id: Dict[str, Dict] = {}
+        self.teams: Dict[str, Set[int]] = {}
+        self.competitions: Dict[str, Set[int]] = {}
+        self._lookups: Dict[tuple, frozenset] = {}
+        self._lock = threading.Lock()
+        timed = []
+        self.untimed: List[int] = []
+        
+        for position, match in enumerate(matches):
+            match_id = match.get('id') or make_match_id(match)
+            self.by_id.setdefault(match_id, match)
+            for field in ('home_team', 'away_team'):
+                key = normalize_text(match.get(field))
+                if key:
+                    self.teams.setdefault(key, set()).add(position)
+            key = normalize_text(match.get('competition'))
+            if key:
+                self.competitions.setdefault(key, set()).add(position)
+            kickoff = match_kickoff(match)
+            if kickoff is not None:
+                timed.append((kickoff.timestamp(), position))
+            else:
+                self.untimed.append(position)
+        
+        timed.sort()
+        self.kickoff_times: List[float] = [timestamp for timestamp, _ in timed]
+        self.kickoff_positions: List[int] = [position for _, position in timed]
+    
+    def _lookup(self, kind: str, index: Dict[str, Set[int]], query: str) -> frozenset:
+        """Positions whose normalized key contains the normalized query"""
+        needle = normalize_text(query)
+        cache_key = (kind, needle)
+        cached = self._lookups.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        positions = set()
+        for key, key_positions in index.items():
+            if needle in key:
+                positions |= key_positions
+        result = frozenset(positions)
+        with self._lock:
+            if len(self._lookups) < MAX_MEMOIZED_LOOKUPS:
+                self._lookups[cache_key] = result
+        return result
+    
+    def get(self, match_id: str) -> Optional[Dict]:
+        """Match with the given ID, or None"""
+        return self.by_id.get(match_id)
+    
+    def get_many(self, match_ids: List[str]) -> Dict[str, Optional[Dict]]:
+        """Look up several IDs at once; unknown IDs map to None"""
+        return {match_id: self.by_id.get(match_id) for match_id in match_ids}
+    
+    def find_team(self, query: str) -> frozenset:
+        """Positions of matches where the home or away team contains query"""
+        return self._lookup('team', self.teams, query)
+    
+    def find_competition(self, query: str) -> frozenset:
+        """Positions of matches whose competition contains query"""
+        return self._lookup('competition', self.competitions, query)
+    
+    def kickoff_range(self, kickoff_from: Optional[datetime] = None,
+                      kickoff_to: Optional[datetime] = None) -> List[int]:
+        """
+        Positions of matches kicking off within [kickoff_from, kickoff_to], in kickoff order
+        
+        Naive datetimes are taken to be in the site timezone. Matches
+        without a known kickoff are never in a range.
+        """
+        start = bisect_left(self.kickoff_times, localize(kickoff_from).timestamp()) if kickoff_from else 0
+        end = bisect_right(self.kickoff_times, localize(kickoff_to).timestamp()) if kickoff_to else len(self.kickoff_times)
+        return self.kickoff_positions[start:end]
+    
+    def filter(self, team: Optional[str] = None, competition: Optional[str] = None,
+               kickoff_from: Optional[datetime] = None, kickoff_to: Optional[datetime] = None,
+               sort: Optional[str] = None) -> List[Dict]:
+        """
+        Matches satisfying every given filter
+        
+        Args:
+            team: Partial team name (home or away)
+            competition: Partial competition name
+            kickoff_from: Earliest kickoff (inclusive)
+            kickoff_to: Latest kickoff (inclusive)
+            sort: "kickoff" or "-kickoff" to order by kickoff time, ascending
+                or descending (matches without a kickoff come last);
+                default is snapshot order
+        
+        Returns:
+            List of match dictionaries
+        """
+        selected = None
+        if competition:
+            selected = self.find_competition(competition)
+        if team:
+            positions = self.find_team(team)
+            selected = positions if selected is None else selected & positions
+        
+        if kickoff_from or kickoff_to:
+            ordered = self.kickoff_range(kickoff_from, kickoff_to)
+        elif sort:
+            ordered = self.kickoff_positions
+        else:
+            if selected is None:
+                return self.matches
+            return [self.matches[position] for position in sorted(selected)]
+        
+        if sort == '-kickoff':
+            ordered = ordered[::-1]
+        if not (kickoff_from or kickoff_to) and sort:
+            ordered = ordered + self.untimed
+        if selected is not None:
+            ordered = [position for position in ordered if position in selected]
+        if not sort:
+            ordered = sorted(ordered)
+        return [self.matches[position] for position in ordered]
@@ -0,0 +1,100 @@
+"""
+Compact match records for SportsMole Scraper API
+Slotted, read-only match records with interned strings, used for the
+matches held in the API cache
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator
+import sys
+
+# Known fields, in the order the scraper produces them (and to_dict returns them)
+FIELDS = (
+    'home_team', 'away_team', 'date', 'kickoff', 'competition', 'preview_url', 'id',
+    'predicted_score', 'prediction_text', 'statistics', 'sm_predicted_score', 'prediction_info'
+)
+FIELD_SET = frozenset(FIELDS)
+
+# Values repeated across many matches, stored once per distinct string
+INTERNED_FIELDS = frozenset({'home_team', 'away_team', 'date', 'kickoff', 'competition'})
+
+# Statistics label tuples, one per distinct set of labels shared by every record using it
+_statistics_labels: Dict[tuple, tuple] = {}
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class MatchRecord(Mapping):
+    """
+    One match, stored in slots instead of a per-match dict
+    
+    Behaves as a read-only mapping with the same keys and values as the
+    match dictionary it was built from, so filters, indexes and field
+    projection work unchanged. Team, competition and date strings are
+    interned, so the thousands of matches sharing "Premier League" share
+    one string. Statistics are split into a tuple of values per record and
+    a tuple of labels shared by every record with the same labels. Keys
+    outside FIELDS are kept in a small overflow dict.
+    """
+    
+    __slots__ = FIELDS + ('_labels', '_extra')
+    
+    @classmethod
+    def from_dict(cls, match: Mapping) -> 'MatchRecord':
+        """Build a record from a match dictionary"""
+        record = cls.__new__(cls)
+        extra = None
+        for name, value in match.items():
+            if name not in FIELD_SET:
+                if extra is None:
+                    extra = {}
+                extra[name] = value
+            elif name == 'statistics' and isinstance(value, dict):
+                labels = tuple(value)
+                record._labels = _statistics_labels.setdefault(labels, labels)
+                record.statistics = tuple(value.values())
+            elif name in INTERNED_FIELDS:
+                setattr(record, name, _intern(value))
+            else:
+                setattr(record, name, value)
+        record._extra = extra
+        return record
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """The match as a plain dictionary (the JSON shape served by the API)"""
+        return {name: self[name] for name in self}
+    
+    def __getitem__(self, name: str):
+        if name in FIELD_SET:
+            try:
+                value = getattr(self, name)
+            except AttributeError:
+                raise KeyError(name) from None
+            if name == 'statistics' and isinstance(value, tuple):
+                return dict(zip(self._labels, value))
+            return value
+        if self._extra is not None and name in self._extra:
+            return self._extra[name]
+        raise KeyError(name)
+    
+    def __iter__(self) -> Iterator[str]:
+        for name in FIELDS:
+            if hasattr(self, name):
+                yield name
+        if self._extra is not None:
+            yield from self._extra
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    def __repr__(self):
+        return f"MatchRecord({self.to_dict()!r})"
+
+
+def json_default(value):
+    """json.dumps default hook serializing MatchRecords as plain dictionaries"""
+    if isinstance(value, MatchRecord):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
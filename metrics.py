@@ -0,0 +1,189 @@
+"""
+Prometheus metrics for SportsMole Scraper
+Minimal counters and histograms rendered in the Prometheus text exposition
+format, so no client library is needed
+"""
+
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import threading
+import time
+
+# Default latency buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# (labels, value) pairs produced by a collector for one metric
+Samples = List[Tuple[Dict[str, str], float]]
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Dict) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels"""
+    
+    type = 'counter'
+    
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, amount: float = 1, **labels):
+        """Add amount to the series with the given labels"""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def value(self, **labels) -> float:
+        """Current value of one series"""
+        return self._values.get(tuple(sorted(labels.items())), 0)
+    
+    def render(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        return [f"{self.name}{_format_labels(dict(key))} {_format_value(value)}"
+                for key, value in sorted(values.items())]
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets, optionally split by labels"""
+    
+    type = 'histogram'
+    
+    def __init__(self, name: str, documentation: str, buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts, sum, count]
+        self._series: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float, **labels):
+        """Record one observation in the series with the given labels"""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+    
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the with-block in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+    
+    def count(self, **labels) -> int:
+        """Number of observations in one series"""
+        series = self._series.get(tuple(sorted(labels.items())))
+        return series[2] if series else 0
+    
+    def render(self) -> List[str]:
+        with self._lock:
+            series = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        lines = []
+        for key, (counts, total, count) in sorted(series.items()):
+            labels = dict(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': '+Inf'})} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class Registry:
+    """
+    Collection of metrics rendered together
+    
+    Besides counters and histograms, collectors can be registered: callables
+    returning (name, type, help, samples) tuples, read at scrape time from
+    components that already keep their own statistics.
+    """
+    
+    def __init__(self):
+        self.metrics = []
+        self.collectors: List[Callable[[], Iterable[Tuple[str, str, str, Samples]]]] = []
+    
+    def counter(self, name: str, documentation: str) -> Counter:
+        """Create and register a counter"""
+        metric = Counter(name, documentation)
+        self.metrics.append(metric)
+        return metric
+    
+    def histogram(self, name: str, documentation: str,
+                  buckets: Optional[Iterable[float]] = None) -> Histogram:
+        """Create and register a histogram"""
+        metric = Histogram(name, documentation, buckets or LATENCY_BUCKETS)
+        self.metrics.append(metric)
+        return metric
+    
+    def register_collector(self, collector: Callable[[], Iterable[Tuple[str, str, str, Samples]]]):
+        """Add a callable whose metrics are read on every render"""
+        self.collectors.append(collector)
+    
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format"""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.render())
+        for collector in self.collectors:
+            for name, metric_type, documentation, samples in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}"
+                             for labels, value in samples if value is not None)
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+# Scraper
+FETCH_SECONDS = REGISTRY.histogram(
+    'sportsmole_fetch_seconds', 'Latency of one request to SportsMole by page type')
+PARSE_SECONDS = REGISTRY.histogram(
+    'sportsmole_parse_seconds', 'Time spent parsing a page by page type')
+DOWNLOADED_BYTES = REGISTRY.counter(
+    'sportsmole_downloaded_bytes_total', 'Response bytes downloaded from SportsMole by page type')
+FETCH_RETRIES = REGISTRY.counter(
+    'sportsmole_fetch_retries_total', 'Requests retried after a transient failure by page type')
+FETCH_FAILURES = REGISTRY.counter(
+    'sportsmole_fetch_failures_total', 'Pages that could not be fetched by page type and reason')
+
+# API
+REFRESH_SECONDS = REGISTRY.histogram(
+    'sportsmole_cache_refresh_seconds', 'Duration of a full cache refresh',
+    buckets=(1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600))
+REFRESHES = REGISTRY.counter(
+    'sportsmole_cache_refreshes_total', 'Cache refreshes by result (ok, rejected, error)')
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    'sportsmole_http_request_seconds', 'API request latency by endpoint, method and status')
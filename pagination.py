@@ -0,0 +1,70 @@
+"""
+Pagination and field projection helpers for SportsMole Scraper API
+"""
+
+import base64
+import binascii
+import json
+from typing import Dict, List, Optional, Tuple
+
+# Fields returned by the lightweight "summary" projection
+SUMMARY_FIELDS = ('id', 'home_team', 'away_team', 'date', 'competition')
+
+FIELD_PRESETS = {
+    'summary': SUMMARY_FIELDS,
+}
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded"""
+
+
+def encode_cursor(snapshot: str, offset: int) -> str:
+    """Opaque cursor pointing at offset within a given snapshot"""
+    raw = json.dumps({'s': snapshot, 'o': offset}, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """
+    Decode a cursor produced by encode_cursor
+    
+    Returns:
+        Tuple of (snapshot, offset)
+    
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        offset = int(data['o'])
+        if offset < 0:
+            raise ValueError("negative offset")
+        return str(data['s']), offset
+    except (ValueError, KeyError, TypeError, binascii.Error, UnicodeEncodeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {e}") from e
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a fields= parameter into a tuple of field names
+    
+    Accepts a preset name ("summary") or a comma-separated list. The match
+    id is always included so projected matches remain addressable.
+    """
+    if not fields:
+        return None
+    if fields in FIELD_PRESETS:
+        return FIELD_PRESETS[fields]
+    names = [name.strip() for name in fields.split(',') if name.strip()]
+    if 'id' not in names:
+        names.insert(0, 'id')
+    return tuple(names)
+
+
+def project(matches: List[Dict], fields: Optional[Tuple[str, ...]]) -> List[Dict]:
+    """Keep only the requested fields of each match"""
+    if fields is None:
+        return matches
+    return [{name: match[name] for name in fields if name in match} for match in matches]
@@ -0,0 +1,98 @@
+"""
+Prediction cache for SportsMole Scraper
+Keeps parsed preview-page predictions keyed by preview URL so refreshes
+only refetch new, expired or about-to-kick-off fixtures
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+import threading
+import logging
+from config import (
+    PREDICTION_CACHE_TTL_MINUTES, PREDICTION_CACHE_MAX_ENTRIES,
+    PREDICTION_CACHE_KICKOFF_WINDOW_MINUTES
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache of predictions with a per-entry TTL
+    
+    Entries are keyed by preview URL. Lookups for matches whose kickoff is
+    within the kickoff window (either side) always miss, because previews
+    are updated with team news and line-ups around kickoff.
+    """
+    
+    def __init__(self, ttl_minutes: float = PREDICTION_CACHE_TTL_MINUTES,
+                 max_entries: int = PREDICTION_CACHE_MAX_ENTRIES,
+                 kickoff_window_minutes: float = PREDICTION_CACHE_KICKOFF_WINDOW_MINUTES):
+        self.ttl = timedelta(minutes=ttl_minutes)
+        self.max_entries = max_entries
+        self.kickoff_window = timedelta(minutes=kickoff_window_minutes)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, preview_url: str, kickoff: Optional[datetime] = None) -> Optional[Dict]:
+        """
+        Look up a cached prediction
+        
+        Args:
+            preview_url: URL of the match preview page
+            kickoff: Parsed kickoff time, if known
+        
+        Returns:
+            A copy of the cached prediction, or None if it must be refetched
+        """
+        now = datetime.now()
+        with self._lock:
+            entry = self._entries.get(preview_url)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            prediction, stored_at = entry
+            near_kickoff = (kickoff is not None and
+                            abs(kickoff - (datetime.now(timezone.utc) if kickoff.tzinfo else now)) <= self.kickoff_window)
+            if now - stored_at >= self.ttl or near_kickoff:
+                del self._entries[preview_url]
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(preview_url)
+            self.hits += 1
+            return dict(prediction)
+    
+    def set(self, preview_url: str, prediction: Dict):
+        """Store a prediction, evicting the least recently used entries if full"""
+        with self._lock:
+            self._entries[preview_url] = (dict(prediction), datetime.now())
+            self._entries.move_to_end(preview_url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Remove all entries and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> Dict:
+        """Return hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else None,
+                'size': len(self._entries),
+                'max_entries': self.max_entries
+            }
+    
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,81 @@
+"""
+Pre-serialized JSON responses for SportsMole Scraper API
+Serializes and compresses a payload once per cache refresh and serves it
+with a strong ETag, answering conditional requests with 304
+"""
+
+import gzip
+import hashlib
+import json
+from typing import Dict, Tuple
+from flask import Response
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Content encodings in order of preference
+ENCODERS = [
+    ('br', (lambda body: brotli.compress(body, quality=5)) if brotli else None),
+    ('gzip', lambda body: gzip.compress(body, compresslevel=6)),
+]
+
+
+class PreparedResponse:
+    """
+    A JSON payload serialized once, with compressed variants and ETags
+    
+    Each encoding gets its own strong ETag (derived from the identity
+    body), and a request carrying any of them in If-None-Match is answered
+    with 304 Not Modified.
+    """
+    
+    def __init__(self, payload: Dict):
+        body = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        digest = hashlib.sha1(body).hexdigest()
+        variants = {'identity': (body, digest)}
+        for encoding, encode in ENCODERS:
+            if encode is not None:
+                variants[encoding] = (encode(body), f"{digest}-{encoding}")
+        self._set_variants(variants)
+    
+    @classmethod
+    def from_variants(cls, variants: Dict[str, Tuple[bytes, str]]) -> 'PreparedResponse':
+        """
+        Rebuild a prepared response from already serialized variants
+        
+        Args:
+            variants: Mapping of encoding to (body, etag); must include 'identity'
+        """
+        prepared = cls.__new__(cls)
+        prepared._set_variants(variants)
+        return prepared
+    
+    def _set_variants(self, variants: Dict[str, Tuple[bytes, str]]):
+        self.variants = variants
+        self.body, self.etag = variants['identity']
+        self.etags = {etag for _, etag in variants.values()}
+    
+    def _select_encoding(self, request) -> str:
+        """Best encoding the client accepts"""
+        for encoding, _ in ENCODERS:
+            if encoding in self.variants and request.accept_encodings[encoding]:
+                return encoding
+        return 'identity'
+    
+    def make_response(self, request) -> Response:
+        """Build a 200 (or 304) response for the current request"""
+        encoding = self._select_encoding(request)
+        body, etag = self.variants[encoding]
+        
+        if any(request.if_none_match.contains(tag) for tag in self.etags):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype='application/json')
+            if encoding != 'identity':
+                response.headers['Content-Encoding'] = encoding
+        
+        response.set_etag(etag)
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
@@ -0,0 +1,177 @@
+"""
+Outbound rate limiting for SportsMole Scraper
+A token bucket caps the request rate, and an AIMD concurrency limit finds
+the highest number of in-flight requests the site sustains
+"""
+
+from typing import Dict, Optional
+import threading
+import time
+import logging
+from config import (
+    RATE_LIMIT_REQUESTS_PER_SECOND, RATE_LIMIT_BURST,
+    RATE_LIMIT_INITIAL_CONCURRENCY, RATE_LIMIT_MIN_CONCURRENCY, RATE_LIMIT_MAX_CONCURRENCY,
+    RATE_LIMIT_BACKOFF_FACTOR, RATE_LIMIT_LATENCY_FACTOR
+)
+
+logger = logging.getLogger(__name__)
+
+# Statuses the site uses to tell us to slow down
+THROTTLE_STATUSES = frozenset({429, 503})
+
+# Weight of the newest sample in the latency baseline
+LATENCY_SMOOTHING = 0.1
+
+# Latencies below this never count as congestion, however fast the baseline
+LATENCY_FLOOR_SECONDS = 0.25
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+    
+    Holds up to `capacity` tokens, refilled at `rate` tokens per second.
+    Callers reserve a token and sleep until it is due, so waiting callers
+    are served in arrival order. A rate of 0 disables the limit.
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """
+        Take one token, sleeping until it is available
+        
+        Returns:
+            Seconds spent waiting
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class AdaptiveRateLimiter:
+    """
+    Token-bucket rate limit plus AIMD (additive increase, multiplicative
+    decrease) concurrency limit for outbound requests
+    
+    Every healthy response raises the concurrency limit by 1/limit, i.e.
+    by one per round of requests. A throttling status (429/503), a failed
+    request, or a latency above `latency_factor` times the running
+    baseline multiplies the limit by `backoff_factor`. Only responses to
+    requests started after the last decrease can decrease it again, so one
+    burst of throttled responses counts as a single signal.
+    
+    Usage:
+        ticket = limiter.acquire()
+        ... send the request ...
+        limiter.release(ticket, response.status_code)  # None if it failed
+    """
+    
+    def __init__(self,
+                 requests_per_second: float = RATE_LIMIT_REQUESTS_PER_SECOND,
+                 burst: float = RATE_LIMIT_BURST,
+                 initial_concurrency: int = RATE_LIMIT_INITIAL_CONCURRENCY,
+                 min_concurrency: int = RATE_LIMIT_MIN_CONCURRENCY,
+                 max_concurrency: int = RATE_LIMIT_MAX_CONCURRENCY,
+                 backoff_factor: float = RATE_LIMIT_BACKOFF_FACTOR,
+                 latency_factor: float = RATE_LIMIT_LATENCY_FACTOR):
+        self.bucket = TokenBucket(requests_per_second, burst)
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.limit = float(min(max(initial_concurrency, self.min_concurrency), self.max_concurrency))
+        self.backoff_factor = backoff_factor
+        self.latency_factor = latency_factor
+        self.latency_baseline: Optional[float] = None
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.decreases = 0
+        self.wait_seconds = 0.0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+    
+    def acquire(self) -> float:
+        """
+        Wait for a concurrency slot and a rate token
+        
+        Returns:
+            Ticket (start time) to pass to release()
+        """
+        started_waiting = time.monotonic()
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+        self.bucket.acquire()
+        ticket = time.monotonic()
+        with self._condition:
+            self.requests += 1
+            self.wait_seconds += ticket - started_waiting
+        return ticket
+    
+    def release(self, ticket: float, status: Optional[int]):
+        """
+        Free the slot and adapt the limit to the outcome of the request
+        
+        Args:
+            ticket: Value returned by acquire()
+            status: HTTP status code, or None if the request failed
+        """
+        latency = time.monotonic() - ticket
+        with self._condition:
+            self.in_flight -= 1
+            if status in THROTTLE_STATUSES:
+                self.throttled += 1
+            
+            congested = status is None or status in THROTTLE_STATUSES
+            if not congested:
+                if self.latency_baseline is None:
+                    self.latency_baseline = latency
+                else:
+                    congested = latency > max(self.latency_factor * self.latency_baseline,
+                                              LATENCY_FLOOR_SECONDS)
+                    # The baseline follows lasting latency changes, so a slower
+                    # site settles at a new level instead of backing off forever
+                    self.latency_baseline += LATENCY_SMOOTHING * (latency - self.latency_baseline)
+            
+            if not congested:
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            elif ticket >= self._last_decrease:
+                self._decrease(status, latency)
+            self._condition.notify_all()
+    
+    def _decrease(self, status: Optional[int], latency: float):
+        """Multiplicative decrease (condition must be held)"""
+        previous = self.limit
+        self.limit = max(self.min_concurrency, self.limit * self.backoff_factor)
+        self._last_decrease = time.monotonic()
+        self.decreases += 1
+        logger.warning(f"Backing off: concurrency {previous:.1f} -> {self.limit:.1f} "
+                       f"(status {status}, latency {latency:.2f}s)")
+    
+    def stats(self) -> Dict:
+        """Current limits and counters for monitoring"""
+        with self._condition:
+            return {
+                'concurrency_limit': int(self.limit),
+                'in_flight': self.in_flight,
+                'requests_per_second': self.bucket.rate,
+                'requests': self.requests,
+                'throttled': self.throttled,
+                'backoffs': self.decreases,
+                'wait_seconds': round(self.wait_seconds, 3),
+                'latency_baseline_seconds': round(self.latency_baseline, 3) if self.latency_baseline is not None else None
+            }
@@ -0,0 +1,165 @@
+"""
+Retry policy and circuit breaker for SportsMole Scraper
+Retries transient failures with exponential backoff and jitter, and stops
+sending requests while the site is down
+"""
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+import random
+import threading
+import time
+import logging
+from config import (
+    MAX_RETRIES, RETRY_DELAY, RETRY_MAX_DELAY,
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD, CIRCUIT_BREAKER_RESET_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying; anything else (404, 403, ...) fails immediately
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker rejects a request"""
+
+
+def is_retryable_status(status: Optional[int]) -> bool:
+    """Check if an HTTP status is a transient failure"""
+    return status in RETRYABLE_STATUSES
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (seconds or HTTP date)
+    
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter
+    
+    The delay before retry n (0-based) is drawn uniformly from
+    [0, min(max_delay, base_delay * 2**n)], so concurrent workers that
+    failed together do not retry together. A Retry-After from the server
+    is used as the minimum delay; if it exceeds max_delay the request is
+    not retried at all rather than holding a worker that long.
+    """
+    
+    def __init__(self, max_attempts: int = MAX_RETRIES,
+                 base_delay: float = RETRY_DELAY,
+                 max_delay: float = RETRY_MAX_DELAY):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+    
+    def next_delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Delay before retrying after a failed attempt
+        
+        Args:
+            attempt: Number of the attempt that just failed (0-based)
+            retry_after: Seconds requested by the server's Retry-After header
+        
+        Returns:
+            Seconds to wait, or None if the request should not be retried
+        """
+        if attempt + 1 >= self.max_attempts:
+            return None
+        if retry_after is not None and retry_after > self.max_delay:
+            return None
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Fails fast after repeated transient failures
+    
+    Closed: requests pass. After `failure_threshold` consecutive failures
+    the breaker opens and rejects every request for `reset_timeout`
+    seconds. Then it is half-open: one trial request passes, and its
+    outcome closes the breaker again or reopens it.
+    """
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, failure_threshold: int = CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = CIRCUIT_BREAKER_RESET_SECONDS):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.rejected = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    def before_request(self):
+        """
+        Check that a request may be sent
+        
+        Raises:
+            CircuitOpenError: If the breaker is open (or its trial request is in flight)
+        """
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            self.rejected += 1
+        raise CircuitOpenError("Circuit breaker open: SportsMole appears to be unavailable")
+    
+    def record_success(self):
+        """Record a request that reached the site"""
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("Circuit breaker closed")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+    
+    def record_failure(self):
+        """Record a transient failure"""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Circuit breaker opened after {self.failures} consecutive failures")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._trial_in_flight = False
+    
+    def stats(self) -> Dict:
+        """Current state and counters for monitoring"""
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'rejected': self.rejected
+            }
@@ -4,86 +4,277 @@ Scrapes upcoming matches, statistics, and predictions from sportsmole.co.uk
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple
+import multiprocessing
 import re
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from urllib.parse import urljoin
 from config import (
     BASE_URL, FOOTBALL_URL, FIXTURES_URL,
     REQUEST_TIMEOUT, USER_AGENT,
-    MAX_RETRIES, RETRY_DELAY, LOG_LEVEL, LOG_FORMAT
+    LOG_LEVEL, LOG_FORMAT,
+    PREVIEW_WORKERS, PARSE_WORKERS, PREDICTION_CACHE_ENABLED, HTTP_CACHE_ENABLED, RATE_LIMIT_ENABLED,
+    HTTP_ARCHIVE_MODE,
+    HTML_PARSER, HTML_TARGETED_PARSING,
+    CRAWL_SEED_URLS, CRAWL_MAX_DEPTH, CRAWL_MAX_PAGES, CRAWL_WORKERS
 )
+from prediction_cache import PredictionCache
+from kickoff import parse_kickoff, match_kickoff
+from strategy_cache import AdaptiveStrategy
+from match_index import make_match_id
+from crawl_frontier import CrawlFrontier, CrawlPage, MatchSet
+from http_cache import HTTPResponseCache, CachingHTTPAdapter
+from http_archive import HTTPArchive
+from rate_limiter import AdaptiveRateLimiter
+from metrics import FETCH_SECONDS, PARSE_SECONDS, DOWNLOADED_BYTES, FETCH_RETRIES, FETCH_FAILURES
+from retry_policy import RetryPolicy, CircuitBreaker, CircuitOpenError, is_retryable_status, parse_retry_after
 
 # Configure logging
 logging.basicConfig(level=LOG_LEVEL, format=LOG_FORMAT)
 logger = logging.getLogger(__name__)
 
 
-class SportsMoleScraper:
-    """Scraper for SportsMole.co.uk website"""
+def resolve_parser(name: str) -> str:
+    """Return the requested BeautifulSoup backend, falling back to html.parser if unavailable"""
+    if name == 'lxml':
+        try:
+            import lxml  # noqa: F401
+        except ImportError:
+            logger.warning("lxml is not installed, falling back to html.parser")
+            return 'html.parser'
+    return name
+
+
+def _class_list(attrs) -> List[str]:
+    """Class names from raw start-tag attributes (string or list depending on builder)"""
+    value = attrs.get('class') or []
+    if isinstance(value, str):
+        value = value.split()
+    return value
+
+
+FIXTURE_CONTAINER_CLASSES = {'match-preview', 'fixture', 'match'}
+PREVIEW_SECTION_IDS = {'prediction', 'statistics'}
+PREVIEW_SECTION_CLASSES = {'prediction', 'statistics', 'sm-prediction'}
+
+# Precompiled selector patterns
+PREDICT_CLASS_PATTERN = re.compile(r'predict', re.I)
+TEAM_LINK_PATTERN = re.compile(r'/football/[^/]+/')
+HOME_TEAM_CLASS_PATTERN = re.compile(r'home.*team', re.I)
+AWAY_TEAM_CLASS_PATTERN = re.compile(r'away.*team', re.I)
+DATE_CLASS_PATTERN = re.compile(r'date|time', re.I)
+COMPETITION_CLASS_PATTERN = re.compile(r'competition|league', re.I)
+PREVIEW_LINK_PATTERN = re.compile(r'/football/.*?/preview')
+TABLE_PREVIEW_LINK_PATTERN = re.compile(r'/preview')
+# Other fixture listing pages: /football/fixtures/..., /football/<competition>/fixtures/...
+LISTING_LINK_PATTERN = re.compile(r'/football/(?:[^/?#]+/)?fixtures(?:[/?#]|$)')
+
+
+def _is_fixture_container(name, attrs) -> bool:
+    """Match the elements _parse_fixtures_page reads: match divs and fixture tables"""
+    classes = _class_list(attrs)
+    if name == 'div':
+        return not FIXTURE_CONTAINER_CLASSES.isdisjoint(classes)
+    return name == 'table' and 'fixtures' in classes
+
+
+def _is_preview_section(name, attrs) -> bool:
+    """Match the elements _parse_prediction_page reads"""
+    classes = _class_list(attrs)
+    if name == 'div' and (attrs.get('id') in PREVIEW_SECTION_IDS
+                          or not PREVIEW_SECTION_CLASSES.isdisjoint(classes)):
+        return True
+    # Catch-all fallback looks at any element with "predict" in its class
+    return any(PREDICT_CLASS_PATTERN.search(cls) for cls in classes)
+
+
+FIXTURES_STRAINER = SoupStrainer(_is_fixture_container)
+PREVIEW_STRAINER = SoupStrainer(_is_preview_section)
+LISTING_LINK_STRAINER = SoupStrainer('a', href=LISTING_LINK_PATTERN)
+
+
+# Team name strategies, each returning (home, away) or None
+def _teams_from_name_spans(element):
+    teams = element.find_all('span', class_='team-name', limit=2)
+    if len(teams) >= 2:
+        return teams[0].get_text(strip=True), teams[1].get_text(strip=True)
+    return None
+
+
+def _teams_from_links(element):
+    team_links = element.find_all('a', href=TEAM_LINK_PATTERN, limit=2)
+    if len(team_links) >= 2:
+        return team_links[0].get_text(strip=True), team_links[1].get_text(strip=True)
+    return None
+
+
+def _teams_from_class_patterns(element):
+    home = element.find(class_=HOME_TEAM_CLASS_PATTERN)
+    away = element.find(class_=AWAY_TEAM_CLASS_PATTERN) if home else None
+    if home and away:
+        return home.get_text(strip=True), away.get_text(strip=True)
+    return None
+
+
+class SportsMolePageParser:
+    """
+    HTML parsing logic shared by the synchronous and asynchronous scrapers
+    
+    Subclasses are responsible for fetching pages; every parse method works
+    on raw HTML or BeautifulSoup elements only.
+    """
     
     BASE_URL = BASE_URL
     FOOTBALL_URL = FOOTBALL_URL
+    FIXTURES_URL = FIXTURES_URL
+    
+    parser = resolve_parser(HTML_PARSER)
+    targeted_parsing = HTML_TARGETED_PARSING
+    prediction_cache: Optional[PredictionCache] = None
+    
+    CRAWL_SEED_URLS = CRAWL_SEED_URLS
+    crawl_max_depth = CRAWL_MAX_DEPTH
+    crawl_max_pages = CRAWL_MAX_PAGES
+    crawl_workers = CRAWL_WORKERS
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': USER_AGENT
-        })
-        self.timeout = REQUEST_TIMEOUT
-        logger.info("SportsMoleScraper initialized")
+        # Page layouts are mutually exclusive, so the one that worked last is
+        # tried first. An element can match several team/date/competition
+        # selectors, so those always run in this order to parse the same
+        # element the same way regardless of what was parsed before.
+        self.fixture_layout_strategy = AdaptiveStrategy('fixture_layout', [
+            ('match-preview', lambda soup: self._parse_match_containers(soup, 'match-preview')),
+            ('fixture', lambda soup: self._parse_match_containers(soup, 'fixture')),
+            ('match', lambda soup: self._parse_match_containers(soup, 'match')),
+            ('table', self._parse_matches_from_tables),
+        ])
+        self.team_strategy = AdaptiveStrategy('teams', [
+            ('team-name-spans', _teams_from_name_spans),
+            ('team-links', _teams_from_links),
+            ('home-away-class', _teams_from_class_patterns),
+        ], reorder=False)
+        self.date_strategy = AdaptiveStrategy('date', [
+            ('match-date-span', lambda element: element.find('span', class_='match-date')),
+            ('time-tag', lambda element: element.find('time')),
+            ('date-class', lambda element: element.find(class_=DATE_CLASS_PATTERN)),
+        ], reorder=False)
+        self.competition_strategy = AdaptiveStrategy('competition', [
+            ('competition-span', lambda element: element.find('span', class_='competition')),
+            ('competition-link', lambda element: element.find('a', class_='competition')),
+            ('competition-class', lambda element: element.find(class_=COMPETITION_CLASS_PATTERN)),
+        ], reorder=False)
     
-    def get_upcoming_matches(self) -> List[Dict]:
+    def strategy_stats(self) -> Dict:
+        """Per-strategy hit counts for every adaptive parsing step"""
+        strategies = (self.fixture_layout_strategy, self.team_strategy,
+                      self.date_strategy, self.competition_strategy)
+        return {strategy.name: strategy.stats() for strategy in strategies}
+    
+    def _apply_cached_predictions(self, matches: List[Dict]) -> List[Dict]:
         """
-        Fetch all upcoming matches from SportsMole
+        Fill in cached predictions and return the matches that still need fetching
         
-        Returns:
-            List of dictionaries containing match information
+        Matches without a preview URL are skipped. When no prediction cache
+        is configured every match with a preview URL is returned.
         """
+        with_preview = [match for match in matches if 'preview_url' in match]
+        if self.prediction_cache is None:
+            return with_preview
+        
+        to_fetch = []
+        for match in with_preview:
+            cached = self.prediction_cache.get(match['preview_url'], match_kickoff(match))
+            if cached is None:
+                to_fetch.append(match)
+            else:
+                match.update(cached)
+        
+        logger.info(f"Prediction cache: {len(with_preview) - len(to_fetch)} hits, {len(to_fetch)} misses")
+        return to_fetch
+    
+    def _merge_predictions(self, matches: List[Dict], predictions: List[Optional[Dict]]):
+        """Merge fetched predictions into their matches and cache them"""
+        for match, prediction in zip(matches, predictions):
+            if prediction:
+                match.update(prediction)
+                if self.prediction_cache is not None:
+                    self.prediction_cache.set(match['preview_url'], prediction)
+    
+    def _make_soup(self, content, strainer: SoupStrainer) -> BeautifulSoup:
+        """Parse HTML with the configured backend, restricted to the strainer if targeted parsing is on"""
+        return BeautifulSoup(content, self.parser,
+                             parse_only=strainer if self.targeted_parsing else None)
+    
+    def _parse_fixtures_page(self, content) -> List[Dict]:
+        """Parse the fixtures page HTML into a list of matches"""
+        soup = self._make_soup(content, FIXTURES_STRAINER)
+        
+        # Try the layout that worked last time first, then the others
+        layout, matches = self.fixture_layout_strategy.run(soup)
+        if layout is None:
+            matches = []
+        
+        for match in matches:
+            match['id'] = make_match_id(match)
+        
+        logger.info(f"Successfully parsed {len(matches)} matches (layout: {layout})")
+        return matches
+    
+    def _parse_listing_links(self, content, page_url: str) -> List[str]:
+        """Absolute URLs of the other fixture listing pages linked from a page"""
+        soup = BeautifulSoup(content, self.parser, parse_only=LISTING_LINK_STRAINER)
+        return [urljoin(page_url, link['href']) for link in soup.find_all('a', href=True)]
+    
+    def _crawl_frontier(self, seed_urls: Optional[List[str]] = None,
+                        max_depth: Optional[int] = None,
+                        max_pages: Optional[int] = None) -> CrawlFrontier:
+        """Frontier seeded with the fixtures page and the configured extra listing pages"""
+        frontier = CrawlFrontier(
+            max_depth=self.crawl_max_depth if max_depth is None else max_depth,
+            max_pages=self.crawl_max_pages if max_pages is None else max_pages
+        )
+        if seed_urls is None:
+            seed_urls = [self.FIXTURES_URL] + list(self.CRAWL_SEED_URLS)
+        for url in seed_urls:
+            frontier.add(urljoin(self.BASE_URL + '/', url))
+        return frontier
+    
+    def _parse_listing_page(self, content, page: CrawlPage, frontier: CrawlFrontier) -> List[Dict]:
+        """Parse the matches on a listing page and queue the listing pages it links to"""
+        with PARSE_SECONDS.time(page='fixtures'):
+            matches = self._parse_fixtures_page(content)
+            if frontier.follows_links(page):
+                for url in self._parse_listing_links(content, page.url):
+                    frontier.add(url, page.depth + 1)
+        return matches
+    
+    def _merge_listing_results(self, results: Dict[int, List[Dict]], frontier: CrawlFrontier) -> List[Dict]:
+        """Deduplicate the matches of every crawled page, in page discovery order"""
+        found = MatchSet()
+        for order in sorted(results):
+            found.add(results[order])
+        if frontier.skipped:
+            logger.warning(f"Crawl page limit reached, {frontier.skipped} listing pages not fetched")
+        if len(results) > 1:
+            logger.info(f"Crawled {len(results)} fixture pages: {len(found)} matches "
+                        f"({found.duplicates} duplicates removed)")
+        return found.matches
+    
+    def _parse_match_containers(self, soup, css_class: str) -> List[Dict]:
+        """Parse all match container divs with the given class"""
         matches = []
+        match_elements = soup.find_all('div', class_=css_class)
+        logger.debug(f"Found {len(match_elements)} '{css_class}' match elements")
         
-        for attempt in range(MAX_RETRIES):
-            try:
-                # Get the main football fixtures page
-                logger.info(f"Fetching fixtures from {FIXTURES_URL} (attempt {attempt + 1}/{MAX_RETRIES})")
-                response = self.session.get(FIXTURES_URL, timeout=self.timeout)
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Find all match containers - try multiple strategies
-                match_elements = soup.find_all('div', class_='match-preview')
-                
-                if not match_elements:
-                    logger.debug("No match-preview divs found, trying alternative selectors")
-                    match_elements = soup.find_all('div', class_='fixture')
-                
-                if not match_elements:
-                    match_elements = soup.find_all('div', class_='match')
-                
-                logger.info(f"Found {len(match_elements)} match elements")
-                
-                for match_elem in match_elements:
-                    match_data = self._parse_match_element(match_elem)
-                    if match_data:
-                        matches.append(match_data)
-                
-                # If no matches found with preview divs, try table format
-                if not matches:
-                    logger.debug("Trying table-based parsing")
-                    matches = self._parse_matches_from_tables(soup)
-                
-                logger.info(f"Successfully parsed {len(matches)} matches")
-                break  # Success, exit retry loop
-                    
-            except requests.RequestException as e:
-                logger.error(f"Error fetching matches (attempt {attempt + 1}/{MAX_RETRIES}): {e}")
-                if attempt < MAX_RETRIES - 1:
-                    time.sleep(RETRY_DELAY)
-                else:
-                    logger.error("Max retries reached, returning empty list")
+        for match_elem in match_elements:
+            match_data = self._parse_match_element(match_elem)
+            if match_data:
+                matches.append(match_data)
         
         return matches
     
@@ -93,40 +284,26 @@ class SportsMoleScraper:
             match_data = {}
             
             # Extract teams - try multiple strategies
-            teams = element.find_all('span', class_='team-name')
-            if len(teams) >= 2:
-                match_data['home_team'] = teams[0].get_text(strip=True)
-                match_data['away_team'] = teams[1].get_text(strip=True)
-            else:
-                # Try alternative parsing with links
-                team_links = element.find_all('a', href=re.compile(r'/football/[^/]+/'))
-                if len(team_links) >= 2:
-                    match_data['home_team'] = team_links[0].get_text(strip=True)
-                    match_data['away_team'] = team_links[1].get_text(strip=True)
-                else:
-                    # Try finding by class patterns
-                    home = element.find(class_=re.compile(r'home.*team', re.I))
-                    away = element.find(class_=re.compile(r'away.*team', re.I))
-                    if home and away:
-                        match_data['home_team'] = home.get_text(strip=True)
-                        match_data['away_team'] = away.get_text(strip=True)
+            _, teams = self.team_strategy.run(element)
+            if teams:
+                match_data['home_team'], match_data['away_team'] = teams
             
             # Extract date/time
-            date_elem = element.find('span', class_='match-date') or element.find('time')
-            if not date_elem:
-                date_elem = element.find(class_=re.compile(r'date|time', re.I))
+            _, date_elem = self.date_strategy.run(element)
             if date_elem:
                 match_data['date'] = date_elem.get_text(strip=True)
+                # A <time datetime="..."> attribute is more precise than the display text
+                kickoff = parse_kickoff(date_elem.get('datetime') or match_data['date'])
+                if kickoff:
+                    match_data['kickoff'] = kickoff.isoformat()
             
             # Extract competition
-            comp_elem = element.find('span', class_='competition') or element.find('a', class_='competition')
-            if not comp_elem:
-                comp_elem = element.find(class_=re.compile(r'competition|league', re.I))
+            _, comp_elem = self.competition_strategy.run(element)
             if comp_elem:
                 match_data['competition'] = comp_elem.get_text(strip=True)
             
             # Extract match link for detailed info
-            link_elem = element.find('a', href=re.compile(r'/football/.*?/preview'))
+            link_elem = element.find('a', href=PREVIEW_LINK_PATTERN)
             if link_elem:
                 href = link_elem.get('href', '')
                 if not href.startswith('http'):
@@ -164,9 +341,12 @@ class SportsMoleScraper:
                             'away_team': cells[2].get_text(strip=True),
                             'date': cells[1].get_text(strip=True) if len(cells) > 1 else 'TBD'
                         }
+                        kickoff = parse_kickoff(match_data['date'])
+                        if kickoff:
+                            match_data['kickoff'] = kickoff.isoformat()
                         
                         # Try to find preview link
-                        link = row.find('a', href=re.compile(r'/preview'))
+                        link = row.find('a', href=TABLE_PREVIEW_LINK_PATTERN)
                         if link:
                             match_data['preview_url'] = self.BASE_URL + link['href']
                         
@@ -177,76 +357,54 @@ class SportsMoleScraper:
         
         return matches
     
-    def get_match_prediction(self, preview_url: str) -> Optional[Dict]:
-        """
-        Fetch prediction details for a specific match
+    def _parse_prediction_page(self, content) -> Optional[Dict]:
+        """Parse a match preview page HTML into prediction data"""
+        soup = self._make_soup(content, PREVIEW_STRAINER)
         
-        Args:
-            preview_url: URL to the match preview page
+        prediction_data = {}
+        
+        # Look for prediction section
+        prediction_section = soup.find('div', class_='prediction') or soup.find('div', id='prediction')
+        
+        if prediction_section:
+            # Extract predicted score
+            score_elem = prediction_section.find('span', class_='score') or prediction_section.find('div', class_='predicted-score')
+            if score_elem:
+                prediction_data['predicted_score'] = score_elem.get_text(strip=True)
+                logger.debug(f"Found predicted score: {prediction_data['predicted_score']}")
             
-        Returns:
-            Dictionary containing prediction information
-        """
-        for attempt in range(MAX_RETRIES):
-            try:
-                logger.debug(f"Fetching prediction from {preview_url} (attempt {attempt + 1}/{MAX_RETRIES})")
-                response = self.session.get(preview_url, timeout=self.timeout)
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                prediction_data = {}
-                
-                # Look for prediction section
-                prediction_section = soup.find('div', class_='prediction') or soup.find('div', id='prediction')
-                
-                if prediction_section:
-                    # Extract predicted score
-                    score_elem = prediction_section.find('span', class_='score') or prediction_section.find('div', class_='predicted-score')
-                    if score_elem:
-                        prediction_data['predicted_score'] = score_elem.get_text(strip=True)
-                        logger.debug(f"Found predicted score: {prediction_data['predicted_score']}")
-                    
-                    # Extract prediction text/reasoning
-                    pred_text = prediction_section.find('p') or prediction_section.find('div', class_='prediction-text')
-                    if pred_text:
-                        prediction_data['prediction_text'] = pred_text.get_text(strip=True)
-                
-                # Look for statistics
-                stats_section = soup.find('div', class_='statistics') or soup.find('div', id='statistics')
-                if stats_section:
-                    prediction_data['statistics'] = self._parse_statistics(stats_section)
-                
-                # Alternative: Look for SM Prediction box
-                sm_prediction = soup.find('div', class_='sm-prediction')
-                if sm_prediction:
-                    score_text = sm_prediction.get_text(strip=True)
-                    prediction_data['sm_predicted_score'] = score_text
-                    logger.debug(f"Found SM predicted score: {score_text}")
-                
-                # Look for any element with "prediction" in class
-                if not prediction_data:
-                    pred_elements = soup.find_all(class_=re.compile(r'predict', re.I))
-                    for elem in pred_elements:
-                        text = elem.get_text(strip=True)
-                        if text and len(text) > 0:
-                            prediction_data['prediction_info'] = text
-                            break
-                
-                if prediction_data:
-                    logger.debug(f"Successfully parsed prediction data: {list(prediction_data.keys())}")
-                else:
-                    logger.debug("No prediction data found on page")
-                
-                return prediction_data if prediction_data else None
-                
-            except requests.RequestException as e:
-                logger.error(f"Error fetching prediction for {preview_url} (attempt {attempt + 1}/{MAX_RETRIES}): {e}")
-                if attempt < MAX_RETRIES - 1:
-                    time.sleep(RETRY_DELAY)
-                else:
-                    logger.error("Max retries reached for prediction fetch")
-                    return None
+            # Extract prediction text/reasoning
+            pred_text = prediction_section.find('p') or prediction_section.find('div', class_='prediction-text')
+            if pred_text:
+                prediction_data['prediction_text'] = pred_text.get_text(strip=True)
+        
+        # Look for statistics
+        stats_section = soup.find('div', class_='statistics') or soup.find('div', id='statistics')
+        if stats_section:
+            prediction_data['statistics'] = self._parse_statistics(stats_section)
+        
+        # Alternative: Look for SM Prediction box
+        sm_prediction = soup.find('div', class_='sm-prediction')
+        if sm_prediction:
+            score_text = sm_prediction.get_text(strip=True)
+            prediction_data['sm_predicted_score'] = score_text
+            logger.debug(f"Found SM predicted score: {score_text}")
+        
+        # Look for any element with "prediction" in class
+        if not prediction_data:
+            pred_elements = soup.find_all(class_=PREDICT_CLASS_PATTERN)
+            for elem in pred_elements:
+                text = elem.get_text(strip=True)
+                if text and len(text) > 0:
+                    prediction_data['prediction_info'] = text
+                    break
+        
+        if prediction_data:
+            logger.debug(f"Successfully parsed prediction data: {list(prediction_data.keys())}")
+        else:
+            logger.debug("No prediction data found on page")
+        
+        return prediction_data if prediction_data else None
     
     def _parse_statistics(self, stats_section) -> Dict:
         """Parse statistics from a statistics section"""
@@ -279,23 +437,353 @@ class SportsMoleScraper:
             logger.error(f"Error parsing statistics: {e}")
         
         return statistics
+
+
+# Parser used by parse pool processes, created on first use in each process
+_worker_parser: Optional[SportsMolePageParser] = None
+
+
+def parse_prediction_in_worker(content: bytes) -> Tuple[Optional[Dict], float]:
+    """
+    Parse a preview page inside a parse pool process
+    
+    Returns:
+        The prediction data and the time parsing took in seconds
+    """
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = SportsMolePageParser()
+    start = time.perf_counter()
+    prediction = _worker_parser._parse_prediction_page(content)
+    return prediction, time.perf_counter() - start
+
+
+def create_parse_pool(workers: int = PARSE_WORKERS) -> Optional[ProcessPoolExecutor]:
+    """
+    Process pool for parsing preview pages
+    
+    Processes are spawned rather than forked, since the scraper forks from
+    threaded processes (fetch workers, the API's background refresher).
+    
+    Returns:
+        The pool, or None if workers is 0
+    """
+    if workers <= 0:
+        return None
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+class SportsMoleScraper(SportsMolePageParser):
+    """Scraper for SportsMole.co.uk website"""
+    
+    def __init__(self, max_workers: int = PREVIEW_WORKERS,
+                 prediction_cache: Optional[PredictionCache] = None,
+                 http_cache: Optional[HTTPResponseCache] = None,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 http_archive: Optional[HTTPArchive] = None,
+                 parse_pool: Optional[ProcessPoolExecutor] = None):
+        super().__init__()
+        self.max_workers = max(1, max_workers)
+        if prediction_cache is None and PREDICTION_CACHE_ENABLED:
+            prediction_cache = PredictionCache()
+        self.prediction_cache = prediction_cache
+        if http_cache is None and HTTP_CACHE_ENABLED:
+            http_cache = HTTPResponseCache()
+        self.http_cache = http_cache
+        if rate_limiter is None and RATE_LIMIT_ENABLED:
+            rate_limiter = AdaptiveRateLimiter()
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        if http_archive is None and HTTP_ARCHIVE_MODE != 'off':
+            http_archive = HTTPArchive(mode=HTTP_ARCHIVE_MODE)
+        self.http_archive = http_archive
+        # Only a pool created here is shut down by close()
+        self._owns_parse_pool = parse_pool is None and PARSE_WORKERS > 0
+        self.parse_pool = parse_pool or create_parse_pool()
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': USER_AGENT
+        })
+        # Size the connection pool so every worker can hold a keep-alive connection
+        pool = {'pool_connections': self.max_workers, 'pool_maxsize': self.max_workers}
+        if self.http_cache is not None:
+            adapter = CachingHTTPAdapter(self.http_cache, **pool)
+        else:
+            adapter = HTTPAdapter(**pool)
+        if self.http_archive is not None:
+            adapter = self.http_archive.adapter(adapter)
+            logger.info(f"HTTP archive {self.http_archive.mode} mode: {self.http_archive.path}")
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.timeout = REQUEST_TIMEOUT
+        logger.info("SportsMoleScraper initialized")
+    
+    def close(self):
+        """Close the HTTP session and shut down the parse pool if the scraper created it"""
+        self.session.close()
+        if self._owns_parse_pool and self.parse_pool is not None:
+            self.parse_pool.shutdown(cancel_futures=True)
+            self.parse_pool = None
+    
+    def _get(self, url: str, page: str = 'preview') -> requests.Response:
+        """GET a URL, paced by the rate limiter when one is configured"""
+        ticket = self.rate_limiter.acquire() if self.rate_limiter is not None else None
+        status = None
+        try:
+            with FETCH_SECONDS.time(page=page):
+                response = self.session.get(url, timeout=self.timeout)
+            status = response.status_code
+            if not getattr(response, 'from_cache', False):
+                DOWNLOADED_BYTES.inc(len(response.content), page=page)
+            return response
+        finally:
+            if ticket is not None:
+                self.rate_limiter.release(ticket, status)
+    
+    def _fetch(self, url: str, page: str = 'preview') -> bytes:
+        """
+        Fetch a URL and return the response body, retrying transient failures
+        
+        Args:
+            url: URL to fetch
+            page: Page type for metrics ("fixtures" or "preview")
+        
+        Raises:
+            requests.RequestException: If the request failed permanently
+                (e.g. 404) or every attempt failed
+            CircuitOpenError: If the circuit breaker is open
+        """
+        attempt = 0
+        while True:
+            try:
+                self.circuit_breaker.before_request()
+            except CircuitOpenError:
+                FETCH_FAILURES.inc(page=page, reason='circuit_open')
+                raise
+            try:
+                response = self._get(url, page)
+                response.raise_for_status()
+                self.circuit_breaker.record_success()
+                return response.content
+            except requests.RequestException as e:
+                response = e.response
+                if response is not None:
+                    retryable = is_retryable_status(response.status_code)
+                else:
+                    retryable = isinstance(e, (requests.ConnectionError, requests.Timeout))
+                reason = str(response.status_code) if response is not None else type(e).__name__
+                if not retryable:
+                    # The site answered, it just doesn't have this page
+                    self.circuit_breaker.record_success()
+                    FETCH_FAILURES.inc(page=page, reason=reason)
+                    raise
+                
+                self.circuit_breaker.record_failure()
+                retry_after = parse_retry_after(response.headers.get('Retry-After')) if response is not None else None
+                delay = self.retry_policy.next_delay(attempt, retry_after)
+                if delay is None:
+                    FETCH_FAILURES.inc(page=page, reason=reason)
+                    raise
+                FETCH_RETRIES.inc(page=page)
+                attempt += 1
+                logger.warning(f"Retrying {url} in {delay:.1f}s "
+                               f"(attempt {attempt + 1}/{self.retry_policy.max_attempts}): {e}")
+                time.sleep(delay)
+    
+    def get_upcoming_matches(self) -> List[Dict]:
+        """
+        Fetch all upcoming matches from SportsMole
+        
+        Crawls the fixtures page and any configured competition or date
+        listing pages (see crawl_fixtures).
+        
+        Returns:
+            List of dictionaries containing match information
+        """
+        return self.crawl_fixtures()
+    
+    def _fetch_listing_page(self, url: str) -> Optional[bytes]:
+        """Fetch a fixture listing page, or None if it could not be fetched"""
+        try:
+            logger.info(f"Fetching fixtures from {url}")
+            return self._fetch(url, page='fixtures')
+        except (requests.RequestException, CircuitOpenError) as e:
+            logger.error(f"Error fetching fixtures from {url}, skipping page: {e}")
+            return None
+    
+    def crawl_fixtures(self, seed_urls: Optional[List[str]] = None,
+                       max_depth: Optional[int] = None,
+                       max_pages: Optional[int] = None,
+                       max_workers: Optional[int] = None) -> List[Dict]:
+        """
+        Crawl fixture listing pages and merge their matches
+        
+        Pages are fetched concurrently by a bounded worker pool and parsed
+        as they arrive; links to further listing pages are queued until
+        max_depth or max_pages is reached. Each page is fetched once (by
+        canonical URL) and each match is returned once (by match ID), in
+        the order pages were discovered. Pages that fail are skipped.
+        
+        Args:
+            seed_urls: Listing pages to start from (default: FIXTURES_URL and CRAWL_SEED_URLS)
+            max_depth: Link hops followed from a seed (default: CRAWL_MAX_DEPTH)
+            max_pages: Maximum number of pages fetched (default: CRAWL_MAX_PAGES)
+            max_workers: Number of concurrent page fetches (default: CRAWL_WORKERS)
+        
+        Returns:
+            List of dictionaries containing match information
+        """
+        frontier = self._crawl_frontier(seed_urls, max_depth, max_pages)
+        workers = max(1, max_workers or self.crawl_workers)
+        results = {}
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            in_flight = {}
+            while frontier or in_flight:
+                while frontier and len(in_flight) < workers:
+                    page = frontier.pop()
+                    in_flight[executor.submit(self._fetch_listing_page, page.url)] = page
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page = in_flight.pop(future)
+                    content = future.result()
+                    if content is not None:
+                        results[page.order] = self._parse_listing_page(content, page, frontier)
+        
+        return self._merge_listing_results(results, frontier)
+    
+    def _fetch_preview(self, preview_url: str) -> Optional[bytes]:
+        """Fetch a preview page, or None if it could not be fetched"""
+        try:
+            logger.debug(f"Fetching prediction from {preview_url}")
+            return self._fetch(preview_url)
+        except (requests.RequestException, CircuitOpenError) as e:
+            logger.error(f"Error fetching prediction for {preview_url}: {e}")
+            return None
+    
+    def get_match_prediction(self, preview_url: str) -> Optional[Dict]:
+        """
+        Fetch prediction details for a specific match
+        
+        Args:
+            preview_url: URL to the match preview page
+            
+        Returns:
+            Dictionary containing prediction information
+        """
+        content = self._fetch_preview(preview_url)
+        if content is None:
+            return None
+        
+        if self.parse_pool is not None:
+            prediction, seconds = self.parse_pool.submit(parse_prediction_in_worker, content).result()
+            PARSE_SECONDS.observe(seconds, page='preview')
+            return prediction
+        with PARSE_SECONDS.time(page='preview'):
+            return self._parse_prediction_page(content)
+    
+    def _fetch_and_parse_in_pool(self, preview_urls: List[str], workers: int) -> List[Optional[Dict]]:
+        """
+        Fetch preview pages in threads and parse them in the parse pool
+        
+        Each page is handed to the pool as soon as it arrives, so parsing
+        runs on other cores while the remaining pages are still downloading.
+        """
+        parses = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            fetches = {executor.submit(self._fetch_preview, url): i for i, url in enumerate(preview_urls)}
+            for future in as_completed(fetches):
+                content = future.result()
+                if content is not None:
+                    parses[fetches[future]] = self.parse_pool.submit(parse_prediction_in_worker, content)
+        
+        predictions = []
+        for i in range(len(preview_urls)):
+            if i not in parses:
+                predictions.append(None)
+                continue
+            prediction, seconds = parses[i].result()
+            PARSE_SECONDS.observe(seconds, page='preview')
+            predictions.append(prediction)
+        return predictions
     
-    def get_all_matches_with_predictions(self) -> List[Dict]:
+    def get_all_matches_with_predictions(self, max_workers: Optional[int] = None) -> List[Dict]:
         """
         Get all upcoming matches with their predictions and statistics
         
+        Predictions still valid in the prediction cache are reused; the
+        remaining preview pages are fetched in parallel by a bounded worker
+        pool, and parsed in the parse pool when one is configured. Matches
+        are returned in fixture order regardless of completion order.
+        
+        Args:
+            max_workers: Number of concurrent preview fetches
+                (default: the scraper's max_workers; 1 fetches sequentially)
+        
         Returns:
             List of dictionaries containing complete match information
         """
         matches = self.get_upcoming_matches()
+        to_fetch = self._apply_cached_predictions(matches)
+        preview_urls = [match['preview_url'] for match in to_fetch]
         
-        for match in matches:
-            if 'preview_url' in match:
-                prediction = self.get_match_prediction(match['preview_url'])
-                if prediction:
-                    match.update(prediction)
+        workers = min(max_workers or self.max_workers, len(to_fetch))
+        if self.parse_pool is not None and to_fetch:
+            logger.info(f"Fetching {len(to_fetch)} previews with {workers} workers, parsing in a process pool")
+            predictions = self._fetch_and_parse_in_pool(preview_urls, max(1, workers))
+        elif workers <= 1:
+            predictions = [self.get_match_prediction(url) for url in preview_urls]
+        else:
+            logger.info(f"Fetching {len(to_fetch)} previews with {workers} workers")
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                predictions = list(executor.map(self.get_match_prediction, preview_urls))
+        
+        self._merge_predictions(to_fetch, predictions)
         
         return matches
+    
+    def iter_matches_with_predictions(self, max_workers: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Yield matches with their predictions as soon as each one is complete
+        
+        Matches that need no preview fetch (no preview URL, or a cached
+        prediction) are yielded straight after the fixtures page is parsed,
+        in fixture order. The rest follow in the order their preview pages
+        finish. Closing the generator early cancels outstanding fetches.
+        
+        Args:
+            max_workers: Number of concurrent preview fetches
+                (default: the scraper's max_workers)
+        
+        Yields:
+            Dictionaries containing complete match information
+        """
+        matches = self.get_upcoming_matches()
+        to_fetch = self._apply_cached_predictions(matches)
+        pending = {id(match) for match in to_fetch}
+        
+        for match in matches:
+            if id(match) not in pending:
+                yield match
+        
+        if not to_fetch:
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=min(max_workers or self.max_workers, len(to_fetch)))
+        try:
+            futures = {
+                executor.submit(self.get_match_prediction, match['preview_url']): match
+                for match in to_fetch
+            }
+            for future in as_completed(futures):
+                match = futures[future]
+                self._merge_predictions([match], [future.result()])
+                yield match
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,196 @@
+"""
+Shared cache backends for SportsMole Scraper API
+Lets several API worker processes serve the same snapshot while only one
+of them scrapes SportsMole at a time
+"""
+
+from typing import Optional
+import json
+import os
+import tempfile
+import time
+from config import SHARED_CACHE_BACKEND, SHARED_CACHE_PATH
+from prepared_response import PreparedResponse
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; only the local backend works there
+    fcntl = None
+
+
+def pid_alive(pid: int) -> bool:
+    """Check if a process with the given pid exists"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class LocalCache:
+    """
+    Per-process backend (the default)
+    
+    Nothing is shared: every worker refreshes and serves its own snapshot.
+    Also documents the interface a shared backend implements.
+    """
+    
+    def acquire_refresh(self, blocking: bool = False) -> bool:
+        """Take the cross-process refresh lock; False if another worker holds it"""
+        return True
+    
+    def release_refresh(self):
+        """Release the refresh lock taken by acquire_refresh"""
+    
+    def refresh_locked(self) -> bool:
+        """Check if another worker is refreshing"""
+        return False
+    
+    def publish(self, prepared: PreparedResponse):
+        """Share a new snapshot (its prepared /api/matches response) with other workers"""
+    
+    def read_if_changed(self) -> Optional[PreparedResponse]:
+        """
+        Snapshot published by another worker since the last call
+        
+        Returns:
+            The snapshot's prepared /api/matches response, or None if unchanged
+        """
+        return None
+    
+    def close(self):
+        """Release any resources held by the backend"""
+
+
+class SharedFileCache(LocalCache):
+    """
+    Snapshot shared through a file, for workers on one host
+    
+    The file holds a JSON header line followed by every prepared variant
+    (identity, gzip, br) of the /api/matches body. Publishing writes a new
+    file and atomically renames it over the old one. Readers notice the
+    change with a stat() call, read the file and reuse the serialized and
+    compressed bodies as they are, so adopting a snapshot costs one JSON
+    parse instead of a scrape, a serialization and a compression.
+    Refreshes are serialized with flock() on a separate lock file. The
+    worker holding it writes its pid and start time into the file, so
+    other workers can check for a running refresh by reading it instead
+    of briefly taking the lock themselves.
+    """
+    
+    def __init__(self, path: str = SHARED_CACHE_PATH):
+        if fcntl is None:
+            raise RuntimeError("The file shared cache backend requires fcntl (Unix)")
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        self._version = None
+        self._lock_fd = None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+    
+    @staticmethod
+    def _file_version(stat: os.stat_result) -> tuple:
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    
+    def acquire_refresh(self, blocking: bool = False) -> bool:
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        holder = f"{os.getpid()} {time.time():.3f}".encode('ascii')
+        os.pwrite(fd, holder, 0)
+        os.ftruncate(fd, len(holder))
+        self._lock_fd = fd
+        return True
+    
+    def release_refresh(self):
+        if self._lock_fd is not None:
+            fd, self._lock_fd = self._lock_fd, None
+            os.ftruncate(fd, 0)
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+    
+    def refresh_locked(self) -> bool:
+        if self._lock_fd is not None:
+            return True
+        try:
+            with open(self.lock_path, 'rb') as f:
+                holder = f.read().split()
+        except FileNotFoundError:
+            return False
+        if not holder:
+            return False
+        try:
+            pid = int(holder[0])
+        except ValueError:
+            # Being written by a worker that just took the lock
+            return True
+        # A worker that died mid-refresh lost its flock but left its pid behind
+        return pid_alive(pid)
+    
+    def publish(self, prepared: PreparedResponse):
+        header = {'variants': {}}
+        blobs = []
+        offset = 0
+        for encoding, (body, etag) in prepared.variants.items():
+            header['variants'][encoding] = [offset, len(body), etag]
+            blobs.append(body)
+            offset += len(body)
+        
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path) or '.', prefix='.snapshot-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(json.dumps(header, separators=(',', ':')).encode('utf-8') + b'\n')
+                for blob in blobs:
+                    f.write(blob)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        # Our own snapshot is already in memory, so don't read it back
+        self._version = self._file_version(os.stat(self.path))
+    
+    def read_if_changed(self) -> Optional[PreparedResponse]:
+        try:
+            version = self._file_version(os.stat(self.path))
+        except FileNotFoundError:
+            return None
+        if version == self._version:
+            return None
+        
+        with open(self.path, 'rb') as f:
+            # Stat the open file: the path may already point at a newer snapshot
+            version = self._file_version(os.fstat(f.fileno()))
+            header = json.loads(f.readline())
+            start = f.tell()
+            variants = {}
+            for encoding, (offset, length, etag) in header['variants'].items():
+                f.seek(start + offset)
+                variants[encoding] = (f.read(length), etag)
+        
+        self._version = version
+        return PreparedResponse.from_variants(variants)
+    
+    def close(self):
+        self.release_refresh()
+
+
+def create_shared_cache(backend: str = SHARED_CACHE_BACKEND) -> LocalCache:
+    """
+    Build the configured shared cache backend
+    
+    Args:
+        backend: "local" (per-process) or "file" (a file shared
+            by workers on the same host)
+    """
+    if backend == 'local':
+        return LocalCache()
+    if backend == 'file':
+        return SharedFileCache()
+    raise ValueError(f"Unknown shared cache backend: {backend}")
@@ -0,0 +1,188 @@
+"""
+Persistent snapshot store for SportsMole Scraper API
+Keeps every cache snapshot in SQLite so the API can warm-start after a
+restart and serve historical predictions without re-scraping
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+import json
+import os
+import sqlite3
+import threading
+import logging
+from config import SNAPSHOT_DB_PATH, SNAPSHOT_RETENTION_COUNT
+from match_index import normalize_text
+from kickoff import localize, match_kickoff
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scraped_at TEXT NOT NULL,
+    match_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshot_matches (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id) ON DELETE CASCADE,
+    match_id TEXT NOT NULL,
+    competition TEXT,
+    kickoff TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (snapshot_id, match_id)
+);
+CREATE INDEX IF NOT EXISTS idx_snapshot_matches_match ON snapshot_matches (match_id, snapshot_id);
+CREATE INDEX IF NOT EXISTS idx_snapshot_matches_competition ON snapshot_matches (competition);
+CREATE INDEX IF NOT EXISTS idx_snapshot_matches_kickoff ON snapshot_matches (kickoff);
+"""
+
+
+def kickoff_key(kickoff: datetime) -> str:
+    """Sortable kickoff column value: naive ISO time in UTC (naive input is in the site timezone)"""
+    return localize(kickoff).astimezone(timezone.utc).replace(tzinfo=None).isoformat()
+
+
+class SnapshotStore:
+    """
+    SQLite-backed history of scrape snapshots
+    
+    Each snapshot stores every match as JSON, keyed by match ID and
+    indexed by normalized competition and kickoff time. Only the newest
+    `retention` snapshots are kept. The database is opened on first use.
+    """
+    
+    def __init__(self, path: str = SNAPSHOT_DB_PATH, retention: int = SNAPSHOT_RETENTION_COUNT):
+        self.path = path
+        self.retention = retention
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the schema (lock must be held)"""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+        return self._conn
+    
+    def save_snapshot(self, matches: List[Dict], scraped_at: datetime) -> int:
+        """
+        Persist one snapshot and prune snapshots beyond the retention limit
+        
+        Returns:
+            ID of the new snapshot
+        """
+        rows = []
+        for match in matches:
+            kickoff = match_kickoff(match)
+            rows.append((
+                match['id'],
+                normalize_text(match.get('competition')) or None,
+                kickoff_key(kickoff) if kickoff else None,
+                json.dumps(match, separators=(',', ':'))
+            ))
+        
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                cursor = conn.execute(
+                    "INSERT INTO snapshots (scraped_at, match_count) VALUES (?, ?)",
+                    (scraped_at.isoformat(), len(matches))
+                )
+                snapshot_id = cursor.lastrowid
+                conn.executemany(
+                    "INSERT OR REPLACE INTO snapshot_matches (snapshot_id, match_id, competition, kickoff, data) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(snapshot_id,) + row for row in rows]
+                )
+                conn.execute(
+                    "DELETE FROM snapshots WHERE id <= ?",
+                    (snapshot_id - self.retention,)
+                )
+        logger.info(f"Saved snapshot {snapshot_id} with {len(matches)} matches")
+        return snapshot_id
+    
+    def load_latest(self) -> Optional[Tuple[List[Dict], datetime]]:
+        """
+        Load the most recent snapshot
+        
+        Returns:
+            Tuple of (matches in scrape order, scraped_at), or None if empty
+        """
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT id, scraped_at FROM snapshots ORDER BY id DESC LIMIT 1").fetchone()
+            if row is None:
+                return None
+            snapshot_id, scraped_at = row
+            data = conn.execute(
+                "SELECT data FROM snapshot_matches WHERE snapshot_id = ? ORDER BY rowid",
+                (snapshot_id,)
+            ).fetchall()
+        return [json.loads(item) for item, in data], datetime.fromisoformat(scraped_at)
+    
+    def match_history(self, match_id: str, limit: int = 100) -> List[Dict]:
+        """Stored versions of one match, newest first"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT m.snapshot_id, s.scraped_at, m.data FROM snapshot_matches m "
+                "JOIN snapshots s ON s.id = m.snapshot_id "
+                "WHERE m.match_id = ? ORDER BY m.snapshot_id DESC LIMIT ?",
+                (match_id, limit)
+            ).fetchall()
+        return [
+            {'snapshot_id': snapshot_id, 'scraped_at': scraped_at, 'match': json.loads(data)}
+            for snapshot_id, scraped_at, data in rows
+        ]
+    
+    def query_matches(self, competition: Optional[str] = None,
+                      kickoff_from: Optional[datetime] = None,
+                      kickoff_to: Optional[datetime] = None,
+                      limit: int = 500) -> List[Dict]:
+        """
+        Latest stored version of every match matching the filters
+        
+        Args:
+            competition: Competition name (exact, case- and accent-insensitive)
+            kickoff_from: Earliest kickoff (inclusive)
+            kickoff_to: Latest kickoff (inclusive)
+            limit: Maximum number of matches
+        
+        Returns:
+            List of match dictionaries ordered by kickoff
+        """
+        conditions = [
+            "m.snapshot_id = (SELECT MAX(latest.snapshot_id) FROM snapshot_matches latest "
+            "WHERE latest.match_id = m.match_id)"
+        ]
+        params = []
+        if competition:
+            conditions.append("m.competition = ?")
+            params.append(normalize_text(competition))
+        if kickoff_from:
+            conditions.append("m.kickoff >= ?")
+            params.append(kickoff_key(kickoff_from))
+        if kickoff_to:
+            conditions.append("m.kickoff <= ?")
+            params.append(kickoff_key(kickoff_to))
+        params.append(limit)
+        
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT m.data FROM snapshot_matches m WHERE " + " AND ".join(conditions) +
+                " ORDER BY m.kickoff IS NULL, m.kickoff LIMIT ?",
+                params
+            ).fetchall()
+        return [json.loads(data) for data, in rows]
+    
+    def close(self):
+        """Close the underlying database"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,77 @@
+"""
+Adaptive selector strategies for SportsMole Scraper
+Runs parsing fallbacks in order, counting which one succeeded, and for
+mutually exclusive alternatives tries the last successful one first
+"""
+
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+import threading
+
+
+class AdaptiveStrategy:
+    """
+    An ordered cascade of fallback strategies for one parsing step
+    
+    Each strategy is a callable returning a truthy result on success.
+    Per-strategy hit counts are kept for monitoring.
+    
+    With reorder=True the strategy that succeeded last is tried first on
+    the next call, so a stable page layout goes straight to the working
+    selector instead of walking every failing pass. That is only safe when
+    at most one strategy can match a given input (e.g. alternative page
+    layouts): when several can, the result would depend on the inputs
+    parsed before. Steps with overlapping strategies use reorder=False and
+    always run in the given order.
+    """
+    
+    def __init__(self, name: str, strategies: List[Tuple[str, Callable]], reorder: bool = True):
+        self.name = name
+        self.strategies = dict(strategies)
+        self.order = [label for label, _ in strategies]
+        self.reorder = reorder
+        self.preferred: Optional[str] = None
+        self.hits = Counter()
+        self.failures = 0
+        self._lock = threading.Lock()
+    
+    def run(self, *args):
+        """
+        Run strategies until one succeeds
+        
+        Returns:
+            Tuple of (label, result) for the successful strategy, or (None, None)
+        """
+        preferred = self.preferred
+        if preferred is not None:
+            result = self.strategies[preferred](*args)
+            if result:
+                self._record(preferred)
+                return preferred, result
+        
+        for label in self.order:
+            if label == preferred:
+                continue
+            result = self.strategies[label](*args)
+            if result:
+                self._record(label)
+                return label, result
+        
+        with self._lock:
+            self.failures += 1
+        return None, None
+    
+    def _record(self, label: str):
+        with self._lock:
+            self.hits[label] += 1
+            if self.reorder:
+                self.preferred = label
+    
+    def stats(self) -> Dict:
+        """Preferred strategy, per-strategy hit counts and failure count"""
+        with self._lock:
+            return {
+                'preferred': self.preferred,
+                'hits': {label: self.hits[label] for label in self.order},
+                'failures': self.failures
+            }
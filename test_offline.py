@@ -3,12 +3,143 @@ Offline tests for SportsMole Scraper
 Tests basic functionality without requiring internet access
 """
 
+import asyncio
+import hashlib
+import os
+import tempfile
+import threading
+import time
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import Mock, patch, MagicMock
-from scraper import SportsMoleScraper
+from scraper import SportsMoleScraper, create_parse_pool
+from async_scraper import AsyncSportsMoleScraper
+from prediction_cache import PredictionCache
+from http_cache import HTTPResponseCache
+from http_archive import HTTPArchive
+from strategy_cache import AdaptiveStrategy
+from rate_limiter import AdaptiveRateLimiter, TokenBucket
+from retry_policy import RetryPolicy, CircuitBreaker, CircuitOpenError
+from snapshot_store import SnapshotStore
+from crawl_frontier import CrawlFrontier, canonicalize_url
+from shared_cache import SharedFileCache
+from prepared_response import PreparedResponse
+from match_record import MatchRecord
+from change_feed import ChangeFeed
+from match_index import MAX_MEMOIZED_LOOKUPS
+from event_stream import EventBroadcaster
 from bs4 import BeautifulSoup
 
 
+STUB_FIXTURES_HTML = """
+<div class="match-preview">
+    <span class="team-name">Arsenal</span>
+    <span class="team-name">Chelsea</span>
+    <span class="match-date">Dec 14, 2025 16:30</span>
+    <span class="competition">Premier League</span>
+    <a href="/football/arsenal/preview/arsenal-vs-chelsea">Preview</a>
+</div>
+<div class="match-preview">
+    <span class="team-name">Everton</span>
+    <span class="team-name">Fulham</span>
+    <span class="competition">Premier League</span>
+    <a href="/football/everton/preview/everton-vs-fulham">Preview</a>
+</div>
+<div class="match-preview">
+    <span class="team-name">Leeds</span>
+    <span class="team-name">Burnley</span>
+</div>
+"""
+
+STUB_PREVIEW_HTML = """
+<div class="prediction">
+    <span class="score">2-1</span>
+    <p>A close contest is expected.</p>
+</div>
+<div class="statistics">
+    <div class="stat-row">
+        <span class="stat-label">Goals Scored</span>
+        <span class="stat-value">25</span>
+    </div>
+</div>
+"""
+
+
+class StubSportsMoleServer:
+    """Local HTTP server serving canned fixtures and preview pages"""
+    
+    def __init__(self, pages, etags=False, failures=None):
+        self.pages = pages
+        self.requests = []
+        self.statuses = []
+        # Statuses to answer a path with before serving it, e.g. {'/page': [503]}
+        self.failures = failures or {}
+        pages_ref, requests_ref, statuses_ref, failures_ref = self.pages, self.requests, self.statuses, self.failures
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                requests_ref.append(self.path)
+                if failures_ref.get(self.path):
+                    status = failures_ref[self.path].pop(0)
+                    statuses_ref.append(status)
+                    self.send_response(status)
+                    self.send_header('Retry-After', '0')
+                    self.end_headers()
+                    return
+                body = pages_ref.get(self.path)
+                if body is None:
+                    statuses_ref.append(404)
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                data = body.encode('utf-8')
+                etag = f'"{hashlib.md5(data).hexdigest()}"'
+                if etags and self.headers.get('If-None-Match') == etag:
+                    statuses_ref.append(304)
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                statuses_ref.append(200)
+                self.send_response(200)
+                if etags:
+                    self.send_header('ETag', etag)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+    
+    def __enter__(self):
+        self.thread.start()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def stub_pages():
+    """Default page set for the stub server"""
+    return {
+        '/football/fixtures/': STUB_FIXTURES_HTML,
+        '/football/arsenal/preview/arsenal-vs-chelsea': STUB_PREVIEW_HTML,
+        '/football/everton/preview/everton-vs-fulham': STUB_PREVIEW_HTML,
+    }
+
+
+def point_scraper_at(scraper, server):
+    """Redirect a scraper instance to the stub server"""
+    scraper.BASE_URL = server.base_url
+    scraper.FIXTURES_URL = server.base_url + '/football/fixtures/'
+
+
 class TestSportsMoleScraperOffline(unittest.TestCase):
     """Test cases for SportsMoleScraper that don't require internet"""
     
@@ -42,6 +173,7 @@ class TestSportsMoleScraperOffline(unittest.TestCase):
         self.assertEqual(result['home_team'], 'Manchester United')
         self.assertEqual(result['away_team'], 'Liverpool')
         self.assertEqual(result['date'], 'Dec 12, 2025 15:00')
+        self.assertEqual(result['kickoff'], '2025-12-12T15:00:00+00:00')
         self.assertEqual(result['competition'], 'Premier League')
         self.assertIn('preview_url', result)
     
@@ -145,6 +277,1130 @@ class TestSportsMoleScraperOffline(unittest.TestCase):
         self.assertEqual(result[0]['away_team'], 'Tottenham')
         self.assertIn('preview_url', result[0])
 
+    def test_parser_backends_agree(self):
+        """Test that lxml and targeted parsing give the same result as html.parser"""
+        fixtures = '<html><body><nav><a href="/football/x/">X</a></nav>' + STUB_FIXTURES_HTML + '</body></html>'
+        preview = '<html><body><div class="comments">No</div>' + STUB_PREVIEW_HTML + '</body></html>'
+        
+        self.scraper.parser = 'html.parser'
+        self.scraper.targeted_parsing = False
+        expected = (self.scraper._parse_fixtures_page(fixtures), self.scraper._parse_prediction_page(preview))
+        
+        self.scraper.parser = 'lxml'
+        for targeted in (False, True):
+            self.scraper.targeted_parsing = targeted
+            result = (self.scraper._parse_fixtures_page(fixtures), self.scraper._parse_prediction_page(preview))
+            self.assertEqual(result, expected)
+    
+    def test_targeted_parsing_keeps_fallbacks(self):
+        """Test that targeted parsing still reaches the table and catch-all fallbacks"""
+        self.scraper.targeted_parsing = True
+        tables = '<p>Intro</p><table class="fixtures"><tr><td>A</td><td>Today</td><td>B</td></tr></table>'
+        self.assertEqual(self.scraper._parse_fixtures_page(tables)[0]['away_team'], 'B')
+        
+        catch_all = '<div class="layout"><span class="match-predictor">2-2</span></div>'
+        self.assertEqual(self.scraper._parse_prediction_page(catch_all), {'prediction_info': '2-2'})
+    
+    def test_strategy_stats_track_successful_selectors(self):
+        """Test that parsing records which selector strategies succeeded"""
+        self.scraper._parse_fixtures_page(STUB_FIXTURES_HTML)
+        stats = self.scraper.strategy_stats()
+        
+        self.assertEqual(stats['fixture_layout']['preferred'], 'match-preview')
+        self.assertEqual(stats['teams']['hits']['team-name-spans'], 3)
+        self.assertEqual(stats['teams']['hits']['team-links'], 0)
+        self.assertEqual(stats['date']['hits']['match-date-span'], 1)
+        self.assertEqual(stats['date']['failures'], 2)
+    
+    def test_adaptive_strategy_tries_last_success_first(self):
+        """Test that the last successful strategy is tried before the others"""
+        calls = []
+        
+        def make(label, result):
+            def strategy(value):
+                calls.append(label)
+                return result if value else None
+            return strategy
+        
+        strategy = AdaptiveStrategy('demo', [('first', make('first', None)), ('second', make('second', 'ok'))])
+        self.assertEqual(strategy.run(True), ('second', 'ok'))
+        calls.clear()
+        self.assertEqual(strategy.run(True), ('second', 'ok'))
+        self.assertEqual(calls, ['second'])
+        self.assertEqual(strategy.run(False), (None, None))
+        self.assertEqual(strategy.stats(), {'preferred': 'second', 'hits': {'first': 0, 'second': 2}, 'failures': 1})
+    
+    def test_element_parses_the_same_after_other_layouts(self):
+        """Test that an element matching several selectors parses the same regardless of earlier pages"""
+        both = """
+        <div class="match-preview">
+            <span class="team-name">Man Utd</span>
+            <span class="team-name">Liverpool</span>
+            <span class="match-date">Dec 12, 2025 15:00</span>
+            <time>Friday evening</time>
+            <a href="/football/manchester-united/">Manchester United FC</a>
+            <a href="/football/liverpool/">Liverpool FC</a>
+        </div>
+        """
+        links_only = """
+        <div class="fixture">
+            <a href="/football/chelsea/">Chelsea</a>
+            <a href="/football/arsenal/">Arsenal</a>
+            <time>Dec 13, 2025 17:30</time>
+        </div>
+        """
+        before = self.scraper._parse_fixtures_page(both)
+        self.assertEqual(self.scraper._parse_fixtures_page(links_only)[0]['home_team'], 'Chelsea')
+        after = self.scraper._parse_fixtures_page(both)
+        
+        self.assertEqual((before[0]['home_team'], before[0]['date']), ('Man Utd', 'Dec 12, 2025 15:00'))
+        self.assertEqual(after, before)
+    
+    def test_iter_matches_with_predictions_yields_all(self):
+        """Test that the generator yields every match with its prediction"""
+        matches = [
+            {'home_team': 'A', 'away_team': 'B', 'preview_url': 'https://example.com/football/a/preview'},
+            {'home_team': 'C', 'away_team': 'D'},
+        ]
+        with patch.object(self.scraper, 'get_upcoming_matches', return_value=matches), \
+             patch.object(self.scraper, 'get_match_prediction', return_value={'predicted_score': '1-1'}):
+            result = list(self.scraper.iter_matches_with_predictions())
+        
+        self.assertEqual([m['home_team'] for m in result], ['C', 'A'])
+        self.assertEqual(result[1]['predicted_score'], '1-1')
+    
+    def test_get_all_matches_with_predictions_parallel_keeps_order(self):
+        """Test that parallel preview fetching preserves fixture order"""
+        matches = [
+            {'home_team': f'Home {i}', 'away_team': f'Away {i}',
+             'preview_url': f'https://example.com/football/m{i}/preview'}
+            for i in range(6)
+        ]
+        matches.insert(2, {'home_team': 'No', 'away_team': 'Preview'})
+        
+        def fake_prediction(url):
+            index = int(url.split('/m')[1].split('/')[0])
+            # Earlier fixtures finish last
+            time.sleep(0.01 * (6 - index))
+            return {'predicted_score': f'{index}-0'}
+        
+        with patch.object(self.scraper, 'get_upcoming_matches', return_value=matches), \
+             patch.object(self.scraper, 'get_match_prediction', side_effect=fake_prediction):
+            result = self.scraper.get_all_matches_with_predictions(max_workers=4)
+        
+        self.assertEqual(len(result), 7)
+        self.assertNotIn('predicted_score', result[2])
+        scores = [m['predicted_score'] for m in result if 'predicted_score' in m]
+        self.assertEqual(scores, [f'{i}-0' for i in range(6)])
+
+
+class TestBenchmarkPages(unittest.TestCase):
+    """Test that the benchmark's generated pages parse completely"""
+    
+    def test_every_layout_and_preview_variant_parses(self):
+        """Test each fixtures layout and preview variant the benchmark suite uses"""
+        from benchmark import LAYOUTS, PREVIEW_TEMPLATES, generate_fixtures_page, generate_preview_page
+        scraper = SportsMoleScraper()
+        for layout in LAYOUTS:
+            matches = scraper._parse_fixtures_page(generate_fixtures_page(60, layout))
+            self.assertEqual(len(matches), 60, layout)
+            self.assertTrue(all('preview_url' in match for match in matches), layout)
+        for variant in PREVIEW_TEMPLATES:
+            self.assertTrue(scraper._parse_prediction_page(generate_preview_page(1, variant)), variant)
+
+
+class TestAsyncSportsMoleScraper(unittest.TestCase):
+    """Test the async scraper against a local stub server"""
+    
+    def test_async_matches_sync_output(self):
+        """Test that the async scraper produces the same data as the sync scraper"""
+        with StubSportsMoleServer(stub_pages()) as server:
+            sync_scraper = SportsMoleScraper()
+            point_scraper_at(sync_scraper, server)
+            expected = sync_scraper.get_all_matches_with_predictions()
+            
+            async def run():
+                async with AsyncSportsMoleScraper(max_concurrency=4) as scraper:
+                    point_scraper_at(scraper, server)
+                    return await scraper.get_all_matches_with_predictions()
+            
+            result = asyncio.run(run())
+        
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result, expected)
+        self.assertEqual(result[0]['predicted_score'], '2-1')
+        self.assertEqual(result[0]['statistics'], {'Goals Scored': '25'})
+        self.assertNotIn('predicted_score', result[2])
+    
+    def test_async_prediction_not_found(self):
+        """Test that a 404 returns None without retrying"""
+        with StubSportsMoleServer(stub_pages()) as server:
+            async def run():
+                async with AsyncSportsMoleScraper() as scraper:
+                    return await scraper.get_match_prediction(server.base_url + '/missing')
+            
+            result = asyncio.run(run())
+        
+        self.assertIsNone(result)
+        self.assertEqual(server.requests, ['/missing'])
+    
+    def test_async_retries_transient_errors(self):
+        """Test that a 503 is retried and the page is then parsed"""
+        preview = '/football/arsenal/preview/arsenal-vs-chelsea'
+        with StubSportsMoleServer(stub_pages(), failures={preview: [503]}) as server:
+            async def run():
+                async with AsyncSportsMoleScraper(retry_policy=RetryPolicy(base_delay=0)) as scraper:
+                    return await scraper.get_match_prediction(server.base_url + preview)
+            
+            result = asyncio.run(run())
+        
+        self.assertEqual(result['predicted_score'], '2-1')
+        self.assertEqual(server.statuses, [503, 200])
+
+
+def crawl_pages():
+    """Fixtures page linking to a competition page and a date page that overlap it"""
+    pages = stub_pages()
+    pages['/football/fixtures/'] = STUB_FIXTURES_HTML + """
+<a href="/football/premier-league/fixtures/">Premier League</a>
+<a href="/football/fixtures/2025-12-15/">Monday</a>
+<a href="https://example.com/football/fixtures/">Elsewhere</a>
+"""
+    pages['/football/premier-league/fixtures/'] = """
+<div class="match-preview">
+    <span class="team-name">Arsenal</span>
+    <span class="team-name">Chelsea</span>
+    <a href="/football/arsenal/preview/arsenal-vs-chelsea">Preview</a>
+</div>
+<div class="match-preview">
+    <span class="team-name">Spurs</span>
+    <span class="team-name">Wolves</span>
+    <span class="competition">Premier League</span>
+</div>
+<a href="/football/fixtures/#top">All fixtures</a>
+<a href="/football/fixtures/2025-12-15?utm_source=nav">Monday</a>
+"""
+    pages['/football/fixtures/2025-12-15/'] = """
+<div class="match-preview">
+    <span class="team-name">Everton</span>
+    <span class="team-name">Fulham</span>
+    <span class="match-date">Dec 15, 2025 20:00</span>
+    <a href="/football/everton/preview/everton-vs-fulham">Preview</a>
+</div>
+<a href="/football/fixtures/2025-12-16/">Tuesday</a>
+"""
+    return pages
+
+
+class TestFixtureCrawl(unittest.TestCase):
+    """Test crawling several fixture listing pages into one match set"""
+    
+    def test_canonical_urls_are_deduplicated(self):
+        """Test that equivalent URLs are admitted to the frontier once"""
+        self.assertEqual(canonicalize_url('HTTPS://Example.com:443/football/fixtures/?b=2&a=1&utm_source=x#top'),
+                         'https://example.com/football/fixtures?a=1&b=2')
+        frontier = CrawlFrontier(max_depth=1, max_pages=3)
+        self.assertTrue(frontier.add('https://example.com/football/fixtures/'))
+        self.assertFalse(frontier.add('https://example.com/football/fixtures#top', 1))
+        self.assertFalse(frontier.add('https://other.com/football/fixtures/', 1))
+        self.assertFalse(frontier.add('https://example.com/football/a/fixtures/', 2))
+        self.assertTrue(frontier.add('https://example.com/football/a/fixtures/', 1))
+        self.assertTrue(frontier.add('https://example.com/football/b/fixtures/', 1))
+        self.assertFalse(frontier.add('https://example.com/football/c/fixtures/', 1))
+        self.assertEqual(frontier.skipped, 1)
+        self.assertEqual([frontier.pop().order for _ in range(len(frontier))], [0, 1, 2])
+    
+    def test_crawl_merges_listing_pages(self):
+        """Test that linked listing pages are fetched once and matches deduplicated"""
+        with StubSportsMoleServer(crawl_pages()) as server:
+            scraper = SportsMoleScraper()
+            scraper.crawl_max_depth = 1
+            point_scraper_at(scraper, server)
+            matches = scraper.get_upcoming_matches()
+        
+        self.assertEqual(sorted(server.requests), ['/football/fixtures/', '/football/fixtures/2025-12-15/',
+                                                   '/football/premier-league/fixtures/'])
+        self.assertEqual([match['home_team'] for match in matches], ['Arsenal', 'Everton', 'Leeds', 'Spurs'])
+        self.assertEqual(len({match['id'] for match in matches}), 4)
+        self.assertEqual(matches[0]['date'], 'Dec 14, 2025 16:30')
+        self.assertEqual(matches[1]['date'], 'Dec 15, 2025 20:00')
+    
+    def test_crawl_page_limit_and_seeds(self):
+        """Test explicit seeds, and that max_pages bounds the crawl"""
+        with StubSportsMoleServer(crawl_pages()) as server:
+            scraper = SportsMoleScraper()
+            point_scraper_at(scraper, server)
+            matches = scraper.crawl_fixtures(seed_urls=['/football/premier-league/fixtures/'],
+                                             max_depth=2, max_pages=2)
+        
+        self.assertEqual(len(server.requests), 2)
+        self.assertEqual([match['home_team'] for match in matches], ['Arsenal', 'Spurs', 'Everton', 'Leeds'])
+    
+    def test_async_crawl_matches_sync(self):
+        """Test that the async scraper crawls the same match set"""
+        with StubSportsMoleServer(crawl_pages()) as server:
+            sync_scraper = SportsMoleScraper()
+            point_scraper_at(sync_scraper, server)
+            expected = sync_scraper.crawl_fixtures(max_depth=2)
+            
+            async def run():
+                async with AsyncSportsMoleScraper() as scraper:
+                    point_scraper_at(scraper, server)
+                    return await scraper.crawl_fixtures(max_depth=2)
+            
+            result = asyncio.run(run())
+        
+        self.assertEqual(result, expected)
+        self.assertEqual(server.requests.count('/football/fixtures/2025-12-16/'), 2)
+
+
+class TestParsePool(unittest.TestCase):
+    """Test parsing preview pages in a process pool"""
+    
+    def test_pool_parsing_matches_in_process_parsing(self):
+        """Test that pipelined pool parsing gives the same results, sync and async"""
+        with StubSportsMoleServer(stub_pages()) as server:
+            scraper = SportsMoleScraper(prediction_cache=None)
+            point_scraper_at(scraper, server)
+            expected = scraper.get_all_matches_with_predictions()
+            
+            pool = create_parse_pool(2)
+            try:
+                scraper = SportsMoleScraper(prediction_cache=None, parse_pool=pool)
+                point_scraper_at(scraper, server)
+                result = scraper.get_all_matches_with_predictions()
+                single = scraper.get_match_prediction(server.base_url + '/football/arsenal/preview/arsenal-vs-chelsea')
+                
+                async def run():
+                    async with AsyncSportsMoleScraper(prediction_cache=None, parse_pool=pool) as async_scraper:
+                        point_scraper_at(async_scraper, server)
+                        return await async_scraper.get_all_matches_with_predictions()
+                
+                async_result = asyncio.run(run())
+            finally:
+                pool.shutdown()
+        
+        self.assertEqual(result, expected)
+        self.assertEqual(async_result, expected)
+        self.assertEqual(single['statistics'], {'Goals Scored': '25'})
+    
+    def test_pool_workers_do_not_build_the_api(self):
+        """Test that a parse worker re-running api.py as its main script builds no scraper or stores"""
+        import runpy
+        import api
+        with patch.object(SportsMoleScraper, '__init__', side_effect=AssertionError('scraper built')), \
+                patch.object(SnapshotStore, '__init__', side_effect=AssertionError('store built')), \
+                patch.object(SharedFileCache, '__init__', side_effect=AssertionError('shared cache built')), \
+                patch.object(api.REGISTRY, 'register_collector'):
+            namespace = runpy.run_path(api.__file__, run_name='__mp_main__')
+        self.assertIsNone(namespace['scraper'])
+        self.assertIsNone(namespace['snapshot_store'])
+        self.assertIn('create_components', namespace)
+
+
+class TestPredictionCache(unittest.TestCase):
+    """Test the per-preview-URL prediction cache"""
+    
+    def test_hit_and_miss_counts(self):
+        """Test that lookups are counted as hits and misses"""
+        cache = PredictionCache()
+        self.assertIsNone(cache.get('/a'))
+        cache.set('/a', {'predicted_score': '1-0'})
+        self.assertEqual(cache.get('/a'), {'predicted_score': '1-0'})
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['hit_ratio'], 0.5)
+    
+    def test_expired_entry_misses(self):
+        """Test that entries older than the TTL are refetched"""
+        cache = PredictionCache(ttl_minutes=0)
+        cache.set('/a', {'predicted_score': '1-0'})
+        self.assertIsNone(cache.get('/a'))
+        self.assertEqual(len(cache), 0)
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        cache = PredictionCache(max_entries=2)
+        cache.set('/a', {'predicted_score': '1-0'})
+        cache.set('/b', {'predicted_score': '2-0'})
+        cache.get('/a')
+        cache.set('/c', {'predicted_score': '3-0'})
+        self.assertIsNotNone(cache.get('/a'))
+        self.assertIsNone(cache.get('/b'))
+        self.assertIsNotNone(cache.get('/c'))
+    
+    def test_near_kickoff_misses(self):
+        """Test that matches close to kickoff bypass the cache"""
+        from datetime import datetime, timedelta
+        cache = PredictionCache(kickoff_window_minutes=60)
+        cache.set('/a', {'predicted_score': '1-0'})
+        self.assertIsNotNone(cache.get('/a', kickoff=datetime.now() + timedelta(days=2)))
+        self.assertIsNone(cache.get('/a', kickoff=datetime.now() + timedelta(minutes=30)))
+    
+    def test_kickoff_parsing_does_not_guess(self):
+        """Test that kickoff parsing handles day words and year-less dates and rejects non-dates"""
+        from datetime import date
+        from kickoff import _parse_kickoff
+        today = date(2026, 10, 16)
+        
+        def parsed(text):
+            kickoff = _parse_kickoff(text, today)
+            return kickoff.strftime('%Y-%m-%d %H:%M') if kickoff else None
+        
+        self.assertEqual(parsed('Tomorrow 19:45'), '2026-10-17 19:45')
+        self.assertEqual(parsed('Today'), '2026-10-16 00:00')
+        self.assertEqual(parsed('Sat 3 Jan, 15:00'), '2027-01-03 15:00')
+        self.assertEqual(parsed('Sep 30 15:00'), '2026-09-30 15:00')
+        self.assertEqual(parsed('Dec 12, 2025 15:00'), '2025-12-12 15:00')
+        for text in ('Match 12', 'Sat 15:00', 'Tomorrow, Dec 12', 'Kick-off Dec 12', 'Dec 2025'):
+            self.assertIsNone(parsed(text), text)
+    
+    def test_refresh_only_fetches_uncached_previews(self):
+        """Test that a second refresh reuses cached predictions"""
+        with StubSportsMoleServer(stub_pages()) as server:
+            scraper = SportsMoleScraper(prediction_cache=PredictionCache())
+            point_scraper_at(scraper, server)
+            first = scraper.get_all_matches_with_predictions()
+            requests_after_first = len(server.requests)
+            second = scraper.get_all_matches_with_predictions()
+        
+        self.assertEqual(requests_after_first, 3)
+        self.assertEqual(len(server.requests), 4)  # Only the fixtures page is refetched
+        self.assertEqual(first, second)
+        self.assertEqual(scraper.prediction_cache.stats()['hits'], 2)
+
+
+class TestAdaptiveRateLimiter(unittest.TestCase):
+    """Test the token bucket and AIMD concurrency limit"""
+    
+    def test_token_bucket_paces_requests(self):
+        """Test that requests beyond the burst wait for new tokens"""
+        bucket = TokenBucket(rate=20, capacity=1)
+        start = time.monotonic()
+        for _ in range(3):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+    
+    def test_backs_off_once_per_burst_and_recovers(self):
+        """Test multiplicative decrease on 429 and additive increase on success"""
+        limiter = AdaptiveRateLimiter(requests_per_second=0, initial_concurrency=8,
+                                      max_concurrency=8, backoff_factor=0.5)
+        tickets = [limiter.acquire() for _ in range(4)]
+        for ticket in tickets:
+            limiter.release(ticket, 429)
+        self.assertEqual(limiter.stats()['concurrency_limit'], 4)
+        self.assertEqual(limiter.stats()['throttled'], 4)
+        
+        for _ in range(30):
+            limiter.release(limiter.acquire(), 200)
+        self.assertEqual(limiter.stats()['concurrency_limit'], 8)
+    
+    def test_scraper_requests_go_through_limiter(self):
+        """Test that every page fetch is counted by the scraper's limiter"""
+        limiter = AdaptiveRateLimiter(requests_per_second=0)
+        with StubSportsMoleServer(stub_pages()) as server:
+            scraper = SportsMoleScraper(prediction_cache=PredictionCache(), rate_limiter=limiter)
+            point_scraper_at(scraper, server)
+            scraper.get_all_matches_with_predictions()
+        
+        self.assertEqual(limiter.stats()['requests'], len(server.requests))
+        self.assertEqual(limiter.stats()['in_flight'], 0)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """Test retries with backoff and the circuit breaker"""
+    
+    def test_backoff_grows_and_honors_retry_after(self):
+        """Test exponential delay bounds, Retry-After and the attempt limit"""
+        from retry_policy import parse_retry_after
+        policy = RetryPolicy(max_attempts=4, base_delay=1, max_delay=3)
+        for _ in range(20):
+            self.assertLessEqual(policy.next_delay(0), 1)
+            self.assertLessEqual(policy.next_delay(2), 3)
+        self.assertGreaterEqual(policy.next_delay(0, retry_after=2), 2)
+        self.assertIsNone(policy.next_delay(0, retry_after=60))
+        self.assertIsNone(policy.next_delay(3))
+        self.assertEqual(parse_retry_after('120'), 120)
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0)
+    
+    def test_only_transient_errors_are_retried(self):
+        """Test that 503 is retried and 404 fails immediately"""
+        with StubSportsMoleServer(stub_pages(), failures={'/football/fixtures/': [503, 503]}) as server:
+            scraper = SportsMoleScraper(retry_policy=RetryPolicy(base_delay=0))
+            point_scraper_at(scraper, server)
+            matches = scraper.get_upcoming_matches()
+            self.assertIsNone(scraper.get_match_prediction(server.base_url + '/missing'))
+        
+        self.assertEqual(len(matches), 3)
+        self.assertEqual(server.statuses, [503, 503, 200, 404])
+    
+    def test_circuit_breaker_fails_fast(self):
+        """Test that an open breaker rejects requests without contacting the site"""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        with StubSportsMoleServer(stub_pages(), failures={'/football/fixtures/': [503] * 10}) as server:
+            scraper = SportsMoleScraper(retry_policy=RetryPolicy(max_attempts=5, base_delay=0),
+                                        circuit_breaker=breaker)
+            point_scraper_at(scraper, server)
+            self.assertEqual(scraper.get_upcoming_matches(), [])
+            self.assertEqual(len(server.requests), 2)
+            
+            self.assertIsNone(scraper.get_match_prediction(server.base_url + '/football/arsenal/preview/arsenal-vs-chelsea'))
+            self.assertEqual(len(server.requests), 2)
+        
+        self.assertEqual(breaker.stats()['state'], 'open')
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+        
+        breaker.opened_at -= 60
+        breaker.before_request()
+        breaker.record_success()
+        self.assertEqual(breaker.stats()['state'], 'closed')
+
+
+class TestMetrics(unittest.TestCase):
+    """Test the Prometheus metrics primitives"""
+    
+    def test_histogram_buckets_are_cumulative(self):
+        """Test bucket, sum and count lines of a labelled histogram"""
+        from metrics import Registry
+        registry = Registry()
+        histogram = registry.histogram('test_seconds', 'Test latency', buckets=(0.1, 1))
+        for value in (0.05, 0.5, 5):
+            histogram.observe(value, page='preview')
+        
+        lines = registry.render().splitlines()
+        self.assertIn('test_seconds_bucket{page="preview",le="0.1"} 1', lines)
+        self.assertIn('test_seconds_bucket{page="preview",le="1"} 2', lines)
+        self.assertIn('test_seconds_bucket{page="preview",le="+Inf"} 3', lines)
+        self.assertIn('test_seconds_sum{page="preview"} 5.55', lines)
+        self.assertIn('test_seconds_count{page="preview"} 3', lines)
+    
+    def test_scraper_records_fetch_metrics(self):
+        """Test that fetch latency, parse time and bytes are recorded per page type"""
+        from metrics import FETCH_SECONDS, PARSE_SECONDS, DOWNLOADED_BYTES
+        fetches = FETCH_SECONDS.count(page='preview')
+        parses = PARSE_SECONDS.count(page='fixtures')
+        downloaded = DOWNLOADED_BYTES.value(page='fixtures')
+        
+        with StubSportsMoleServer(stub_pages()) as server:
+            scraper = SportsMoleScraper(prediction_cache=PredictionCache())
+            point_scraper_at(scraper, server)
+            scraper.get_all_matches_with_predictions()
+        
+        self.assertEqual(FETCH_SECONDS.count(page='preview') - fetches, 2)
+        self.assertEqual(PARSE_SECONDS.count(page='fixtures') - parses, 1)
+        self.assertEqual(DOWNLOADED_BYTES.value(page='fixtures') - downloaded, len(STUB_FIXTURES_HTML.encode('utf-8')))
+
+
+class TestHTTPResponseCache(unittest.TestCase):
+    """Test conditional requests backed by the on-disk response cache"""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmpdir.name, 'http_cache.sqlite3')
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def test_revalidation_survives_restart(self):
+        """Test that a new scraper reuses stored bodies on 304"""
+        with StubSportsMoleServer(stub_pages(), etags=True) as server:
+            first_cache = HTTPResponseCache(self.cache_path)
+            scraper = SportsMoleScraper(prediction_cache=PredictionCache(), http_cache=first_cache)
+            point_scraper_at(scraper, server)
+            first = scraper.get_all_matches_with_predictions()
+            first_cache.close()
+            
+            # Simulate a process restart with a fresh cache handle
+            scraper = SportsMoleScraper(prediction_cache=PredictionCache(),
+                                        http_cache=HTTPResponseCache(self.cache_path))
+            point_scraper_at(scraper, server)
+            second = scraper.get_all_matches_with_predictions()
+        
+        self.assertEqual(server.statuses, [200, 200, 200, 304, 304, 304])
+        self.assertEqual(first, second)
+        self.assertEqual(second[0]['predicted_score'], '2-1')
+    
+    def test_eviction_keeps_cache_under_limit(self):
+        """Test that least recently used responses are evicted past max_bytes"""
+        cache = HTTPResponseCache(self.cache_path, max_bytes=25)
+        cache.set('https://example.com/a', {'ETag': '"a"'}, b'a' * 10)
+        cache.set('https://example.com/b', {'ETag': '"b"'}, b'b' * 10)
+        cache.get('https://example.com/a')
+        cache.set('https://example.com/c', {'ETag': '"c"'}, b'c' * 10)
+        
+        self.assertIsNotNone(cache.get('https://example.com/a'))
+        self.assertIsNone(cache.get('https://example.com/b'))
+        self.assertLessEqual(cache.total_bytes(), 25)
+        cache.close()
+
+
+class TestHTTPArchive(unittest.TestCase):
+    """Test recording responses and replaying them offline"""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.archive_path = os.path.join(self.tmpdir.name, 'archive.jsonl.gz')
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def test_replay_matches_recording_without_network(self):
+        """Test that a replayed scrape is identical and sends no requests"""
+        with StubSportsMoleServer(stub_pages()) as server:
+            scraper = SportsMoleScraper(prediction_cache=PredictionCache(),
+                                        http_archive=HTTPArchive(self.archive_path))
+            point_scraper_at(scraper, server)
+            recorded = scraper.get_all_matches_with_predictions()
+        request_count = len(server.requests)
+        
+        archive = HTTPArchive(self.archive_path, mode='replay')
+        self.assertEqual(len(archive), 3)
+        scraper = SportsMoleScraper(prediction_cache=PredictionCache(), http_archive=archive)
+        point_scraper_at(scraper, server)
+        replayed = scraper.get_all_matches_with_predictions()
+        
+        self.assertEqual(replayed, recorded)
+        self.assertEqual(replayed[0]['predicted_score'], '2-1')
+        self.assertEqual(len(server.requests), request_count)
+    
+    def test_replay_miss_is_not_found(self):
+        """Test that URLs missing from the archive answer 404 without retrying"""
+        archive = HTTPArchive(self.archive_path, mode='replay')
+        scraper = SportsMoleScraper(prediction_cache=PredictionCache(), http_archive=archive)
+        
+        self.assertIsNone(scraper.get_match_prediction('http://127.0.0.1:9/football/missing'))
+        self.assertEqual(scraper.circuit_breaker.failures, 0)
+
+
+class TestMatchRecord(unittest.TestCase):
+    """Test compact match records"""
+    
+    def test_round_trips_json_shape(self):
+        """Test that a record converts back to the same dictionary, key order included"""
+        match = {
+            'home_team': 'Arsenal', 'away_team': 'Chelsea', 'date': 'Dec 14, 2025 16:30',
+            'competition': 'Premier League', 'preview_url': 'https://example.com/preview',
+            'id': 'abc123', 'predicted_score': '2-1', 'statistics': {'Goals Scored': '25'},
+            'source': 'extra field'
+        }
+        record = MatchRecord.from_dict(match)
+        
+        self.assertEqual(record.to_dict(), match)
+        self.assertEqual(list(record), list(match))
+        self.assertEqual(record, match)
+        self.assertEqual(record.get('statistics'), {'Goals Scored': '25'})
+        self.assertNotIn('prediction_text', record)
+        self.assertFalse(hasattr(record, '__dict__'))
+        with self.assertRaises(TypeError):
+            record['home_team'] = 'Spurs'
+    
+    def test_repeated_strings_are_shared(self):
+        """Test that team and competition strings are interned across records"""
+        first = MatchRecord.from_dict({'home_team': ''.join(['Ars', 'enal']), 'competition': ''.join(['Premier ', 'League'])})
+        second = MatchRecord.from_dict({'home_team': ''.join(['Arse', 'nal']), 'competition': ''.join(['Premier', ' League'])})
+        
+        self.assertIs(first['home_team'], second['home_team'])
+        self.assertIs(first['competition'], second['competition'])
+    
+    def test_records_hold_less_memory_than_dicts(self):
+        """Test measured memory for generated matches with parsed predictions"""
+        from benchmark import benchmark_match_memory, predicted_matches
+        matches = predicted_matches(20)
+        self.assertTrue(all(match.get('statistics') for match in matches))
+        self.assertEqual([MatchRecord.from_dict(match) for match in matches], matches)
+        
+        result = benchmark_match_memory(500)
+        self.assertLess(result['record_bytes_per_match'], result['dict_bytes_per_match'])
+
+
+class TestAPICacheRefresh(unittest.TestCase):
+    """Test stale-while-revalidate behaviour of the API cache"""
+    
+    def setUp(self):
+        import api
+        api.init_app(start_refresh=False)
+        self.api = api
+        self.saved_cache = dict(api.cache)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store_patch = patch.object(api, 'snapshot_store',
+                                        SnapshotStore(os.path.join(self.tmpdir.name, 'snapshots.sqlite3')))
+        self.store_patch.start()
+        api.cache.update({'last_refresh_ok': None})
+        api.store_snapshot([])
+        api.cache['last_updated'] = None
+        self.client = api.app.test_client()
+    
+    def tearDown(self):
+        self.api.snapshot_store.close()
+        self.store_patch.stop()
+        self.tmpdir.cleanup()
+        self.api.cache.clear()
+        self.api.cache.update(self.saved_cache)
+    
+    def test_expired_cache_served_while_refreshing(self):
+        """Test that an expired cache is served immediately and refreshed once in background"""
+        from datetime import datetime, timedelta
+        started = threading.Event()
+        release = threading.Event()
+        
+        def slow_scrape():
+            started.set()
+            release.wait(5)
+            return [{'home_team': 'New', 'away_team': 'Data'}]
+        
+        self.api.store_snapshot([{'home_team': 'Old', 'away_team': 'Data'}],
+                                datetime.now() - timedelta(minutes=self.api.CACHE_DURATION_MINUTES + 1))
+        
+        with patch.object(self.api.scraper, 'get_all_matches_with_predictions', side_effect=slow_scrape) as scrape:
+            first = self.client.get('/api/matches').get_json()
+            self.assertTrue(started.wait(5))
+            second = self.client.get('/api/matches/count').get_json()
+            release.set()
+            for _ in range(100):
+                if not self.api.is_refresh_in_progress():
+                    break
+                time.sleep(0.01)
+        
+        self.assertEqual(first['matches'][0]['home_team'], 'Old')
+        self.assertEqual(second['count'], 1)
+        self.assertEqual(scrape.call_count, 1)
+        self.assertEqual(self.api.cache['matches'][0]['home_team'], 'New')
+    
+    def test_failed_refresh_keeps_last_snapshot(self):
+        """Test that an empty scrape result does not replace good data"""
+        self.api.cache['matches'] = [{'home_team': 'Old', 'away_team': 'Data'}]
+        with patch.object(self.api.scraper, 'get_all_matches_with_predictions', return_value=[]):
+            self.assertFalse(self.api.update_cache())
+        self.assertEqual(len(self.api.cache['matches']), 1)
+    
+    def test_forced_refresh_scrapes_after_failed_concurrent_refresh(self):
+        """Test that a forced refresh waiting on a refresh that stored nothing still scrapes"""
+        self.api.store_snapshot([{'home_team': 'Old', 'away_team': 'Data'}])
+        results = []
+        self.api.refresh_lock.acquire()
+        with patch.object(self.api.scraper, 'get_all_matches_with_predictions',
+                          return_value=[{'home_team': 'New', 'away_team': 'Data'}]) as scrape:
+            waiter = threading.Thread(target=lambda: results.append(self.api.update_cache(force=True)))
+            waiter.start()
+            time.sleep(0.05)
+            self.api.refresh_lock.release()
+            waiter.join(5)
+        
+        self.assertEqual(results, [True])
+        self.assertEqual(scrape.call_count, 1)
+        self.assertEqual(self.api.cache['matches'][0]['home_team'], 'New')
+    
+    def test_first_request_starts_warm(self):
+        """Test that a worker's first request loads the stored snapshot and starts the refresher once"""
+        from datetime import datetime
+        self.api.snapshot_store.save_snapshot([{'id': 'abc', 'home_team': 'Stored', 'away_team': 'Data'}],
+                                              datetime.now())
+        with patch.object(self.api, 'initialized', False), \
+                patch.object(self.api, 'start_background_refresher') as refresher, \
+                patch.object(self.api.scraper, 'get_all_matches_with_predictions') as scrape:
+            self.assertEqual(self.client.get('/api/matches').get_json()['matches'][0]['home_team'], 'Stored')
+            self.client.get('/api/matches/count')
+        
+        refresher.assert_called_once()
+        scrape.assert_not_called()
+    
+    def test_health_reports_degraded_when_stale(self):
+        """Test that health is degraded once the snapshot exceeds the stale limit"""
+        from datetime import datetime, timedelta
+        self.api.cache['last_updated'] = datetime.now()
+        self.assertEqual(self.client.get('/api/health').get_json()['status'], 'healthy')
+        
+        self.api.cache['last_updated'] = datetime.now() - timedelta(minutes=self.api.CACHE_STALE_LIMIT_MINUTES + 1)
+        self.assertEqual(self.client.get('/api/health').get_json()['status'], 'degraded')
+
+    def test_filters_use_normalized_indexes(self):
+        """Test that team and competition filters are accent- and case-insensitive"""
+        self.api.store_snapshot([
+            {'home_team': 'Atlético Madrid', 'away_team': 'Sevilla', 'competition': 'La Liga'},
+            {'home_team': 'Arsenal', 'away_team': 'Chelsea', 'competition': 'Premier League'},
+            {'home_team': 'Real Madrid', 'away_team': 'Atlético Madrid', 'competition': 'Copa del Rey'},
+        ])
+        
+        data = self.client.get('/api/matches?team=ATLETICO').get_json()
+        self.assertEqual([m['competition'] for m in data['matches']], ['La Liga', 'Copa del Rey'])
+        
+        data = self.client.get('/api/matches?team=madrid&competition=liga').get_json()
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['matches'][0]['away_team'], 'Sevilla')
+        
+        data = self.client.get('/api/matches?team=nobody').get_json()
+        self.assertEqual(data['count'], 0)
+        
+        index = self.api.cache['index']
+        for number in range(MAX_MEMOIZED_LOOKUPS + 10):
+            self.assertEqual(index.find_team(f'nobody {number}'), frozenset())
+        self.assertEqual(len(index._lookups), MAX_MEMOIZED_LOOKUPS)
+        self.assertEqual(len(index.find_team('chelsea')), 1)
+
+    def test_kickoff_range_and_sort(self):
+        """Test from/to kickoff ranges and sorting answered from the kickoff index"""
+        self.api.store_snapshot([
+            {'home_team': 'Late', 'away_team': 'A', 'date': 'Dec 20, 2025 20:00', 'competition': 'Premier League'},
+            {'home_team': 'Unknown', 'away_team': 'B', 'date': 'TBD'},
+            {'home_team': 'Early', 'away_team': 'C', 'date': 'Dec 13, 2025 12:30', 'competition': 'Premier League'},
+            {'home_team': 'Summer', 'away_team': 'D', 'kickoff': '2025-07-01T14:00:00+00:00', 'date': 'Jul 1, 2025 15:00'},
+        ])
+        
+        def teams(query):
+            return [m['home_team'] for m in self.client.get('/api/matches?' + query).get_json()['matches']]
+        
+        self.assertEqual(teams('sort=kickoff'), ['Summer', 'Early', 'Late', 'Unknown'])
+        self.assertEqual(teams('sort=-kickoff'), ['Late', 'Early', 'Summer', 'Unknown'])
+        self.assertEqual(teams('from=2025-12-01&to=2025-12-31'), ['Late', 'Early'])
+        self.assertEqual(teams('from=2025-12-01&sort=kickoff&competition=premier'), ['Early', 'Late'])
+        # Naive times are UK time: 15:00 BST is 14:00 UTC
+        self.assertEqual(teams('from=2025-07-01T15:00&to=2025-07-01T15:00'), ['Summer'])
+        self.assertEqual(teams('to=2025-12-13T12:29:59Z'), ['Summer'])
+        self.assertEqual(teams('from=now&to=now%2B24h'), [])
+        
+        self.assertEqual(self.client.get('/api/matches?sort=date').status_code, 400)
+        self.assertEqual(self.client.get('/api/matches?from=soon').status_code, 400)
+    
+    def test_change_feed(self):
+        """Test incremental sync through /api/changes"""
+        arsenal = {'home_team': 'Arsenal', 'away_team': 'Chelsea', 'preview_url': 'https://example.com/a'}
+        with patch.object(self.api, 'change_feed', ChangeFeed(retention=2)):
+            self.api.store_snapshot([dict(arsenal, predicted_score='1-0'), {'home_team': 'Leeds', 'away_team': 'Burnley'}])
+            version = self.client.get('/api/matches').get_json()['version']
+            arsenal_id, leeds_id = [match['id'] for match in self.api.cache['matches']]
+            
+            self.api.store_snapshot([dict(arsenal, predicted_score='2-1', statistics={'Shots': '9'}),
+                                     {'home_team': 'Spurs', 'away_team': 'Wolves'}])
+            changes = self.client.get(f'/api/changes?since={version}').get_json()
+            self.assertEqual([match['home_team'] for match in changes['added']], ['Spurs'])
+            self.assertEqual(changes['changed'], [{'id': arsenal_id,
+                                                   'fields': {'predicted_score': '2-1', 'statistics': {'Shots': '9'}}}])
+            self.assertEqual(changes['removed'], [leeds_id])
+            
+            latest = self.client.get(f"/api/changes?since={changes['version']}").get_json()
+            self.assertEqual((latest['added'], latest['changed'], latest['removed']), ([], [], []))
+            self.assertEqual(len(self.client.get('/api/changes?since=0').get_json()['added']), 2)
+            
+            self.api.store_snapshot([dict(arsenal)])
+            self.api.store_snapshot([dict(arsenal)])
+            self.assertEqual(self.client.get(f'/api/changes?since={version}').status_code, 410)
+            changes = self.client.get(f"/api/changes?since={changes['version']}").get_json()
+            self.assertEqual(changes['changed'], [{'id': arsenal_id, 'fields': {},
+                                                   'removed_fields': ['predicted_score', 'statistics']}])
+            self.assertEqual(self.client.get('/api/changes').status_code, 400)
+    
+    def test_event_stream(self):
+        """Test that /api/events pushes refreshes and changes and resumes from Last-Event-ID"""
+        arsenal = {'home_team': 'Arsenal', 'away_team': 'Chelsea', 'preview_url': 'https://example.com/a'}
+        with patch.object(self.api, 'change_feed', ChangeFeed(retention=2)), \
+                patch.object(self.api, 'events', EventBroadcaster(max_clients=1)), \
+                patch.object(self.api, 'SSE_HEARTBEAT_SECONDS', 0.05):
+            self.api.store_snapshot([dict(arsenal, predicted_score='1-0')])
+            first = self.api.cache['version']
+            
+            response = self.client.get('/api/events', buffered=False)
+            self.assertEqual(response.mimetype, 'text/event-stream')
+            stream = response.iter_encoded()
+            self.assertEqual(next(stream).decode(), f'retry: 5000\n\nid: {first}\nevent: refresh\n'
+                             f'data: {{"version":{first},"count":1,'
+                             f'"last_updated":"{self.api.cache["last_updated"].isoformat()}"}}\n\n')
+            self.assertEqual(next(stream), b': heartbeat\n\n')
+            self.assertEqual(self.client.get('/api/events').status_code, 503)
+            
+            self.api.store_snapshot([dict(arsenal, predicted_score='2-1')])
+            second = self.api.cache['version']
+            update = next(stream).decode()
+            self.assertIn(f'id: {second}\nevent: refresh\n', update)
+            self.assertIn(f'id: {second}\nevent: changes\ndata: {{"since":{first},"version":{second},'
+                          f'"added":[],"changed":[{{"id":"{self.api.cache["matches"][0]["id"]}",'
+                          f'"fields":{{"predicted_score":"2-1"}}}}],"removed":[]}}', update)
+            response.close()
+            self.assertEqual(self.api.events.clients, 0)
+            
+            # Resuming: what was missed is sent first, an expired version gets a reset
+            response = self.client.get('/api/events', headers={'Last-Event-ID': str(first)}, buffered=False)
+            self.assertIn('"predicted_score":"2-1"', next(response.iter_encoded()).decode())
+            response.close()
+            self.api.store_snapshot([dict(arsenal)])
+            self.api.store_snapshot([dict(arsenal)])
+            response = self.client.get(f'/api/events?since={first}', buffered=False)
+            self.assertIn('event: reset\n', next(response.iter_encoded()).decode())
+            response.close()
+            self.assertEqual(self.client.get('/api/events?since=abc').status_code, 400)
+    
+    def test_match_ids_are_stable_across_refreshes(self):
+        """Test that a match keeps its ID and stays addressable after reordering"""
+        first = {'home_team': 'Arsenal', 'away_team': 'Chelsea', 'preview_url': 'https://example.com/football/a/preview'}
+        second = {'home_team': 'Leeds', 'away_team': 'Burnley', 'competition': 'Championship'}
+        self.api.store_snapshot([dict(first), dict(second)])
+        arsenal_id = self.api.cache['matches'][0]['id']
+        leeds_id = self.api.cache['matches'][1]['id']
+        
+        self.api.store_snapshot([dict(second), dict(first)])
+        data = self.client.get(f'/api/matches/{arsenal_id}').get_json()
+        self.assertEqual(data['match']['home_team'], 'Arsenal')
+        self.assertEqual(self.api.cache['matches'][0]['id'], leeds_id)
+        
+        response = self.client.get('/api/matches/doesnotexist')
+        self.assertEqual(response.status_code, 404)
+    
+    def test_batch_lookup(self):
+        """Test fetching several matches by ID in one call"""
+        self.api.store_snapshot([
+            {'home_team': 'Arsenal', 'away_team': 'Chelsea'},
+            {'home_team': 'Leeds', 'away_team': 'Burnley'},
+        ])
+        ids = [match['id'] for match in self.api.cache['matches']]
+        
+        data = self.client.get(f'/api/matches/batch?ids={ids[1]},missing').get_json()
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['matches'][ids[1]]['home_team'], 'Leeds')
+        self.assertEqual(data['missing'], ['missing'])
+        
+        data = self.client.post('/api/matches/batch', json={'ids': ids}).get_json()
+        self.assertEqual(set(data['matches']), set(ids))
+        
+        self.assertEqual(self.client.get('/api/matches/batch').status_code, 400)
+
+    def test_unfiltered_matches_are_preserialized_with_etag(self):
+        """Test ETag, 304 and gzip handling of the unfiltered match list"""
+        import gzip
+        import json
+        self.api.store_snapshot([{'home_team': 'Arsenal', 'away_team': 'Chelsea'}])
+        
+        response = self.client.get('/api/matches')
+        etag = response.headers['ETag']
+        self.assertEqual(response.get_json()['count'], 1)
+        self.assertEqual(response.headers['Vary'], 'Accept-Encoding')
+        
+        self.assertEqual(self.client.get('/api/matches', headers={'If-None-Match': etag}).status_code, 304)
+        
+        compressed = self.client.get('/api/matches', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(compressed.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(compressed.data)), response.get_json())
+        self.assertEqual(self.client.get('/api/matches', headers={'If-None-Match': compressed.headers['ETag']}).status_code, 304)
+        
+        self.api.store_snapshot([{'home_team': 'Leeds', 'away_team': 'Burnley'}])
+        self.assertEqual(self.client.get('/api/matches', headers={'If-None-Match': etag}).status_code, 200)
+
+    def test_cursor_pagination(self):
+        """Test walking the match list page by page"""
+        self.api.store_snapshot([{'home_team': f'Home {i}', 'away_team': f'Away {i}'} for i in range(5)])
+        
+        seen = []
+        url = '/api/matches?page_size=2'
+        while url:
+            data = self.client.get(url).get_json()
+            self.assertEqual(data['total'], 5)
+            seen.extend(m['home_team'] for m in data['matches'])
+            url = f"/api/matches?cursor={data['next_cursor']}&page_size=2" if data['next_cursor'] else None
+        
+        self.assertEqual(seen, [f'Home {i}' for i in range(5)])
+        self.assertEqual(self.client.get('/api/matches?cursor=not-a-cursor').status_code, 400)
+    
+    def test_cursor_expires_after_refresh(self):
+        """Test that a cursor from an older snapshot is rejected"""
+        self.api.store_snapshot([{'home_team': f'Home {i}', 'away_team': 'Away'} for i in range(3)])
+        cursor = self.client.get('/api/matches?page_size=1').get_json()['next_cursor']
+        self.api.store_snapshot([{'home_team': 'Other', 'away_team': 'Away'}])
+        self.assertEqual(self.client.get(f'/api/matches?cursor={cursor}').status_code, 410)
+    
+    def test_field_projection(self):
+        """Test the summary projection and explicit field lists"""
+        self.api.store_snapshot([{
+            'home_team': 'Arsenal', 'away_team': 'Chelsea', 'date': 'Dec 14, 2025',
+            'competition': 'Premier League', 'prediction_text': 'Long text', 'statistics': {'Shots': '15'}
+        }])
+        
+        match = self.client.get('/api/matches?fields=summary').get_json()['matches'][0]
+        self.assertEqual(set(match), {'id', 'home_team', 'away_team', 'date', 'competition'})
+        
+        match = self.client.get('/api/matches?fields=home_team,statistics').get_json()['matches'][0]
+        self.assertEqual(set(match), {'id', 'home_team', 'statistics'})
+
+    def test_stream_cold_cache_scrapes_live(self):
+        """Test that a cold stream scrapes live, emits NDJSON and fills the cache"""
+        import json
+        with StubSportsMoleServer(stub_pages()) as server, \
+             patch.object(self.api, 'scraper', SportsMoleScraper(prediction_cache=PredictionCache())):
+            point_scraper_at(self.api.scraper, server)
+            response = self.client.get('/api/matches/stream')
+            lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        self.assertEqual(len(lines), 3)
+        # The match without a preview needs no fetch and is sent first
+        self.assertEqual(lines[0]['home_team'], 'Leeds')
+        self.assertTrue(all('predicted_score' in line for line in lines[1:]))
+        self.assertEqual(len(self.api.cache['matches']), 3)
+        self.assertFalse(self.api.is_refresh_in_progress())
+    
+    def test_stream_warm_cache(self):
+        """Test that a warm stream sends the cached snapshot"""
+        import json
+        self.api.store_snapshot([{'home_team': 'Arsenal', 'away_team': 'Chelsea'}])
+        lines = self.client.get('/api/matches/stream').get_data(as_text=True).splitlines()
+        self.assertEqual([json.loads(line)['home_team'] for line in lines], ['Arsenal'])
+
+    def test_refresh_is_persisted_and_reloaded(self):
+        """Test that a refresh is saved and can warm-start a new cache"""
+        scraped = [{'home_team': 'Arsenal', 'away_team': 'Chelsea', 'competition': 'Premier League',
+                    'date': 'Dec 14, 2025 16:30', 'predicted_score': '2-1'}]
+        with patch.object(self.api.scraper, 'get_all_matches_with_predictions', return_value=scraped):
+            self.assertTrue(self.api.update_cache())
+        match_id = self.api.cache['matches'][0]['id']
+        
+        self.api.store_snapshot([])
+        self.api.cache['last_updated'] = None
+        self.assertTrue(self.api.load_stored_snapshot())
+        self.assertEqual(self.api.cache['matches'][0]['predicted_score'], '2-1')
+        self.assertIsNotNone(self.api.cache['last_updated'])
+        
+        scraped[0]['predicted_score'] = '3-1'
+        with patch.object(self.api.scraper, 'get_all_matches_with_predictions', return_value=scraped):
+            self.api.update_cache()
+        
+        history = self.client.get(f'/api/matches/{match_id}/history').get_json()['history']
+        self.assertEqual([entry['match']['predicted_score'] for entry in history], ['3-1', '2-1'])
+        
+        data = self.client.get('/api/history?competition=premier%20league&from=2025-12-14&to=2025-12-15').get_json()
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['matches'][0]['predicted_score'], '3-1')
+        self.assertEqual(self.client.get('/api/history?from=2025-12-01&to=2025-12-02').get_json()['count'], 0)
+    
+    def test_worker_adopts_shared_snapshot_without_scraping(self):
+        """Test that a worker serves the snapshot another worker published"""
+        from datetime import datetime
+        path = os.path.join(self.tmpdir.name, 'shared_snapshot')
+        other_worker = SharedFileCache(path)
+        other_worker.publish(PreparedResponse({
+            'success': True,
+            'count': 1,
+            'matches': [{'id': 'abc', 'home_team': 'Shared', 'away_team': 'Data'}],
+            'last_updated': datetime.now().isoformat()
+        }))
+        
+        with patch.object(self.api, 'shared_cache', SharedFileCache(path)), \
+                patch.object(self.api.scraper, 'get_all_matches_with_predictions') as scrape:
+            data = self.client.get('/api/matches').get_json()
+            self.assertTrue(self.api.update_cache(force=False))
+        
+        self.assertEqual(data['matches'][0]['home_team'], 'Shared')
+        self.assertEqual(self.api.cache['index'].get('abc')['away_team'], 'Data')
+        scrape.assert_not_called()
+    
+    def test_concurrent_syncs_adopt_a_snapshot_once(self):
+        """Test that threads syncing at once keep the published snapshot's version"""
+        from datetime import datetime
+        from change_feed import snapshot_version
+        path = os.path.join(self.tmpdir.name, 'shared_snapshot')
+        last_updated = datetime.now()
+        SharedFileCache(path).publish(PreparedResponse({
+            'success': True,
+            'count': 1,
+            'matches': [{'id': 'abc', 'home_team': 'Shared', 'away_team': 'Data'}],
+            'last_updated': last_updated.isoformat()
+        }))
+        
+        with patch.object(self.api, 'shared_cache', SharedFileCache(path)), \
+                patch.object(self.api, 'change_feed', ChangeFeed()):
+            threads = [threading.Thread(target=self.api.sync_shared_snapshot) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(5)
+            self.api.store_snapshot([{'id': 'abc', 'home_team': 'Shared', 'away_team': 'Data'}], last_updated)
+            
+            self.assertEqual(self.api.cache['version'], snapshot_version(last_updated))
+            self.assertEqual(self.api.change_feed.version, snapshot_version(last_updated))
+            self.assertEqual(len(self.api.change_feed._versions), 1)
+    
+    def test_metrics_endpoint(self):
+        """Test that /api/metrics reports endpoint latency and cache state"""
+        self.api.store_snapshot([{'home_team': 'Arsenal', 'away_team': 'Chelsea'}])
+        self.client.get('/api/matches')
+        
+        response = self.client.get('/api/metrics')
+        text = response.get_data(as_text=True)
+        self.assertTrue(response.content_type.startswith('text/plain'))
+        self.assertIn('sportsmole_http_request_seconds_count{endpoint="/api/matches",method="GET",status="200"}', text)
+        self.assertIn('sportsmole_matches_cached 1\n', text)
+        self.assertIn('# TYPE sportsmole_parser_strategy_hits_total counter', text)
+
+
+class TestSharedFileCache(unittest.TestCase):
+    """Test the file snapshot shared between worker processes"""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmpdir.name, 'shared_snapshot')
+        self.worker_a = SharedFileCache(path)
+        self.worker_b = SharedFileCache(path)
+    
+    def tearDown(self):
+        self.worker_a.close()
+        self.worker_b.close()
+        self.tmpdir.cleanup()
+    
+    def test_published_snapshot_is_read_once(self):
+        """Test that another worker adopts a published snapshot with its ETags"""
+        prepared = PreparedResponse({'matches': [{'id': 'abc'}], 'last_updated': '2025-12-11T05:00:00'})
+        self.worker_a.publish(prepared)
+        
+        self.assertIsNone(self.worker_a.read_if_changed())
+        adopted = self.worker_b.read_if_changed()
+        self.assertEqual(adopted.body, prepared.body)
+        self.assertEqual(adopted.etags, prepared.etags)
+        self.assertEqual(adopted.variants['gzip'], prepared.variants['gzip'])
+        self.assertIsNone(self.worker_b.read_if_changed())
+    
+    def test_only_one_worker_refreshes(self):
+        """Test that the refresh lock is exclusive across workers"""
+        self.assertTrue(self.worker_a.acquire_refresh())
+        self.assertFalse(self.worker_b.acquire_refresh())
+        self.assertTrue(self.worker_b.refresh_locked())
+        
+        self.worker_a.release_refresh()
+        self.assertFalse(self.worker_b.refresh_locked())
+        self.assertTrue(self.worker_b.acquire_refresh())
+    
+    def test_refresh_locked_only_reads_lock_state(self):
+        """Test that checking for a refresh never takes the lock, and ignores dead holders"""
+        with patch('shared_cache.fcntl.flock') as flock:
+            self.assertFalse(self.worker_b.refresh_locked())
+        flock.assert_not_called()
+        
+        self.assertTrue(self.worker_a.acquire_refresh())
+        with patch('shared_cache.fcntl.flock') as flock:
+            self.assertTrue(self.worker_b.refresh_locked())
+        flock.assert_not_called()
+        self.worker_a.release_refresh()
+        
+        with open(self.worker_b.lock_path, 'w') as f:
+            f.write('999999999 1765429200.000')
+        self.assertFalse(self.worker_b.refresh_locked())
+
+
+class TestSnapshotStore(unittest.TestCase):
+    """Test the SQLite snapshot store"""
+    
+    def test_retention_prunes_old_snapshots(self):
+        """Test that only the newest snapshots are kept"""
+        from datetime import datetime
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = SnapshotStore(os.path.join(tmpdir, 'snapshots.sqlite3'), retention=2)
+            for score in ('1-0', '2-0', '3-0'):
+                store.save_snapshot([{'id': 'abc', 'home_team': 'A', 'away_team': 'B', 'predicted_score': score}],
+                                    datetime.now())
+            
+            history = store.match_history('abc')
+            matches, _ = store.load_latest()
+            store.close()
+        
+        self.assertEqual([entry['match']['predicted_score'] for entry in history], ['3-0', '2-0'])
+        self.assertEqual(matches[0]['predicted_score'], '3-0')
+
 
 class TestAPIStructure(unittest.TestCase):
     """Test API structure without starting the server"""